@@ -5,14 +5,26 @@ MUDANÇA: Configuração completa do Django Admin para todos os models
 DATA/HORA: 2025-10-29 14:45:00
 """
 
-from django.contrib import admin
-from django.utils.html import format_html
+import time
+from django.contrib import admin, messages
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
 from django.db.models import Count, Q
+from .coorte import STATUS_COM_VAGA
+from .forms import MatriculaVagasForm, SimulacaoCriterioFormSet, SimulacaoVagasForm
 from .models import (
     Status, Criterio, Evento, EventoCriterio,
     Inscricao, Classificacao, InscricaoCriterioAtendido,
-    Turma, Matricula, Avaliacao
+    Turma, Matricula, Avaliacao, Tarefa, StatusTarefa, TipoTarefa,
+    PromocaoFilaEspera, InscricaoRecebida, StatusRecebimento
 )
+from .pontuacao import para_decimal
+from .relatorio import gerar_csv, xlsx_disponivel
+from .simulacao import simular_classificacao
+from .tarefas import cancelar_tarefa, enfileirar_tarefa
 
 
 # ============================================
@@ -31,6 +43,7 @@ class EventoCriterioInline(admin.TabularInline):
 class MatriculaInline(admin.TabularInline):
     """Permite ver/adicionar matrículas diretamente na tela de Turma"""
     model = Matricula
+    form = MatriculaVagasForm
     extra = 0
     fields = ['interessado', 'data_matricula', 'status']
     readonly_fields = ['data_matricula']
@@ -114,7 +127,8 @@ class CriterioAdmin(admin.ModelAdmin):
 @admin.register(Evento)
 class EventoAdmin(admin.ModelAdmin):
     list_display = ['descricao', 'status_badge', 'modalidade', 'vagas_info', 
-                    'periodo_inscricoes', 'periodo_aulas', 'total_inscricoes']
+                    'periodo_inscricoes', 'periodo_aulas', 'total_inscricoes',
+                    'simular_link']
     list_filter = ['status', 'modalidade', 'criado_em', 'inicio_inscricoes']
     search_fields = ['descricao', 'docente', 'local']
     date_hierarchy = 'inicio_inscricoes'
@@ -131,8 +145,11 @@ class EventoAdmin(admin.ModelAdmin):
         ('Vagas', {
             'fields': ('vagas', 'vagas_minimas')
         }),
+        ('Classificação', {
+            'fields': ('referencia_idade', 'data_referencia_idade', 'desempate')
+        }),
         ('Período de Inscrições', {
-            'fields': ('inicio_inscricoes', 'fim_inscricoes')
+            'fields': ('inicio_inscricoes', 'fim_inscricoes', 'inscricao_por_fila')
         }),
         ('Período de Matrículas', {
             'fields': ('inicio_matricula', 'fim_matricula')
@@ -155,6 +172,7 @@ class EventoAdmin(admin.ModelAdmin):
     
     readonly_fields = ['criado_em', 'atualizado_em']
     inlines = [EventoCriterioInline]
+    actions = ['classificar', 'exportar_csv', 'exportar_xlsx']
     
     def status_badge(self, obj):
         """Exibe status com cor"""
@@ -204,6 +222,189 @@ class EventoAdmin(admin.ModelAdmin):
         total = obj.total_inscricoes()
         return format_html('<strong>{}</strong>', total)
     total_inscricoes.short_description = 'Inscrições'
+    
+    def _enfileirar(self, request, queryset, tipo):
+        """Enfileira uma tarefa por evento e avisa quantas foram criadas"""
+        criadas = 0
+        existentes = 0
+        for evento in queryset:
+            _, criada = enfileirar_tarefa(evento, tipo, request.user)
+            if criada:
+                criadas += 1
+            else:
+                existentes += 1
+        
+        if criadas:
+            url = reverse('admin:cursoseoutros_tarefa_changelist')
+            mensagem = format_html(
+                '{} tarefa(s) na fila. Acompanhe em <a href="{}">Tarefas em Segundo Plano</a>.',
+                criadas, url
+            )
+            self.message_user(request, mensagem)
+        if existentes:
+            self.message_user(
+                request,
+                f'{existentes} evento(s) já tinham classificação pendente.',
+                messages.WARNING
+            )
+    
+    def classificar(self, request, queryset):
+        """Classifica os eventos selecionados em segundo plano (processar_tarefas)"""
+        self._enfileirar(request, queryset, TipoTarefa.CLASSIFICAR)
+    classificar.short_description = 'Classificar eventos selecionados (segundo plano)'
+    
+    def _evento_unico(self, request, queryset):
+        """Evento selecionado, se for exatamente um (senão avisa e devolve None)"""
+        if queryset.count() != 1:
+            self.message_user(
+                request, 'Selecione exatamente um evento para exportar.', messages.WARNING
+            )
+            return None
+        return queryset.first()
+    
+    def exportar_csv(self, request, queryset):
+        """Baixa a classificação gravada em CSV (streaming, sem reclassificar)"""
+        evento = self._evento_unico(request, queryset)
+        if evento is None:
+            return None
+        
+        response = StreamingHttpResponse(gerar_csv(evento), content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="classificacao_evento_{evento.pk}.csv"'
+        return response
+    exportar_csv.short_description = 'Exportar classificação (CSV)'
+    
+    def exportar_xlsx(self, request, queryset):
+        """
+        Gera a planilha XLSX em segundo plano: o arquivo só fica pronto no
+        fim, então não dá para enviá-lo aos poucos durante a requisição.
+        """
+        if not xlsx_disponivel():
+            self.message_user(
+                request, 'Exportação XLSX indisponível: instale o pacote openpyxl.', messages.ERROR
+            )
+            return None
+        
+        self._enfileirar(request, queryset, TipoTarefa.EXPORTAR_XLSX)
+    exportar_xlsx.short_description = 'Exportar classificação (XLSX, segundo plano)'
+    
+    def simular_link(self, obj):
+        """Link para a simulação da classificação"""
+        url = reverse('admin:cursoseoutros_evento_simular', args=[obj.pk])
+        return format_html('<a href="{}">Simular</a>', url)
+    simular_link.short_description = 'Simulação'
+    
+    def get_urls(self):
+        """Adiciona a página de simulação da classificação"""
+        urls = [
+            path(
+                '<path:object_id>/simular/',
+                self.admin_site.admin_view(self.simular_view),
+                name='cursoseoutros_evento_simular'
+            ),
+        ]
+        return urls + super().get_urls()
+    
+    def simular_view(self, request, object_id):
+        """
+        Simulação "e se...?" da classificação: altera pesos, ordem, faixas
+        etárias e vagas e mostra quem entra e quem sai das vagas, sem gravar.
+        """
+        evento = get_object_or_404(Evento, pk=object_id)
+        evento_criterios = list(
+            evento.evento_criterios.select_related('criterio').filter(
+                criterio__ativo=True
+            ).order_by('ordem')
+        )
+        por_id = {evento_criterio.id: evento_criterio for evento_criterio in evento_criterios}
+        
+        iniciais = [
+            {
+                'evento_criterio': evento_criterio.id,
+                'ativo': True,
+                'peso': evento_criterio.peso,
+                'ordem': evento_criterio.ordem,
+                'idade_minima': evento_criterio.idade_minima,
+                'idade_maxima': evento_criterio.idade_maxima,
+            }
+            for evento_criterio in evento_criterios
+        ]
+        
+        simulacao = None
+        linhas_entram = []
+        linhas_saem = []
+        segundos = None
+        
+        if request.method == 'POST':
+            formset = SimulacaoCriterioFormSet(request.POST, initial=iniciais)
+            vagas_form = SimulacaoVagasForm(request.POST)
+            
+            if formset.is_valid() and vagas_form.is_valid():
+                alteracoes = {}
+                for form in formset:
+                    evento_criterio = por_id.get(form.cleaned_data['evento_criterio'])
+                    if evento_criterio is None:
+                        continue
+                    mudancas = form.alteracoes(evento_criterio)
+                    if mudancas:
+                        alteracoes[evento_criterio.id] = mudancas
+                
+                inicio = time.perf_counter()
+                simulacao = simular_classificacao(
+                    evento, alteracoes, vagas_form.cleaned_data['vagas']
+                )
+                segundos = time.perf_counter() - inicio
+                
+                linhas_entram, linhas_saem = self._linhas_simulacao(simulacao)
+        else:
+            formset = SimulacaoCriterioFormSet(initial=iniciais)
+            vagas_form = SimulacaoVagasForm(initial={'vagas': evento.vagas})
+        
+        for form in formset:
+            form.evento_criterio_obj = por_id.get(form.initial.get('evento_criterio'))
+        
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'original': evento,
+            'title': f'Simular classificação: {evento.descricao}',
+            'evento': evento,
+            'formset': formset,
+            'vagas_form': vagas_form,
+            'simulacao': simulacao,
+            'entram': linhas_entram,
+            'saem': linhas_saem,
+            'segundos': segundos,
+        }
+        return TemplateResponse(
+            request, 'admin/cursoseoutros/evento/simular.html', context
+        )
+    
+    def _linhas_simulacao(self, simulacao):
+        """
+        Linhas de quem entra e de quem sai das vagas, com os nomes buscados
+        numa única consulta.
+        """
+        ids = simulacao.entram + simulacao.saem
+        nomes = dict(
+            Inscricao.objects.filter(pk__in=ids).values_list('pk', 'interessado__nome')
+        )
+        
+        def linha(inscricao_id):
+            atual = simulacao.atuais.get(inscricao_id)
+            simulada = simulacao.situacoes.get(inscricao_id)
+            return {
+                'inscricao_id': inscricao_id,
+                'nome': nomes.get(inscricao_id, '-'),
+                'posicao_atual': atual[0] if atual else None,
+                'posicao_simulada': simulada[0] if simulada else None,
+                'score': para_decimal(simulacao.score(inscricao_id)) if simulada else None,
+                'variacao': simulacao.variacao(inscricao_id),
+            }
+        
+        return (
+            [linha(inscricao_id) for inscricao_id in simulacao.entram],
+            [linha(inscricao_id) for inscricao_id in simulacao.saem],
+        )
 
 
 # ============================================
@@ -218,6 +419,7 @@ class EventoCriterioAdmin(admin.ModelAdmin):
     search_fields = ['evento__descricao', 'criterio__descricao_criterio']
     ordering = ['evento', 'ordem']
     autocomplete_fields = ['evento', 'criterio']
+    filter_horizontal = ['fototipos_prioritarios']
     
     fieldsets = (
         ('Relacionamentos', {
@@ -234,6 +436,12 @@ class EventoCriterioAdmin(admin.ModelAdmin):
             'classes': ('collapse',),
             'description': 'Configurações específicas para critérios de idade'
         }),
+        ('Configurações de Fototipo', {
+            'fields': ('fototipos_prioritarios',),
+            'classes': ('collapse',),
+            'description': 'Para critérios FOTOTIPO: sem fototipos marcados, '
+                           'quem informou fototipo recebe 50 pontos (neutro)'
+        }),
         ('Observações', {
             'fields': ('observacao',),
             'classes': ('collapse',)
@@ -324,11 +532,15 @@ class ClassificacaoAdmin(admin.ModelAdmin):
     
     fieldsets = (
         ('Classificação', {
-            'fields': ('inscricao', 'score_total', 'posicao', 'data_classificacao')
+            'fields': ('inscricao', 'score_total', 'posicao', 'cota', 'data_classificacao')
+        }),
+        ('Detalhamento do Score', {
+            'fields': ('detalhamento',)
         }),
     )
     
-    readonly_fields = ['data_classificacao']
+    readonly_fields = ['cota', 'data_classificacao', 'detalhamento']
+    list_select_related = ['inscricao__interessado', 'inscricao__evento', 'cota__criterio']
     
     def interessado_nome(self, obj):
         """Nome do interessado"""
@@ -342,8 +554,16 @@ class ClassificacaoAdmin(admin.ModelAdmin):
     
     def situacao(self, obj):
         """Se está aprovado ou em fila de espera"""
-        vagas = obj.inscricao.evento.vagas
-        if obj.posicao <= vagas:
+        if obj.posicao is None:
+            # Desistente / não compareceu: fora da classificação
+            return '-'
+        if obj.inscricao.status in STATUS_COM_VAGA:
+            if obj.cota_id:
+                return format_html(
+                    '<span style="color: #28a745; font-weight: bold;">✓ APROVADO</span> '
+                    '<small>(cota: {})</small>',
+                    obj.cota.criterio.descricao_criterio
+                )
             return format_html(
                 '<span style="color: #28a745; font-weight: bold;">✓ APROVADO</span>'
             )
@@ -357,6 +577,31 @@ class ClassificacaoAdmin(admin.ModelAdmin):
         """Data formatada"""
         return obj.data_classificacao.strftime('%d/%m/%Y %H:%M')
     data_classificacao_fmt.short_description = 'Data Classificação'
+    
+    def detalhamento(self, obj):
+        """Pontos ponderados de cada critério do evento (Classificacao.pontos_criterios)"""
+        if obj.pk is None:
+            return '-'
+        
+        pontos = obj.pontos_por_criterio()
+        evento_criterios = obj.inscricao.evento.evento_criterios.select_related(
+            'criterio'
+        ).order_by('ordem')
+        return format_html(
+            '<ul style="margin: 0;">{}</ul>',
+            format_html_join(
+                '', '<li>{} (peso {}): <strong>{}</strong></li>',
+                (
+                    (
+                        evento_criterio.criterio.descricao_criterio,
+                        evento_criterio.peso,
+                        pontos.get(evento_criterio.id, 0),
+                    )
+                    for evento_criterio in evento_criterios
+                )
+            )
+        )
+    detalhamento.short_description = 'Pontos por Critério'
 
 
 # ============================================
@@ -432,6 +677,9 @@ class TurmaAdmin(admin.ModelAdmin):
         ('Local', {
             'fields': ('local_aulas',)
         }),
+        ('Vagas', {
+            'fields': ('vagas',)
+        }),
     )
     
     inlines = [MatriculaInline]
@@ -448,8 +696,10 @@ class TurmaAdmin(admin.ModelAdmin):
     periodo.short_description = 'Período'
     
     def total_alunos_info(self, obj):
-        """Total de alunos matriculados"""
+        """Total de alunos matriculados (e limite da turma, se houver)"""
         total = obj.total_alunos()
+        if obj.vagas is not None:
+            return format_html('<strong>{}</strong> / {} alunos', total, obj.vagas)
         return format_html('<strong>{}</strong> alunos', total)
     total_alunos_info.short_description = 'Total Alunos'
 
@@ -468,6 +718,7 @@ class MatriculaAdmin(admin.ModelAdmin):
     date_hierarchy = 'data_matricula'
     ordering = ['-data_matricula']
     autocomplete_fields = ['turma', 'interessado']
+    form = MatriculaVagasForm
     
     fieldsets = (
         ('Matrícula', {
@@ -580,4 +831,158 @@ class AvaliacaoAdmin(admin.ModelAdmin):
         return format_html(
             '<span style="color: #6c757d;">✗ NÃO</span>'
         )
-    emite_certificado_badge.short_description = 'Certificado'
\ No newline at end of file
+    emite_certificado_badge.short_description = 'Certificado'
+
+
+# ============================================
+# ADMIN: TAREFAS EM SEGUNDO PLANO
+# ============================================
+
+@admin.register(Tarefa)
+class TarefaAdmin(admin.ModelAdmin):
+    list_display = ['id', 'tipo', 'evento', 'status_badge', 'progresso_barra',
+                    'mensagem', 'solicitado_por', 'criado_em', 'duracao', 'arquivo_link']
+    list_filter = ['status', 'tipo', 'criado_em']
+    search_fields = ['evento__descricao']
+    list_select_related = ['evento', 'solicitado_por']
+    ordering = ['-criado_em']
+    actions = ['cancelar']
+    
+    fields = ['evento', 'tipo', 'status', 'progresso', 'mensagem', 'arquivo',
+              'cancelamento_solicitado', 'solicitado_por', 'executor',
+              'criado_em', 'iniciado_em', 'sinal_de_vida_em', 'concluido_em', 'erro']
+    readonly_fields = fields
+    
+    def has_add_permission(self, request):
+        """Tarefas são criadas pelas ações do admin de Eventos"""
+        return False
+    
+    def status_badge(self, obj):
+        """Status com cor"""
+        cores = {
+            StatusTarefa.PENDENTE: '#6c757d',
+            StatusTarefa.EXECUTANDO: '#007bff',
+            StatusTarefa.CONCLUIDA: '#28a745',
+            StatusTarefa.ERRO: '#dc3545',
+            StatusTarefa.CANCELADA: '#fd7e14',
+        }
+        return format_html(
+            '<span style="background-color: {}; color: white; padding: 3px 8px; '
+            'border-radius: 3px;">{}</span>',
+            cores.get(obj.status, '#6c757d'), obj.get_status_display()
+        )
+    status_badge.short_description = 'Status'
+    
+    def progresso_barra(self, obj):
+        """Barra de progresso"""
+        return format_html(
+            '<div style="width: 100px; background: #e9ecef; border-radius: 3px;">'
+            '<div style="width: {}%; background: #007bff; color: white; '
+            'font-size: 11px; text-align: center; border-radius: 3px;">{}%</div></div>',
+            obj.progresso, obj.progresso
+        )
+    progresso_barra.short_description = 'Progresso'
+    
+    def duracao(self, obj):
+        """Tempo de execução"""
+        if obj.iniciado_em and obj.concluido_em:
+            return f'{(obj.concluido_em - obj.iniciado_em).total_seconds():.1f}s'
+        return '-'
+    duracao.short_description = 'Duração'
+    
+    def arquivo_link(self, obj):
+        """Link para baixar o arquivo exportado"""
+        if obj.arquivo:
+            return format_html('<a href="{}">Baixar</a>', obj.arquivo.url)
+        return '-'
+    arquivo_link.short_description = 'Arquivo'
+    
+    def cancelar(self, request, queryset):
+        """Cancela as tarefas pendentes e pede parada das em execução"""
+        canceladas = sum(1 for tarefa in queryset if cancelar_tarefa(tarefa))
+        self.message_user(request, f'{canceladas} tarefa(s) cancelada(s) ou com cancelamento pedido.')
+    cancelar.short_description = 'Cancelar tarefas selecionadas'
+
+
+# ============================================
+# ADMIN: PROMOÇÕES DA FILA DE ESPERA
+# ============================================
+
+@admin.register(PromocaoFilaEspera)
+class PromocaoFilaEsperaAdmin(admin.ModelAdmin):
+    list_display = ['criado_em', 'evento', 'motivo', 'liberada_por', 'cota_liberada',
+                    'promovida', 'posicao_promovida', 'cota_preenchida']
+    list_filter = ['motivo', 'evento', 'criado_em']
+    search_fields = ['evento__descricao', 'inscricao_liberada__interessado__nome',
+                     'inscricao_promovida__interessado__nome']
+    list_select_related = ['evento', 'inscricao_liberada__interessado',
+                           'inscricao_promovida__interessado',
+                           'cota_liberada__criterio', 'cota_preenchida__criterio']
+    date_hierarchy = 'criado_em'
+    ordering = ['-criado_em']
+    
+    fields = ['evento', 'motivo', 'inscricao_liberada', 'cota_liberada',
+              'inscricao_promovida', 'posicao_promovida', 'cota_preenchida', 'criado_em']
+    readonly_fields = fields
+    
+    def has_add_permission(self, request):
+        """Registradas pela promoção automática (ver fila_espera.py)"""
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def liberada_por(self, obj):
+        """Quem liberou a vaga"""
+        if obj.inscricao_liberada:
+            return obj.inscricao_liberada.interessado.nome
+        return '-'
+    liberada_por.short_description = 'Vaga Liberada Por'
+    
+    def promovida(self, obj):
+        """Quem recebeu a vaga"""
+        if obj.inscricao_promovida:
+            return format_html('<strong>{}</strong>', obj.inscricao_promovida.interessado.nome)
+        return format_html('<span style="color: #6c757d;">Fila vazia</span>')
+    promovida.short_description = 'Promovida'
+
+
+# ============================================
+# ADMIN: INSCRIÇÕES RECEBIDAS (MODO FILA)
+# ============================================
+
+@admin.register(InscricaoRecebida)
+class InscricaoRecebidaAdmin(admin.ModelAdmin):
+    list_display = ['recibo', 'evento', 'interessado', 'recebida_em', 'status_badge',
+                    'mensagem', 'processada_em']
+    list_filter = ['status', 'evento']
+    search_fields = ['=id', 'interessado__nome', 'interessado__cpf', 'evento__descricao']
+    list_select_related = ['evento', 'interessado']
+    ordering = ['-id']
+    
+    fields = ['evento', 'interessado', 'recebida_em', 'status', 'inscricao', 'mensagem',
+              'executor', 'reservada_em', 'processada_em']
+    readonly_fields = fields
+    
+    def has_add_permission(self, request):
+        """Registradas pelo formulário de inscrição no modo fila"""
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def status_badge(self, obj):
+        """Status com cor"""
+        cores = {
+            StatusRecebimento.PENDENTE: '#6c757d',
+            StatusRecebimento.PROCESSANDO: '#007bff',
+            StatusRecebimento.INSCRITA: '#28a745',
+            StatusRecebimento.JA_INSCRITO: '#fd7e14',
+            StatusRecebimento.RECUSADA: '#dc3545',
+        }
+        return format_html(
+            '<span style="background-color: {}; color: white; padding: 3px 8px; '
+            'border-radius: 3px;">{}</span>',
+            cores.get(obj.status, '#6c757d'), obj.get_status_display()
+        )
+    status_badge.short_description = 'Status'
@@ -5,3 +5,8 @@ class CursoseoutrosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.cursoseoutros'
 
+    def ready(self):
+        # Registra os sinais da reclassificação incremental e do cache de inscrição
+        from . import signals  # noqa: F401
+        # Registra as verificações de sistema (cache compartilhado)
+        from . import checks  # noqa: F401
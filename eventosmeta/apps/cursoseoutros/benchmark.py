@@ -0,0 +1,366 @@
+"""
+ARQUIVO: apps/cursoseoutros/benchmark.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Gerador de coorte sintética e cenários medidos da classificação
+DATA/HORA: 2026-10-17 01:49:34
+"""
+
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import date, datetime, time as hora, timedelta
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+from apps.interessados.models import Fototipo, Interessado
+from .incremental import ReclassificadorIncremental
+from .models import (
+    Criterio, Evento, EventoCriterio, Inscricao, InscricaoCriterioAtendido,
+    Status, StatusInscricao, TipoCriterio, TipoReserva
+)
+from .relatorio import (
+    CHAVE_DETALHES, CHAVE_RESULTADO, gerar_csv, montar_relatorio, versao_atual
+)
+from .services import ClassificadorService
+
+
+# Linhas por INSERT na geração (abaixo do limite de parâmetros do SQLite)
+TAMANHO_LOTE_GERACAO = 500
+
+
+# ============================================
+# GERADOR DE COORTE SINTÉTICA
+# ============================================
+
+def gerar_evento_sintetico(tamanho, semente, prefixo_cpf=0):
+    """
+    Cria um evento com `tamanho` inscrições, um critério de cada tipo e
+    cotas (NIS percentual, PCD número fixo), com dados aleatórios mas
+    reproduzíveis: a mesma semente gera sempre os mesmos dados.
+
+    Tudo é gravado com bulk_create (sem signals: nenhuma reclassificação
+    é disparada durante a geração).
+
+    Args:
+        tamanho (int): Quantidade de inscrições (até 100 milhões)
+        semente (int): Semente do gerador aleatório
+        prefixo_cpf (int): 0-999, distingue os CPFs de eventos gerados
+                           no mesmo banco
+
+    Returns:
+        Evento: Evento gerado (ainda não classificado)
+    """
+    aleatorio = random.Random(semente)
+
+    status, _ = Status.objects.get_or_create(
+        status='Benchmark', defaults={'permite_inscricao': True}
+    )
+    fototipos = [
+        Fototipo.objects.get_or_create(nome=f'Benchmark {numero}')[0]
+        for numero in range(1, 7)
+    ]
+
+    inicio = date(2026, 1, 5)
+    evento = Evento.objects.create(
+        descricao=f'Benchmark: {tamanho} inscrições (semente {semente})',
+        status=status,
+        vagas=max(10, tamanho // 10),
+        inicio_inscricoes=inicio,
+        fim_inscricoes=inicio + timedelta(days=30),
+    )
+
+    # Um critério de cada tipo, pesos aleatórios
+    evento_criterios = []
+    for ordem, tipo in enumerate(TipoCriterio.values, start=1):
+        criterio, _ = Criterio.objects.get_or_create(
+            descricao_criterio=f'Benchmark {tipo}', tipo_criterio=tipo
+        )
+        evento_criterio = EventoCriterio(
+            evento=evento,
+            criterio=criterio,
+            peso=aleatorio.randint(1, 10),
+            ordem=ordem,
+        )
+        if tipo == TipoCriterio.FAIXA_ETARIA:
+            evento_criterio.idade_minima = 18
+            evento_criterio.idade_maxima = 29
+        elif tipo == TipoCriterio.NIS:
+            evento_criterio.tipo_reserva = TipoReserva.PERCENTUAL
+            evento_criterio.vagas_reservadas = 10
+        elif tipo == TipoCriterio.PCD:
+            evento_criterio.tipo_reserva = TipoReserva.NUMERO_FIXO
+            evento_criterio.vagas_reservadas = max(1, evento.vagas // 20)
+        evento_criterios.append(evento_criterio)
+    evento_criterios = EventoCriterio.objects.bulk_create(evento_criterios)
+
+    por_tipo = {
+        evento_criterio.criterio.tipo_criterio: evento_criterio
+        for evento_criterio in evento_criterios
+    }
+    EventoCriterio.fototipos_prioritarios.through.objects.bulk_create([
+        EventoCriterio.fototipos_prioritarios.through(
+            eventocriterio_id=por_tipo[TipoCriterio.FOTOTIPO].id, fototipo_id=fototipo.id
+        )
+        for fototipo in fototipos[:2]
+    ])
+
+    # Interessados
+    nascimento_mais_antigo = date(1950, 1, 1)
+    interessados = []
+    for numero in range(tamanho):
+        necessidade = aleatorio.random() < 0.15
+        interessados.append(Interessado(
+            cpf=f'{prefixo_cpf:03d}{numero:08d}',
+            nome=f'Inscrito Benchmark {numero}',
+            senha='!',
+            data_nascimento=(
+                nascimento_mais_antigo + timedelta(days=aleatorio.randint(0, 25000))
+                if aleatorio.random() > 0.05 else None
+            ),
+            programa_social=aleatorio.random() < 0.3,
+            num_nis='12345678901' if aleatorio.random() < 0.5 else '',
+            necessidades_especiais=necessidade,
+            fisica=necessidade and aleatorio.random() < 0.5,
+            visual=necessidade and aleatorio.random() < 0.5,
+            fototipo=aleatorio.choice(fototipos + [None]),
+        ))
+    interessados = Interessado.objects.bulk_create(interessados, batch_size=TAMANHO_LOTE_GERACAO)
+
+    # Inscrições ao longo do período (algumas no mesmo minuto: empates)
+    abertura = timezone.make_aware(datetime.combine(inicio, hora.min))
+    minutos = 30 * 24 * 60
+    inscricoes = Inscricao.objects.bulk_create(
+        [
+            Inscricao(
+                evento=evento,
+                interessado=interessado,
+                data_inscricao=abertura + timedelta(minutes=aleatorio.randrange(minutos)),
+            )
+            for interessado in interessados
+        ],
+        batch_size=TAMANHO_LOTE_GERACAO
+    )
+
+    # Critério customizado validado para parte dos inscritos
+    criterio_customizado = por_tipo[TipoCriterio.CUSTOMIZADO].criterio
+    InscricaoCriterioAtendido.objects.bulk_create(
+        [
+            InscricaoCriterioAtendido(
+                inscricao=inscricao,
+                criterio=criterio_customizado,
+                pontos_obtidos=Decimal(aleatorio.randint(0, 10000)) / 100,
+                validado=True,
+            )
+            for inscricao in inscricoes
+            if aleatorio.random() < 0.4
+        ],
+        batch_size=TAMANHO_LOTE_GERACAO
+    )
+
+    return evento
+
+
+# ============================================
+# MEDIÇÃO
+# ============================================
+
+class ContadorConsultas:
+    """
+    Conta os comandos SQL executados (connection.execute_wrapper).
+    Não guarda o SQL: não interfere na medição de memória nem tem o
+    limite de 9000 consultas de connection.queries.
+    """
+
+    def __init__(self):
+        self.total = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.total += 1
+        return execute(sql, params, many, context)
+
+
+def medir(funcao, repeticoes=3):
+    """
+    Mede uma função: tempo (várias execuções), consultas e pico de memória.
+
+    O tempo é medido sem o tracemalloc ligado (ele deixa o Python bem mais
+    lento); a memória é medida numa execução extra, à parte.
+
+    Args:
+        funcao (callable): Cenário; recebe o número da execução
+        repeticoes (int): Execuções cronometradas
+
+    Returns:
+        dict: segundos_min, segundos_mediana, consultas, pico_memoria_mb
+    """
+    tempos = []
+    consultas = None
+    for execucao in range(repeticoes):
+        contador = ContadorConsultas()
+        with connection.execute_wrapper(contador):
+            inicio = time.perf_counter()
+            funcao(execucao)
+            tempos.append(time.perf_counter() - inicio)
+        if consultas is None:
+            consultas = contador.total
+
+    tracemalloc.start()
+    try:
+        funcao(repeticoes)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'segundos_min': round(min(tempos), 4),
+        'segundos_mediana': round(statistics.median(tempos), 4),
+        'consultas': consultas,
+        'pico_memoria_mb': round(pico / 1024 / 1024, 2),
+    }
+
+
+# ============================================
+# CENÁRIOS
+# ============================================
+# Cada cenário recebe o evento (já classificado, exceto o primeiro) e
+# devolve a função medida. Rodam nesta ordem sobre o mesmo evento.
+
+def cenario_classificacao_completa(evento):
+    def executar(execucao):
+        ClassificadorService.classificar_evento(evento)
+    return executar
+
+
+def cenario_reclassificacao_incremental(evento):
+    """Uma desistência por execução (da fila de espera), aplicada incrementalmente"""
+    fila = list(
+        evento.inscricoes.filter(
+            status=StatusInscricao.FILA_ESPERA
+        ).order_by('-classificacao__posicao').values_list('pk', flat=True)
+    )
+
+    def executar(execucao):
+        inscricao_id = fila[execucao]
+        Inscricao.objects.filter(pk=inscricao_id).update(status=StatusInscricao.DESISTENTE)
+        reclassificador = ReclassificadorIncremental(evento)
+        reclassificador.inscricao_removida(inscricao_id)
+        reclassificador.aplicar()
+    return executar
+
+
+def _esquecer_instantaneos(evento):
+    versao = versao_atual(evento.id)
+    cache.delete_many([
+        CHAVE_RESULTADO.format(evento_id=evento.id, versao=versao),
+        CHAVE_DETALHES.format(evento_id=evento.id, versao=versao),
+    ])
+
+
+def cenario_relatorio(evento):
+    """Relatório sem instantâneo no cache (primeira leitura após classificar)"""
+    def executar(execucao):
+        _esquecer_instantaneos(evento)
+        montar_relatorio(evento)
+    return executar
+
+
+def cenario_relatorio_em_cache(evento):
+    """Relatório com o instantâneo da versão atual já no cache"""
+    montar_relatorio(evento)
+
+    def executar(execucao):
+        montar_relatorio(evento)
+    return executar
+
+
+def cenario_exportacao_csv(evento):
+    def executar(execucao):
+        for _ in gerar_csv(evento):
+            pass
+    return executar
+
+
+CENARIOS = {
+    'classificacao_completa': cenario_classificacao_completa,
+    'reclassificacao_incremental': cenario_reclassificacao_incremental,
+    'relatorio': cenario_relatorio,
+    'relatorio_em_cache': cenario_relatorio_em_cache,
+    'exportacao_csv': cenario_exportacao_csv,
+}
+
+
+def executar_benchmark(tamanho, semente, cenarios=None, repeticoes=3, prefixo_cpf=0):
+    """
+    Gera um evento sintético e mede os cenários sobre ele.
+
+    Args:
+        tamanho (int): Inscrições no evento
+        semente (int): Semente do gerador
+        cenarios (list): Nomes de CENARIOS (padrão: todos, na ordem)
+        repeticoes (int): Execuções cronometradas por cenário
+        prefixo_cpf (int): Ver gerar_evento_sintetico()
+
+    Returns:
+        list: Um dict por cenário (tamanho, cenario + métricas de medir())
+    """
+    inicio = time.perf_counter()
+    evento = gerar_evento_sintetico(tamanho, semente, prefixo_cpf)
+    geracao = time.perf_counter() - inicio
+
+    # O evento recarregado, como numa requisição
+    evento = Evento.objects.select_related('status').get(pk=evento.pk)
+
+    resultados = []
+    for nome in cenarios or CENARIOS:
+        # Cenários seguintes precisam do evento já classificado
+        if nome != 'classificacao_completa' and not resultados:
+            ClassificadorService.classificar_evento(evento)
+
+        metricas = medir(CENARIOS[nome](evento), repeticoes)
+        resultados.append({
+            'tamanho': tamanho,
+            'cenario': nome,
+            'geracao_segundos': round(geracao, 2),
+            **metricas,
+        })
+
+    return resultados
+
+
+def comparar_resultados(atuais, base, tolerancia):
+    """
+    Compara com um resultado anterior (mesmos tamanho e cenário).
+
+    Tempo e memória podem crescer até `tolerancia` (fração); consultas não
+    podem crescer.
+
+    Returns:
+        list: Descrição de cada regressão encontrada
+    """
+    anteriores = {
+        (resultado['tamanho'], resultado['cenario']): resultado
+        for resultado in base
+    }
+
+    regressoes = []
+    for resultado in atuais:
+        anterior = anteriores.get((resultado['tamanho'], resultado['cenario']))
+        if anterior is None:
+            continue
+
+        rotulo = f'{resultado["cenario"]} ({resultado["tamanho"]})'
+        for metrica in ('segundos_min', 'pico_memoria_mb'):
+            limite = anterior[metrica] * (1 + tolerancia)
+            if resultado[metrica] > limite:
+                regressoes.append(
+                    f'{rotulo}: {metrica} {resultado[metrica]} > {anterior[metrica]} '
+                    f'(+{tolerancia:.0%} = {limite:.4f})'
+                )
+        if resultado['consultas'] > anterior['consultas']:
+            regressoes.append(
+                f'{rotulo}: consultas {resultado["consultas"]} > {anterior["consultas"]}'
+            )
+
+    return regressoes
@@ -0,0 +1,42 @@
+"""
+ARQUIVO: apps/cursoseoutros/checks.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Verificação de sistema: reclassificação incremental exige cache compartilhado
+DATA/HORA: 2026-10-17 02:28:08
+"""
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+# Caches que cada processo tem o seu (nada é visto pelos outros workers)
+CACHES_POR_PROCESSO = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches)
+def verificar_cache_incremental(app_configs, **kwargs):
+    """
+    A tabela de scores da reclassificação incremental (incremental.py) fica
+    no cache padrão. Em produção, com vários workers, um cache por processo
+    faz quase toda mudança virar uma classificação completa na fila de
+    tarefas. Em desenvolvimento (DEBUG) o runserver é um processo só.
+    """
+    if settings.DEBUG or not getattr(settings, 'CLASSIFICACAO_INCREMENTAL', False):
+        return []
+
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if backend not in CACHES_POR_PROCESSO:
+        return []
+
+    return [Warning(
+        'CLASSIFICACAO_INCREMENTAL está ligada com um cache por processo '
+        f'({backend.rsplit(".", 1)[-1]}).',
+        hint=(
+            'Configure CACHES["default"] com um cache compartilhado entre os '
+            'workers (Redis/Memcached) ou desligue CLASSIFICACAO_INCREMENTAL.'
+        ),
+        id='cursoseoutros.W001',
+    )]
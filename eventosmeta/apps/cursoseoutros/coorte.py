@@ -0,0 +1,192 @@
+"""
+ARQUIVO: apps/cursoseoutros/coorte.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Carga colunar das inscrições de um evento para classificação em lote
+         + STATUS_VAGA_GARANTIDA (matriculados mantêm status e vaga)
+         + STATUS_COM_VAGA (aprovados e matriculados)
+DATA/HORA: 2026-10-17 01:10:24
+"""
+
+from datetime import date
+from .models import StatusInscricao
+
+
+# Inscrições que deixaram o processo não concorrem às vagas
+STATUS_FORA_DA_CLASSIFICACAO = [
+    StatusInscricao.DESISTENTE,
+    StatusInscricao.NAO_COMPARECEU,
+]
+
+# Inscrições que já garantiram a vaga: continuam classificadas, mas a
+# classificação não mexe no status nem tira a vaga delas
+STATUS_VAGA_GARANTIDA = [
+    StatusInscricao.MATRICULADO,
+]
+
+# Inscrições que ocupam uma vaga do evento
+STATUS_COM_VAGA = [StatusInscricao.APROVADO] + STATUS_VAGA_GARANTIDA
+
+
+class Coorte:
+    """
+    Fotografia colunar das inscrições de um evento.
+
+    Em vez de uma lista de objetos Inscricao (cada um com seu Interessado),
+    guarda uma lista por coluna. A posição i de todas as colunas se refere
+    à mesma inscrição, o que permite calcular um critério para a coorte
+    inteira de uma só vez.
+
+    Além das colunas básicas, só são carregadas as colunas declaradas pelos
+    pontuadores dos critérios do evento (ver pontuadores.py).
+
+    Toda a carga é feita com UMA consulta (values_list com JOIN no interessado).
+    Inscrições desistentes ou que não compareceram ficam de fora.
+    """
+
+    # Colunas sempre carregadas (identificação e desempate):
+    # atributo da coorte → campo consultado a partir de Inscricao
+    COLUNAS = {
+        'inscricao_ids': 'id',
+        'interessado_ids': 'interessado_id',
+        'datas_inscricao': 'data_inscricao',
+    }
+
+    def __init__(self, evento, colunas, parcial=False, campos=None):
+        """
+        Args:
+            evento (Evento): Evento ao qual a coorte pertence
+            colunas (dict): Nome da coluna → lista de valores alinhados
+            parcial (bool): Só parte das inscrições do evento foi carregada
+            campos (dict): Nome da coluna → campo de origem
+                (padrão: só as colunas básicas)
+        """
+        self.evento = evento
+        self.parcial = parcial
+        self.campos = dict(campos or self.COLUNAS)
+        for nome in self.campos:
+            setattr(self, nome, colunas.get(nome, []))
+        self._idades = {}
+
+    def __len__(self):
+        return len(self.inscricao_ids)
+
+    @classmethod
+    def carregar(cls, evento, inscricao_ids=None, colunas=None):
+        """
+        Carrega as inscrições do evento em formato colunar.
+
+        Desistentes e não comparecidos ficam de fora: não concorrem à vaga
+        nem contam no total e nas inscrições anteriores da ORDEM de
+        inscrição (a versão original contava todas as inscrições).
+
+        Args:
+            evento (Evento): Evento a ser carregado
+            inscricao_ids (list): Restringe a carga a estas inscrições
+                (usado pela reclassificação incremental)
+            colunas (dict): Colunas extras (nome → campo a partir de Inscricao)
+
+        Returns:
+            Coorte: Colunas alinhadas por inscrição (ordem de inscrição)
+        """
+        campos = dict(cls.COLUNAS)
+        campos.update(colunas or {})
+
+        consulta = evento.inscricoes.exclude(status__in=STATUS_FORA_DA_CLASSIFICACAO)
+        if inscricao_ids is not None:
+            consulta = consulta.filter(id__in=inscricao_ids)
+
+        linhas = consulta.order_by('data_inscricao', 'id').values_list(
+            *campos.values()
+        )
+
+        # Transpõe linhas → colunas
+        valores = list(zip(*linhas))
+        dados = {
+            nome: list(valores[indice]) if valores else []
+            for indice, nome in enumerate(campos)
+        }
+
+        return cls(evento, dados, parcial=inscricao_ids is not None, campos=campos)
+
+    @classmethod
+    def de_inscricoes(cls, evento, inscricoes, colunas=None):
+        """
+        Monta a coorte a partir de objetos Inscricao já carregados,
+        seguindo os campos pelos atributos (sem consulta se os relacionamentos
+        já estiverem em memória).
+
+        Args:
+            evento (Evento): Evento das inscrições
+            inscricoes (list): Inscrições, na ordem desejada
+            colunas (dict): Colunas extras (nome → campo a partir de Inscricao)
+
+        Returns:
+            Coorte: Coorte parcial com estas inscrições
+        """
+        campos = dict(cls.COLUNAS)
+        campos.update(colunas or {})
+
+        def valor(objeto, campo):
+            for parte in campo.split('__'):
+                if objeto is None:
+                    return None
+                objeto = getattr(objeto, parte)
+            return objeto
+
+        dados = {
+            nome: [valor(inscricao, campo) for inscricao in inscricoes]
+            for nome, campo in campos.items()
+        }
+
+        return cls(evento, dados, parcial=True, campos=campos)
+
+    def indice(self, inscricao_id):
+        """Posição da inscrição nas colunas (ValueError se não pertencer à coorte)"""
+        return self.inscricao_ids.index(inscricao_id)
+
+    def anexar(self, outra):
+        """
+        Acrescenta ao final as linhas de outra coorte do mesmo evento.
+
+        Args:
+            outra (Coorte): Linhas a acrescentar
+        """
+        for nome in self.campos:
+            getattr(self, nome).extend(getattr(outra, nome))
+        self._idades = {}
+
+    def remover(self, indice):
+        """
+        Remove uma linha de todas as colunas.
+
+        Args:
+            indice (int): Posição da linha
+        """
+        for nome in self.campos:
+            del getattr(self, nome)[indice]
+        self._idades = {}
+
+    def idades(self, referencia=None):
+        """
+        Idade em anos completos de cada inscrito, calculada uma única vez
+        por data de referência.
+
+        Args:
+            referencia (date): Data usada no cálculo (padrão: hoje)
+
+        Returns:
+            list: Idades alinhadas com as demais colunas (0 se sem nascimento)
+        """
+        referencia = referencia or date.today()
+
+        if referencia not in self._idades:
+            chave_ref = (referencia.month, referencia.day)
+            self._idades[referencia] = [
+                (
+                    referencia.year - nascimento.year
+                    - ((nascimento.month, nascimento.day) > chave_ref)
+                ) if nascimento else 0
+                for nascimento in self.datas_nascimento
+            ]
+
+        return self._idades[referencia]
@@ -0,0 +1,184 @@
+"""
+ARQUIVO: apps/cursoseoutros/cotas.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Alocação de vagas com reserva por critério (cotas)
+         + vagas já garantidas (matriculados) contadas antes da distribuição
+DATA/HORA: 2026-10-17 01:19:40
+"""
+
+import heapq
+import math
+from .models import TipoCriterio, TipoReserva
+from .pontuadores import CEM
+
+
+# Critérios em que só quem está dentro da configuração concorre à reserva
+# (nos demais basta ter pontuado no critério)
+CRITERIOS_ELEGIBILIDADE_TOTAL = {TipoCriterio.FAIXA_ETARIA}
+
+
+def calcular_vagas_reservadas(evento, evento_criterio):
+    """
+    Quantidade de vagas reservadas por um critério.
+
+    - PERCENTUAL: percentual das vagas do evento, arredondado para cima
+    - NUMERO_FIXO: o próprio número informado
+    - SEM_RESERVA: nenhuma
+
+    Args:
+        evento (Evento): Evento com o total de vagas
+        evento_criterio (EventoCriterio): Configuração do critério
+
+    Returns:
+        int: Vagas reservadas
+    """
+    if evento_criterio.tipo_reserva == TipoReserva.PERCENTUAL:
+        return math.ceil(evento.vagas * evento_criterio.vagas_reservadas / 100)
+
+    if evento_criterio.tipo_reserva == TipoReserva.NUMERO_FIXO:
+        return evento_criterio.vagas_reservadas
+
+    return 0
+
+
+def atende_criterio(evento_criterio, pontos_base):
+    """
+    Se a inscrição concorre à reserva do critério.
+
+    Args:
+        evento_criterio (EventoCriterio): Critério com reserva
+        pontos_base (int): Pontos base da inscrição no critério (centésimos)
+
+    Returns:
+        bool
+    """
+    if evento_criterio.criterio.tipo_criterio in CRITERIOS_ELEGIBILIDADE_TOTAL:
+        return pontos_base >= CEM
+    return pontos_base > 0
+
+
+class Alocacao:
+    """
+    Resultado da distribuição das vagas.
+
+    Attributes:
+        cotas (dict): inscricao_id aprovado → EventoCriterio.id da reserva
+                      (None = ampla concorrência)
+        reservadas (dict): EventoCriterio.id → vagas reservadas
+        preenchidas (dict): EventoCriterio.id → vagas da reserva preenchidas
+        liberadas (int): Vagas reservadas não preenchidas, devolvidas à
+                         ampla concorrência
+    """
+
+    def __init__(self, cotas, reservadas, preenchidas, liberadas):
+        self.cotas = cotas
+        self.reservadas = reservadas
+        self.preenchidas = preenchidas
+        self.liberadas = liberadas
+
+
+def alocar_vagas(evento, resultado, ordem, garantidas=None):
+    """
+    Distribui as vagas do evento respeitando as reservas por critério.
+
+    Cada fila é um heap de posições na classificação geral, ou seja,
+    ordenado por score (maior primeiro) e data de inscrição. Quem já foi
+    aprovado é descartado ao sair do heap (remoção preguiçosa), então cada
+    inscrição sai no máximo uma vez de cada fila.
+
+    1. Ampla concorrência: vagas não reservadas, pela classificação geral.
+       Quem tem direito a reserva também concorre aqui primeiro.
+    2. Reservas, na ordem de aplicação dos critérios: cada uma é preenchida
+       pelos melhores classificados ainda não aprovados que atendem ao
+       critério.
+    3. Vagas reservadas que sobraram voltam para a ampla concorrência.
+
+    Quem já garantiu a vaga (matriculado) fica com ela, na mesma cota, e
+    é descontado antes: das vagas da reserva que ocupa ou da ampla
+    concorrência (o excesso sai das sobras do passo 3).
+
+    Custo: O(n) para montar cada fila + O(log n) por vaga preenchida.
+
+    Args:
+        evento (Evento): Evento classificado
+        resultado (ResultadoPontuacao): Pontos base por critério
+        ordem (list): Índices da coorte na ordem de classificação
+        garantidas (dict): inscricao_id → EventoCriterio.id da cota (ou
+            None) de quem já garantiu a vaga
+
+    Returns:
+        Alocacao: Aprovados e origem de cada vaga
+    """
+    inscricao_ids = resultado.coorte.inscricao_ids
+    posicao_de = [0] * len(ordem)
+    for posicao, indice in enumerate(ordem):
+        posicao_de[indice] = posicao
+
+    # Reservas, limitadas ao total de vagas do evento
+    reservadas = {}
+    restante = evento.vagas
+    for evento_criterio in resultado.evento_criterios:
+        quantidade = min(calcular_vagas_reservadas(evento, evento_criterio), restante)
+        if quantidade > 0:
+            reservadas[evento_criterio.id] = quantidade
+            restante -= quantidade
+
+    cotas = {}
+    aprovados = set()
+
+    # Vagas já garantidas: cota → quantidade (None = ampla concorrência)
+    ocupadas = {}
+    if garantidas:
+        indice_de = {inscricao_id: indice for indice, inscricao_id in enumerate(inscricao_ids)}
+        for inscricao_id, cota in garantidas.items():
+            indice = indice_de.get(inscricao_id)
+            if indice is None:
+                continue
+            if cota not in reservadas:
+                cota = None
+            aprovados.add(indice)
+            cotas[inscricao_id] = cota
+            ocupadas[cota] = ocupadas.get(cota, 0) + 1
+
+    # Fila geral: a própria ordem de classificação já é um heap válido
+    fila_geral = list(range(len(ordem)))
+
+    def preencher(fila, vagas, cota):
+        preenchidas = 0
+        while preenchidas < vagas and fila:
+            indice = ordem[heapq.heappop(fila)]
+            if indice in aprovados:
+                continue
+            aprovados.add(indice)
+            cotas[inscricao_ids[indice]] = cota
+            preenchidas += 1
+        return preenchidas
+
+    # 1. Ampla concorrência
+    excesso = max(0, ocupadas.get(None, 0) - restante)
+    preencher(fila_geral, restante - ocupadas.get(None, 0), None)
+
+    # 2. Reservas
+    preenchidas = {}
+    for evento_criterio in resultado.evento_criterios:
+        vagas = reservadas.get(evento_criterio.id)
+        if not vagas:
+            continue
+
+        pontos_base = resultado.pontos_base[evento_criterio.id]
+        fila = [
+            posicao_de[indice] for indice in range(len(ordem))
+            if atende_criterio(evento_criterio, pontos_base[indice])
+        ]
+        heapq.heapify(fila)
+        ja_ocupadas = ocupadas.get(evento_criterio.id, 0)
+        preenchidas[evento_criterio.id] = ja_ocupadas + preencher(
+            fila, vagas - ja_ocupadas, evento_criterio.id
+        )
+
+    # 3. Sobras das reservas voltam para a ampla concorrência
+    # (reserva com mais garantidas que vagas desconta das sobras)
+    liberadas = sum(reservadas.values()) - sum(preenchidas.values())
+    preencher(fila_geral, liberadas - excesso, None)
+
+    return Alocacao(cotas, reservadas, preenchidas, max(0, liberadas))
@@ -0,0 +1,115 @@
+"""
+ARQUIVO: apps/cursoseoutros/desempate.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Desempate da classificação por várias chaves configuráveis por evento
+DATA/HORA: 2026-10-17 01:57:36
+"""
+
+from .models import ChaveDesempate
+from .pontuadores import COLUNA_NASCIMENTO
+from .ranking import ordenar_classificacao
+
+
+# Valor de ordenação de quem não tem o dado (ex: sem data de nascimento):
+# vai depois de todos os demais naquela chave
+POR_ULTIMO = float('inf')
+
+
+def criterio_prioritario(evento_criterios):
+    """
+    Critério de maior prioridade: menor ordem; empate pelo maior peso
+    (mesma ordem de EventoCriterio.Meta.ordering) e, por fim, pelo id.
+
+    Returns:
+        EventoCriterio ou None (evento sem critérios)
+    """
+    if not evento_criterios:
+        return None
+    return min(
+        evento_criterios,
+        key=lambda evento_criterio: (evento_criterio.ordem, -evento_criterio.peso, evento_criterio.id)
+    )
+
+
+# ============================================
+# CHAVES
+# ============================================
+# Cada chave vira uma coluna de valores em ordem crescente (o menor vence),
+# alinhada com a coorte.
+
+def _pontos_criterio_prioritario(resultado):
+    """Mais pontos (ponderados) no critério prioritário primeiro"""
+    prioritario = criterio_prioritario(resultado.evento_criterios)
+    if prioritario is None:
+        return None
+    return [-pontos for pontos in resultado.pontos[prioritario.id]]
+
+
+def _mais_velho(resultado):
+    """Nascimento mais antigo primeiro"""
+    return [
+        nascimento.toordinal() if nascimento else POR_ULTIMO
+        for nascimento in resultado.coorte.datas_nascimento
+    ]
+
+
+def _mais_novo(resultado):
+    """Nascimento mais recente primeiro"""
+    return [
+        -nascimento.toordinal() if nascimento else POR_ULTIMO
+        for nascimento in resultado.coorte.datas_nascimento
+    ]
+
+
+def _data_inscricao(resultado):
+    """Inscrição mais antiga primeiro"""
+    return resultado.coorte.datas_inscricao
+
+
+CHAVES = {
+    ChaveDesempate.CRITERIO_PRIORITARIO: (_pontos_criterio_prioritario, {}),
+    ChaveDesempate.MAIS_VELHO: (_mais_velho, COLUNA_NASCIMENTO),
+    ChaveDesempate.MAIS_NOVO: (_mais_novo, COLUNA_NASCIMENTO),
+    ChaveDesempate.DATA_INSCRICAO: (_data_inscricao, {}),
+}
+
+
+def colunas_desempate(chaves):
+    """
+    Colunas da coorte de que as chaves de desempate precisam.
+
+    Args:
+        chaves (list): ChaveDesempate, em ordem
+
+    Returns:
+        dict: Nome da coluna → campo a partir de Inscricao
+    """
+    colunas = {}
+    for chave in chaves:
+        colunas.update(CHAVES[chave][1])
+    return colunas
+
+
+def ordenar_resultado(resultado, chaves):
+    """
+    Ordena a coorte pontuada: score maior primeiro, depois as chaves de
+    desempate na ordem configurada e, por último, o id da inscrição
+    (resultado sempre o mesmo).
+
+    Cada chave é calculada uma vez para a coorte inteira (coluna) e a
+    ordenação é uma só, sobre tuplas, sem consultas.
+
+    Args:
+        resultado (ResultadoPontuacao): Coorte e scores
+        chaves (list): ChaveDesempate, em ordem (ver Evento.chaves_desempate)
+
+    Returns:
+        list: Índices da coorte na ordem de classificação
+    """
+    colunas = []
+    for chave in chaves:
+        coluna = CHAVES[chave][0](resultado)
+        if coluna is not None:
+            colunas.append(coluna)
+
+    return ordenar_classificacao(resultado.scores, resultado.coorte.inscricao_ids, colunas)
@@ -0,0 +1,356 @@
+"""
+ARQUIVO: apps/cursoseoutros/fila_espera.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Promoção automática da fila de espera quando uma vaga é liberada
+DATA/HORA: 2026-10-17 02:12:44
+"""
+
+import heapq
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+from .coorte import Coorte, STATUS_COM_VAGA, STATUS_FORA_DA_CLASSIFICACAO
+from .cotas import atende_criterio, calcular_vagas_reservadas
+from .incremental import agendar, marcar
+from .models import (
+    Classificacao, Evento, Inscricao, Matricula, MotivoVagaLiberada, PromocaoFilaEspera,
+    StatusInscricao, StatusMatricula
+)
+from .persistencia import incrementar_versao_classificacao
+from .pontuacao import colunas_necessarias, depende_da_coorte, pontos_criterio_lote, precarregar
+
+
+CHAVE_FILA = 'classificacao:fila:{evento_id}'
+TEMPO_CACHE_FILA = 60 * 60 * 24  # 1 dia
+
+MOTIVO_INSCRICAO = {
+    StatusInscricao.DESISTENTE: MotivoVagaLiberada.DESISTENCIA,
+    StatusInscricao.NAO_COMPARECEU: MotivoVagaLiberada.NAO_COMPARECEU,
+}
+
+MOTIVO_MATRICULA = {
+    StatusMatricula.CANCELADA: MotivoVagaLiberada.MATRICULA_CANCELADA,
+    StatusMatricula.TRANCADA: MotivoVagaLiberada.MATRICULA_TRANCADA,
+}
+
+
+def promocao_automatica():
+    """Liga/desliga a promoção da fila de espera (settings.CLASSIFICACAO_PROMOCAO_AUTOMATICA)"""
+    return getattr(settings, 'CLASSIFICACAO_PROMOCAO_AUTOMATICA', True)
+
+
+# ============================================
+# FILA DE ESPERA (cache)
+# ============================================
+
+class FilaEspera:
+    """
+    Fila de espera de um evento classificado, guardada no cache.
+
+    Um heap de posições por fila, como em alocar_vagas: a geral (todos os
+    FILA_ESPERA) e uma por critério com reserva (só quem atende ao
+    critério). Cada vaga liberada tira o primeiro da fila certa em
+    O(log n); quem já foi promovido por outra fila é descartado ao sair do
+    heap (remoção preguiçosa).
+
+    O cache é só um atalho: a promoção em si é um UPDATE condicional
+    (status ainda FILA_ESPERA), então uma fila desatualizada no máximo
+    oferece alguém que é pulado. A fila é remontada quando outra
+    classificação é gravada ou a data de referência das idades muda.
+
+    Attributes:
+        evento_id (int): Evento
+        geral (list): Heap de (posição, inscricao_id)
+        cotas (dict): EventoCriterio.id → heap de (posição, inscricao_id)
+        retirados (set): Inscrições já oferecidas (promovidas ou puladas)
+        gravado_em (datetime): data_classificacao da classificação de origem
+        referencia (date): Data de referência das idades na montagem
+    """
+
+    def __init__(self, evento_id, geral, cotas, gravado_em, referencia):
+        self.evento_id = evento_id
+        self.geral = geral
+        self.cotas = cotas
+        self.retirados = set()
+        self.gravado_em = gravado_em
+        self.referencia = referencia
+
+    @staticmethod
+    def chave(evento_id):
+        return CHAVE_FILA.format(evento_id=evento_id)
+
+    @classmethod
+    def obter(cls, evento):
+        """
+        Fila do evento, do cache se ainda corresponder à classificação
+        gravada (senão é remontada).
+
+        Returns:
+            FilaEspera
+        """
+        gravado_em = Classificacao.objects.filter(
+            inscricao__evento=evento
+        ).aggregate(ultima=Max('data_classificacao'))['ultima']
+        referencia = evento.data_referencia_idades()
+
+        fila = cache.get(cls.chave(evento.id))
+        if fila is None or fila.gravado_em != gravado_em or fila.referencia != referencia:
+            fila = cls.montar(evento, gravado_em, referencia)
+        return fila
+
+    @classmethod
+    def montar(cls, evento, gravado_em, referencia):
+        """
+        Monta a fila a partir das classificações gravadas: O(n) para
+        carregar, O(n) para cada heap (a lista já vem ordenada).
+        """
+        linhas = list(Classificacao.objects.filter(
+            inscricao__evento=evento,
+            inscricao__status=StatusInscricao.FILA_ESPERA,
+            posicao__isnull=False
+        ).order_by('posicao').values_list('posicao', 'inscricao_id', 'pontos_criterios'))
+
+        geral = [(posicao, inscricao_id) for posicao, inscricao_id, _ in linhas]
+
+        reservas = [
+            evento_criterio for evento_criterio in evento.evento_criterios.select_related(
+                'criterio'
+            ).prefetch_related('fototipos_prioritarios').filter(criterio__ativo=True)
+            if calcular_vagas_reservadas(evento, evento_criterio) > 0
+        ]
+
+        cotas = {}
+        if reservas and linhas:
+            pontos_base = cls._pontos_base(evento, reservas, linhas, referencia)
+            for evento_criterio in reservas:
+                base = pontos_base[evento_criterio.id]
+                cotas[evento_criterio.id] = [
+                    (posicao, inscricao_id) for posicao, inscricao_id in geral
+                    if atende_criterio(evento_criterio, base.get(inscricao_id, 0))
+                ]
+
+        return cls(evento.id, geral, cotas, gravado_em, referencia)
+
+    @staticmethod
+    def _pontos_base(evento, reservas, linhas, referencia):
+        """
+        Pontos base de quem está na fila nos critérios com reserva.
+
+        Calculados pelos pontuadores só para a fila de espera (o critério
+        pode ter peso 0 e não aparecer no detalhamento do score). Critérios
+        que dependem da coorte inteira (ORDEM) vêm do detalhamento gravado.
+
+        Returns:
+            dict: EventoCriterio.id → {inscricao_id: pontos base (centésimos)}
+        """
+        pontos_base = {}
+
+        da_coorte = [evento_criterio for evento_criterio in reservas if depende_da_coorte(evento_criterio)]
+        for evento_criterio in da_coorte:
+            chave = str(evento_criterio.id)
+            pontos_base[evento_criterio.id] = {
+                inscricao_id: pontos.get(chave, 0) // evento_criterio.peso if evento_criterio.peso else 0
+                for _, inscricao_id, pontos in linhas
+            }
+
+        demais = [evento_criterio for evento_criterio in reservas if not depende_da_coorte(evento_criterio)]
+        if demais:
+            coorte = Coorte.carregar(
+                evento,
+                inscricao_ids=[inscricao_id for _, inscricao_id, _ in linhas],
+                colunas=colunas_necessarias(demais)
+            )
+            precarga = precarregar(coorte, demais)
+            for evento_criterio in demais:
+                pontos_base[evento_criterio.id] = dict(zip(
+                    coorte.inscricao_ids,
+                    pontos_criterio_lote(coorte, evento_criterio, referencia, precarga)
+                ))
+
+        return pontos_base
+
+    def proximo(self, cota_id=None):
+        """
+        Retira o primeiro da fila da cota (ou da geral).
+
+        Args:
+            cota_id (int): EventoCriterio.id da reserva (None = fila geral)
+
+        Returns:
+            tuple: (posição, inscricao_id) ou None (fila vazia)
+        """
+        fila = self.geral if cota_id is None else self.cotas.get(cota_id, [])
+        while fila:
+            posicao, inscricao_id = heapq.heappop(fila)
+            if inscricao_id not in self.retirados:
+                self.retirados.add(inscricao_id)
+                return posicao, inscricao_id
+        return None
+
+    def salvar(self):
+        cache.set(self.chave(self.evento_id), self, TEMPO_CACHE_FILA)
+
+    @classmethod
+    def invalidar(cls, evento_id):
+        cache.delete(cls.chave(evento_id))
+
+
+# ============================================
+# PROMOÇÃO
+# ============================================
+
+def liberar_vaga_inscricao(inscricao, status_anterior):
+    """
+    Inscrição aprovada/matriculada saiu do processo (chamada por
+    Inscricao.save, dentro da transação): as matrículas confirmadas são
+    canceladas e a vaga vai para a fila de espera.
+
+    Args:
+        inscricao (Inscricao): Inscrição já gravada com o status novo
+        status_anterior (str): StatusInscricao antes da alteração
+
+    Returns:
+        PromocaoFilaEspera ou None (não liberou vaga)
+    """
+    if status_anterior not in STATUS_COM_VAGA or inscricao.status not in MOTIVO_INSCRICAO:
+        return None
+
+    cancelar_matriculas(inscricao)
+    if not promocao_automatica():
+        return None
+
+    return promover(inscricao.evento_id, inscricao.pk, MOTIVO_INSCRICAO[inscricao.status])
+
+
+def cancelar_matriculas(inscricao):
+    """
+    Cancela as matrículas confirmadas do interessado nas turmas do evento,
+    liberando as vagas da turma e do evento (Matricula.save). Como a
+    inscrição já saiu do processo, liberar_vaga_matricula não promove de
+    novo.
+
+    Args:
+        inscricao (Inscricao): Inscrição que saiu do processo
+    """
+    matriculas = Matricula.objects.select_related('turma').filter(
+        turma__evento_id=inscricao.evento_id,
+        interessado_id=inscricao.interessado_id,
+        status=StatusMatricula.CONFIRMADA
+    )
+    for matricula in matriculas:
+        matricula.status = StatusMatricula.CANCELADA
+        matricula.save(update_fields=['status'])
+
+
+def liberar_vaga_matricula(matricula):
+    """
+    Matrícula confirmada foi cancelada ou trancada (chamada por
+    Matricula.save, dentro da transação): a inscrição do aluno no evento
+    vira DESISTENTE e a vaga vai para a fila de espera.
+
+    Args:
+        matricula (Matricula): Matrícula já gravada com o status novo
+
+    Returns:
+        PromocaoFilaEspera ou None (não liberou vaga)
+    """
+    if not promocao_automatica():
+        return None
+
+    evento_id = matricula.turma.evento_id
+    inscricao_id = Inscricao.objects.filter(
+        evento_id=evento_id,
+        interessado_id=matricula.interessado_id
+    ).values_list('id', flat=True).first()
+    if inscricao_id is None:
+        return None
+
+    # Condicional: duas baixas simultâneas da mesma vaga promovem uma vez só
+    liberou = Inscricao.objects.filter(
+        pk=inscricao_id, status__in=STATUS_COM_VAGA
+    ).update(status=StatusInscricao.DESISTENTE)
+    if not liberou:
+        return None
+
+    return promover(evento_id, inscricao_id, MOTIVO_MATRICULA[matricula.status])
+
+
+def promover(evento_id, inscricao_liberada_id, motivo):
+    """
+    Passa a vaga liberada para o próximo da fila de espera e registra a
+    auditoria. Deve rodar na transação que liberou a vaga: se ela for
+    desfeita, a promoção também é.
+
+    A vaga de uma reserva vai para o melhor classificado na fila que atende
+    ao critério; sem ninguém, volta para a ampla concorrência (como as
+    sobras em alocar_vagas). Vaga de ampla concorrência vai para o melhor
+    classificado na fila.
+
+    Com a reclassificação incremental ligada, a promoção é marcada para a
+    tabela em cache, e a reclassificação depois do commit confere o
+    resultado com a distribuição completa das vagas.
+
+    Args:
+        evento_id (int): Evento
+        inscricao_liberada_id (int): Inscrição que saiu (já com status fora)
+        motivo (str): MotivoVagaLiberada
+
+    Returns:
+        PromocaoFilaEspera: Registro da promoção (inscricao_promovida vazia
+            se não havia ninguém na fila)
+    """
+    evento = Evento.objects.get(pk=evento_id)
+    cota_liberada_id = Classificacao.objects.filter(
+        inscricao_id=inscricao_liberada_id
+    ).values_list('cota_id', flat=True).first()
+
+    fila = FilaEspera.obter(evento)
+
+    promovida = None
+    cota_preenchida_id = None
+    filas = [cota_liberada_id, None] if cota_liberada_id else [None]
+    for cota_id in filas:
+        candidato = fila.proximo(cota_id)
+        while candidato is not None:
+            # Só promove quem ainda está na fila (pode ter mudado depois do cache)
+            if Inscricao.objects.filter(
+                pk=candidato[1], status=StatusInscricao.FILA_ESPERA
+            ).update(status=StatusInscricao.APROVADO):
+                promovida = candidato
+                cota_preenchida_id = cota_id
+                break
+            candidato = fila.proximo(cota_id)
+        if promovida is not None:
+            break
+
+    # Quem saiu perde a posição e a vaga (como na classificação completa)
+    Classificacao.objects.filter(
+        inscricao_id=inscricao_liberada_id,
+        inscricao__status__in=STATUS_FORA_DA_CLASSIFICACAO
+    ).update(posicao=None, cota=None)
+
+    if promovida is not None:
+        Classificacao.objects.filter(inscricao_id=promovida[1]).update(cota_id=cota_preenchida_id)
+
+    promocao = PromocaoFilaEspera.objects.create(
+        evento=evento,
+        motivo=motivo,
+        inscricao_liberada_id=inscricao_liberada_id,
+        cota_liberada_id=cota_liberada_id,
+        inscricao_promovida_id=promovida[1] if promovida else None,
+        posicao_promovida=promovida[0] if promovida else None,
+        cota_preenchida_id=cota_preenchida_id
+    )
+
+    incrementar_versao_classificacao(evento_id)
+    transaction.on_commit(fila.salvar)
+
+    if getattr(settings, 'CLASSIFICACAO_INCREMENTAL', False):
+        reclassificador = marcar(evento_id)
+        reclassificador.inscricao_removida(inscricao_liberada_id)
+        if promovida is not None:
+            reclassificador.situacao_alterada(promovida[1])
+        agendar()
+
+    return promocao
@@ -8,10 +8,12 @@ DATA/HORA: 2025-10-29 15:00:00
 from django import forms
 from django.core.exceptions import ValidationError
 from django.utils import timezone
-from datetime import date
 from .models import (
-    Evento, Inscricao, Turma, Matricula, Avaliacao,
-    Criterio, EventoCriterio, InscricaoCriterioAtendido
+    Evento, Turma, Matricula, Avaliacao, VagasEsgotadas,
+    Criterio, EventoCriterio, InscricaoCriterioAtendido, ReferenciaIdade
+)
+from .inscricoes import (
+    MENSAGEM_JA_INSCRITO, obter_descritor_evento, receber_inscricao, registrar_inscricao
 )
 
 
@@ -19,12 +21,24 @@ from .models import (
 # FORM: INSCRIÇÃO EM EVENTO (PÚBLICO)
 # ============================================
 
-class InscricaoEventoForm(forms.ModelForm):
+class InscricaoEventoForm(forms.Form):
     """
     Formulário para interessado se inscrever em evento.
     Usado na área pública do sistema.
+    
+    Feito para o pico de abertura das inscrições: a validação usa o
+    descritor do evento em cache e save() é um único INSERT (ver
+    inscricoes.py). Inscrição repetida não é verificada antes: o banco
+    recusa o INSERT e save() devolve None com o erro no formulário.
+    
+    No modo fila do evento (inscricao_por_fila) save() só registra o envio
+    e devolve o recibo; a inscrição é criada pelo comando processar_inscricoes.
     """
     
+    evento = forms.IntegerField(
+        widget=forms.HiddenInput()  # Evento já vem selecionado
+    )
+    
     aceite_termos = forms.BooleanField(
         label='Li e aceito os termos e condições',
         required=True,
@@ -33,77 +47,47 @@ class InscricaoEventoForm(forms.ModelForm):
         }
     )
     
-    class Meta:
-        model = Inscricao
-        fields = ['evento']
-        widgets = {
-            'evento': forms.HiddenInput()  # Evento já vem selecionado
-        }
-    
     def __init__(self, *args, **kwargs):
         self.interessado = kwargs.pop('interessado', None)
         self.evento = kwargs.pop('evento', None)
+        self.descritor = None
         super().__init__(*args, **kwargs)
         
         if self.evento:
-            self.fields['evento'].initial = self.evento
+            self.fields['evento'].initial = self.evento.pk
     
     def clean_evento(self):
-        """Valida se o evento aceita inscrições"""
-        evento = self.cleaned_data.get('evento')
+        """Valida se o evento aceita inscrições (status e período)"""
+        evento_id = self.cleaned_data.get('evento')
         
-        if not evento:
+        descritor = obter_descritor_evento(evento_id) if evento_id else None
+        if descritor is None:
             raise ValidationError('Evento não informado.')
         
-        # Verifica se status permite inscrição
-        if not evento.status.permite_inscricao:
-            raise ValidationError(
-                f'Este evento não está aceitando inscrições. '
-                f'Status atual: {evento.status.status}'
-            )
-        
-        # Verifica período de inscrição
-        hoje = date.today()
-        
-        if evento.inicio_inscricoes and hoje < evento.inicio_inscricoes:
-            raise ValidationError(
-                f'As inscrições ainda não foram abertas. '
-                f'Início: {evento.inicio_inscricoes.strftime("%d/%m/%Y")}'
-            )
-        
-        if evento.fim_inscricoes and hoje > evento.fim_inscricoes:
-            raise ValidationError(
-                f'O período de inscrições foi encerrado em '
-                f'{evento.fim_inscricoes.strftime("%d/%m/%Y")}.'
-            )
+        erro = descritor.erro_inscricao()
+        if erro:
+            raise ValidationError(erro)
         
-        return evento
+        self.descritor = descritor
+        return evento_id
     
-    def clean(self):
-        """Validações gerais"""
-        cleaned_data = super().clean()
-        evento = cleaned_data.get('evento')
-        
-        if evento and self.interessado:
-            # Verifica se já está inscrito
-            if Inscricao.objects.filter(
-                evento=evento,
-                interessado=self.interessado
-            ).exists():
-                raise ValidationError(
-                    'Você já está inscrito neste evento.'
-                )
+    def save(self):
+        """
+        Grava a inscrição vinculando ao interessado.
         
-        return cleaned_data
-    
-    def save(self, commit=True):
-        """Salva a inscrição vinculando ao interessado"""
-        inscricao = super().save(commit=False)
-        inscricao.interessado = self.interessado
-        inscricao.status = 'INSCRITO'
+        Returns:
+            Inscricao: Inscrição criada, ou None se o interessado já estava
+                inscrito (o erro fica no formulário)
+            InscricaoRecebida: No modo fila, o envio registrado (recibo)
+        """
+        if self.descritor.inscricao_por_fila:
+            return receber_inscricao(self.cleaned_data['evento'], self.interessado)
         
-        if commit:
-            inscricao.save()
+        inscricao, criada = registrar_inscricao(self.cleaned_data['evento'], self.interessado)
+        
+        if not criada:
+            self.add_error(None, MENSAGEM_JA_INSCRITO)
+            return None
         
         return inscricao
 
@@ -124,7 +108,8 @@ class EventoForm(forms.ModelForm):
             'descricao', 'status', 'modalidade', 'docente',
             'programa', 'objetivo', 'pre_requisito', 'carga_horaria',
             'vagas', 'vagas_minimas',
-            'inicio_inscricoes', 'fim_inscricoes',
+            'referencia_idade', 'data_referencia_idade', 'desempate',
+            'inicio_inscricoes', 'fim_inscricoes', 'inscricao_por_fila',
             'inicio_matricula', 'fim_matricula',
             'inicio_aulas', 'fim_aulas', 'horario_aulas',
             'local', 'endereco_local', 'observacao'
@@ -173,6 +158,7 @@ class EventoForm(forms.ModelForm):
                 'class': 'form-control',
                 'type': 'date'
             }),
+            'inscricao_por_fila': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
             'inicio_matricula': forms.DateInput(attrs={
                 'class': 'form-control',
                 'type': 'date'
@@ -207,6 +193,15 @@ class EventoForm(forms.ModelForm):
             }),
             'status': forms.Select(attrs={'class': 'form-control'}),
             'modalidade': forms.Select(attrs={'class': 'form-control'}),
+            'referencia_idade': forms.Select(attrs={'class': 'form-control'}),
+            'data_referencia_idade': forms.DateInput(attrs={
+                'class': 'form-control',
+                'type': 'date'
+            }),
+            'desempate': forms.TextInput(attrs={
+                'class': 'form-control',
+                'placeholder': 'Ex: MAIS_VELHO,DATA_INSCRICAO'
+            }),
         }
     
     def clean(self):
@@ -240,6 +235,18 @@ class EventoForm(forms.ModelForm):
                 'fim_aulas': 'Data final das aulas deve ser posterior à data inicial.'
             })
         
+        # Valida data de referência das idades
+        referencia = cleaned_data.get('referencia_idade')
+        datas_referencia = {
+            ReferenciaIdade.FIM_INSCRICOES: ('fim_inscricoes', 'Informe o fim das inscrições.'),
+            ReferenciaIdade.INICIO_AULAS: ('inicio_aulas', 'Informe o início das aulas.'),
+            ReferenciaIdade.DATA_FIXA: ('data_referencia_idade', 'Informe a data de referência.'),
+        }
+        if referencia in datas_referencia:
+            campo, mensagem = datas_referencia[referencia]
+            if not cleaned_data.get(campo):
+                raise ValidationError({campo: mensagem})
+        
         # Valida vagas
         vagas = cleaned_data.get('vagas')
         vagas_min = cleaned_data.get('vagas_minimas')
@@ -420,14 +427,42 @@ class TurmaForm(forms.ModelForm):
 # FORM: MATRÍCULA EM TURMA
 # ============================================
 
-class MatriculaForm(forms.ModelForm):
+class MatriculaVagasForm(forms.ModelForm):
     """
-    Formulário para matricular interessado em turma.
+    Matrícula com verificação prévia de vagas (admin).
+    
+    A verificação lê os contadores de vagas ocupadas, sem contar matrículas.
+    Quem garante a vaga é Matricula.save() (UPDATE condicional): se outra
+    matrícula levar a última vaga entre a validação e a gravação, save()
+    levanta VagasEsgotadas e nada é gravado.
     """
     
     class Meta:
         model = Matricula
         fields = ['turma', 'interessado', 'status']
+    
+    def clean(self):
+        """Valida vagas para matrícula confirmada"""
+        cleaned_data = super().clean()
+        
+        # No inline da turma o campo não vem no formulário: já está na instância
+        turma = cleaned_data.get('turma')
+        if turma is None and self.instance.turma_id:
+            turma = self.instance.turma
+        
+        erro = self.instance.erro_vagas(turma, cleaned_data.get('status'))
+        if erro:
+            raise ValidationError(erro)
+        
+        return cleaned_data
+
+
+class MatriculaForm(MatriculaVagasForm):
+    """
+    Formulário para matricular interessado em turma.
+    """
+    
+    class Meta(MatriculaVagasForm.Meta):
         widgets = {
             'turma': forms.Select(attrs={'class': 'form-control'}),
             'interessado': forms.Select(attrs={'class': 'form-control'}),
@@ -436,30 +471,32 @@ class MatriculaForm(forms.ModelForm):
     
     def clean(self):
         """Valida matrícula"""
-        cleaned_data = super().clean()
-        
-        turma = cleaned_data.get('turma')
-        interessado = cleaned_data.get('interessado')
+        turma = self.cleaned_data.get('turma')
+        interessado = self.cleaned_data.get('interessado')
         
         if turma and interessado:
             # Verifica se já está matriculado
             if Matricula.objects.filter(
                 turma=turma,
                 interessado=interessado
-            ).exists():
+            ).exclude(pk=self.instance.pk).exists():
                 raise ValidationError(
                     'Este interessado já está matriculado nesta turma.'
                 )
-            
-            # Verifica vagas disponíveis
-            vagas_ocupadas = turma.total_alunos()
-            if vagas_ocupadas >= turma.evento.vagas:
-                raise ValidationError(
-                    f'Esta turma já está com todas as vagas ocupadas '
-                    f'({turma.evento.vagas} vagas).'
-                )
         
-        return cleaned_data
+        # Verifica vagas disponíveis
+        return super().clean()
+    
+    def save(self, commit=True):
+        """
+        Salva a matrícula. Se a última vaga foi ocupada por outra matrícula
+        depois da validação, devolve None com o erro no formulário.
+        """
+        try:
+            return super().save(commit=commit)
+        except VagasEsgotadas as erro:
+            self.add_error(None, erro)
+            return None
 
 
 # ============================================
@@ -559,4 +596,95 @@ class FiltroEventosForm(forms.Form):
         super().__init__(*args, **kwargs)
         # Carrega apenas status que permitem inscrição
         from .models import Status
-        self.fields['status'].queryset = Status.objects.filter(permite_inscricao=True)
\ No newline at end of file
+        self.fields['status'].queryset = Status.objects.filter(permite_inscricao=True)
+
+
+# ============================================
+# FORM: SIMULAÇÃO DE CLASSIFICAÇÃO (STAFF)
+# ============================================
+
+class SimulacaoCriterioForm(forms.Form):
+    """
+    Uma linha da simulação: valores "e se...?" de um critério do evento.
+    Usado em formset (um form por EventoCriterio); nada é gravado.
+    """
+    
+    evento_criterio = forms.IntegerField(widget=forms.HiddenInput)
+    
+    ativo = forms.BooleanField(
+        label='Considerar',
+        required=False,
+        initial=True
+    )
+    
+    peso = forms.IntegerField(
+        label='Peso',
+        min_value=0,
+        max_value=10,
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'min': 0, 'max': 10})
+    )
+    
+    ordem = forms.IntegerField(
+        label='Ordem',
+        min_value=1,
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'min': 1})
+    )
+    
+    idade_minima = forms.IntegerField(
+        label='Idade mínima',
+        min_value=0,
+        max_value=120,
+        required=False,
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'min': 0, 'max': 120})
+    )
+    
+    idade_maxima = forms.IntegerField(
+        label='Idade máxima',
+        min_value=0,
+        max_value=120,
+        required=False,
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'min': 0, 'max': 120})
+    )
+    
+    def clean(self):
+        """Valida faixa etária"""
+        cleaned_data = super().clean()
+        
+        idade_min = cleaned_data.get('idade_minima')
+        idade_max = cleaned_data.get('idade_maxima')
+        
+        if idade_min and idade_max and idade_max < idade_min:
+            raise ValidationError({
+                'idade_maxima': 'Idade máxima deve ser maior que idade mínima.'
+            })
+        
+        return cleaned_data
+    
+    def alteracoes(self, evento_criterio):
+        """
+        Campos que diferem da configuração atual do critério.
+        
+        Returns:
+            dict: {campo: valor} no formato de simular_classificacao()
+        """
+        mudancas = {}
+        for campo in ('ativo', 'peso', 'ordem', 'idade_minima', 'idade_maxima'):
+            valor = self.cleaned_data.get(campo)
+            atual = True if campo == 'ativo' else getattr(evento_criterio, campo)
+            if valor != atual:
+                mudancas[campo] = valor
+        return mudancas
+
+
+SimulacaoCriterioFormSet = forms.formset_factory(SimulacaoCriterioForm, extra=0)
+
+
+class SimulacaoVagasForm(forms.Form):
+    """Total de vagas simulado (vazio = vagas do evento)"""
+    
+    vagas = forms.IntegerField(
+        label='Vagas',
+        min_value=1,
+        required=False,
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'min': 1})
+    )
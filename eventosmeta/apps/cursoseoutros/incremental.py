@@ -0,0 +1,570 @@
+"""
+ARQUIVO: apps/cursoseoutros/incremental.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Reclassificação incremental a partir de uma tabela de scores em cache
+         + sem tabela confiável, a classificação completa vai para a fila de tarefas
+         + não espera pela trava: evento em classificação vai para a fila
+DATA/HORA: 2026-10-17 01:16:24
+"""
+
+import logging
+import threading
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from .coorte import Coorte, STATUS_FORA_DA_CLASSIFICACAO
+from .desempate import colunas_desempate, ordenar_resultado
+from .models import (
+    Classificacao, InscricaoCriterioAtendido, TipoCriterio, TipoTarefa, TravaClassificacao
+)
+from .persistencia import (
+    gravar_lotes, incrementar_versao_classificacao, linhas_customizados,
+    pontos_compactos, situacao_classificacao
+)
+from .pontuacao import (
+    ZERO, colunas_necessarias, depende_da_coorte, mesma_base,
+    para_decimal, ponderar, pontos_criterio_lote, precarregar
+)
+from .pontuadores import decimal_para_centesimos
+from .travas import ClassificacaoEmAndamento, TravaEvento
+
+
+logger = logging.getLogger(__name__)
+
+CHAVE_TABELA = 'classificacao:tabela:{evento_id}'
+TEMPO_CACHE_TABELA = 60 * 60 * 24  # 1 dia
+
+
+class TabelaScores:
+    """
+    Tabela de scores de um evento já classificado, guardada no cache.
+
+    Contém a coorte e os pontos base/ponderados de cada critério (colunas),
+    além do que foi gravado no banco (score, posição, status e cota de cada
+    inscrição). Com ela uma mudança pontual recalcula só o que mudou.
+
+    Attributes:
+        resultado (ResultadoPontuacao): Coorte e colunas de pontos
+        gravados (dict): inscricao_id → (score, posição, status, cota) no banco
+        gravado_em (datetime): data_classificacao da última gravação
+    """
+
+    def __init__(self, resultado, gravados, gravado_em):
+        self.resultado = resultado
+        self.gravados = gravados
+        self.gravado_em = gravado_em
+
+    @classmethod
+    def montar(cls, resultado, situacoes, gravado_em):
+        """Monta a tabela a partir de uma classificação completa recém-gravada"""
+        gravados = {
+            inscricao_id: (score,) + situacoes[inscricao_id]
+            for inscricao_id, score in zip(resultado.coorte.inscricao_ids, resultado.scores)
+        }
+        return cls(resultado, gravados, gravado_em)
+
+    @staticmethod
+    def chave(evento_id):
+        return CHAVE_TABELA.format(evento_id=evento_id)
+
+    @classmethod
+    def obter(cls, evento):
+        """
+        Busca a tabela do evento no cache, descartando-a se outro processo
+        gravou uma classificação depois dela, se a data de referência das
+        idades mudou (configuração do evento ou virada do dia) ou se o
+        desempate passou a usar uma coluna que a tabela não tem.
+
+        Returns:
+            TabelaScores ou None
+        """
+        tabela = cache.get(cls.chave(evento.id))
+        if tabela is None:
+            return None
+
+        if tabela.resultado.referencia != evento.data_referencia_idades():
+            return None
+
+        if not set(colunas_desempate(evento.chaves_desempate())) <= set(tabela.resultado.coorte.campos):
+            return None
+
+        ultima = Classificacao.objects.filter(
+            inscricao__evento=evento
+        ).aggregate(ultima=Max('data_classificacao'))['ultima']
+
+        if ultima != tabela.gravado_em:
+            return None
+
+        return tabela
+
+    def salvar(self):
+        cache.set(self.chave(self.resultado.coorte.evento.id), self, TEMPO_CACHE_TABELA)
+
+    @classmethod
+    def invalidar(cls, evento_id):
+        cache.delete(cls.chave(evento_id))
+
+
+class ReclassificadorIncremental:
+    """
+    Reclassificação incremental de um evento já classificado.
+
+    As mudanças são primeiro marcadas (inscrição que entrou ou saiu,
+    critério customizado validado, critério do evento alterado) e depois
+    aplicadas de uma vez por aplicar() (ou promovida da fila de espera
+    fora da classificação, ver fila_espera.py):
+
+    - só as colunas/linhas afetadas têm os pontos recalculados
+    - o critério ORDEM (que depende da coorte inteira) é recalculado em
+      memória quando alguém entra ou sai
+    - as posições são refeitas a partir da tabela em cache, sem recarregar
+      a coorte do banco
+    - as vagas (ampla concorrência e cotas) são redistribuídas em memória
+    - só as linhas cujo score, posição, status ou cota mudou são gravadas
+
+    Se a tabela não está no cache (ou está desatualizada) a classificação
+    completa é enfileirada (tarefas.py), nunca executada na requisição que
+    salvou a mudança. A tabela fica no cache padrão: com vários processos
+    (gunicorn) ele precisa ser compartilhado, senão quase toda mudança vira
+    classificação completa (ver checks.py).
+    """
+
+    def __init__(self, evento):
+        self.evento = evento
+        self.entradas = set()
+        self.saidas = set()
+        self.validacoes = set()
+        self.criterios = set()
+        self.alteradas = set()
+
+    # ------------------------------------------
+    # Marcação
+    # ------------------------------------------
+
+    def inscricao_adicionada(self, inscricao_id):
+        self.saidas.discard(inscricao_id)
+        self.entradas.add(inscricao_id)
+
+    def inscricao_removida(self, inscricao_id):
+        self.entradas.discard(inscricao_id)
+        self.saidas.add(inscricao_id)
+
+    def criterio_validado(self, inscricao_id, criterio_id):
+        self.validacoes.add((inscricao_id, criterio_id))
+
+    def criterio_alterado(self, evento_criterio_id):
+        self.criterios.add(evento_criterio_id)
+
+    def situacao_alterada(self, inscricao_id):
+        """Status/cota gravados fora da classificação: a linha é regravada"""
+        self.alteradas.add(inscricao_id)
+
+    def tem_alteracoes(self):
+        return bool(
+            self.entradas or self.saidas or self.validacoes or self.criterios or self.alteradas
+        )
+
+    # ------------------------------------------
+    # Aplicação
+    # ------------------------------------------
+
+    def aplicar(self):
+        """
+        Aplica as mudanças marcadas, com a trava do evento (ver travas.py):
+        a tabela é lida e regravada sem outra classificação no meio. Roda
+        depois do commit da requisição, então não espera pela trava.
+
+        Returns:
+            int: Quantidade de classificações regravadas
+                 (None se a classificação completa foi enfileirada ou se
+                 o evento ainda não foi classificado)
+
+        Raises:
+            ClassificacaoEmAndamento: Evento em classificação (trava ocupada)
+        """
+        if not self.tem_alteracoes():
+            return 0
+
+        if not self._classificacao_existente():
+            return None
+
+        with TravaEvento(self.evento.pk, espera=0):
+            return self._aplicar()
+
+    def _classificacao_existente(self):
+        """
+        Se o evento tem classificação gravada ou em andamento (trava).
+        Evento nunca classificado não tem o que atualizar: nem pega a trava,
+        o que importa na abertura das inscrições (cada inscrição nova é uma
+        marcação).
+        """
+        return (
+            Classificacao.objects.filter(inscricao__evento=self.evento).exists()
+            or TravaClassificacao.objects.filter(evento=self.evento).exists()
+        )
+
+    def _aplicar(self):
+        tabela = TabelaScores.obter(self.evento)
+        if tabela is None:
+            return self._classificar_completo()
+
+        resultado = tabela.resultado
+        atualizar_coluna = self._atualizar_criterios(resultado)
+        if atualizar_coluna is None:
+            return self._classificar_completo()
+
+        # O que está no banco dessas linhas não é mais o que a tabela diz
+        for inscricao_id in self.alteradas:
+            tabela.gravados.pop(inscricao_id, None)
+
+        novas = set()
+        validadas = set()
+        saiu_alguem = self._remover_saidas(tabela)
+        entrou_alguem = self._anexar_entradas(resultado, novas)
+        self._aplicar_validacoes(resultado, validadas)
+
+        # Critérios que dependem da coorte inteira
+        if saiu_alguem or entrou_alguem:
+            for evento_criterio in resultado.evento_criterios:
+                if depende_da_coorte(evento_criterio):
+                    atualizar_coluna[evento_criterio.id] = True
+
+        # Colunas antes do recálculo: só as linhas em que mudaram regravam o detalhamento
+        anteriores = {
+            evento_criterio_id: resultado.pontos[evento_criterio_id]
+            for evento_criterio_id in atualizar_coluna
+        }
+
+        for evento_criterio in resultado.evento_criterios:
+            recalcular_base = atualizar_coluna.get(evento_criterio.id)
+            if recalcular_base is None:
+                continue
+            if recalcular_base:
+                resultado.pontos_base[evento_criterio.id] = pontos_criterio_lote(
+                    resultado.coorte, evento_criterio, resultado.referencia
+                )
+            resultado.pontos[evento_criterio.id] = ponderar(
+                resultado.pontos_base[evento_criterio.id], evento_criterio.peso
+            )
+
+        # Rescore: colunas inteiras mudaram → todas as linhas
+        coorte = resultado.coorte
+        rescore = range(len(coorte)) if atualizar_coluna else novas | validadas
+        for indice in rescore:
+            resultado.scores[indice] = resultado.somar(indice)
+
+        return self._gravar(tabela, novas | validadas, atualizar_coluna, anteriores)
+
+    def _classificar_completo(self):
+        """
+        Sem tabela confiável (ou com o evento em classificação): enfileira
+        a classificação completa, se já houve classificação (uma só
+        pendente por evento, ver enfileirar_tarefa).
+        """
+        TabelaScores.invalidar(self.evento.id)
+
+        ja_classificado = Classificacao.objects.filter(
+            inscricao__evento=self.evento
+        ).exists()
+        if not ja_classificado:
+            return None
+
+        from .tarefas import enfileirar_tarefa
+        enfileirar_tarefa(self.evento, TipoTarefa.CLASSIFICAR)
+        return None
+
+    def _atualizar_criterios(self, resultado):
+        """
+        Relê os critérios alterados.
+
+        Returns:
+            dict: EventoCriterio.id → True (recalcular pontos base) ou
+                  False (só o peso mudou); None se a mudança for estrutural
+                  (critério incluído/excluído/desativado)
+        """
+        atualizar_coluna = {}
+        if not self.criterios:
+            return atualizar_coluna
+
+        atuais = {
+            evento_criterio.id: evento_criterio
+            for evento_criterio in self.evento.evento_criterios.select_related(
+                'criterio'
+            ).prefetch_related('fototipos_prioritarios').filter(
+                id__in=self.criterios, criterio__ativo=True
+            )
+        }
+        anteriores = {evento_criterio.id: evento_criterio for evento_criterio in resultado.evento_criterios}
+
+        for evento_criterio_id in self.criterios:
+            novo = atuais.get(evento_criterio_id)
+            antigo = anteriores.get(evento_criterio_id)
+            if novo is None or antigo is None:
+                return None
+
+            # Critério trocado por outro que usa colunas não carregadas
+            if not set(colunas_necessarias([novo])) <= set(resultado.coorte.campos):
+                return None
+
+            anteriores[evento_criterio_id] = novo
+
+            so_peso = mesma_base(antigo, novo)
+            if so_peso and novo.peso == antigo.peso:
+                continue
+
+            atualizar_coluna[evento_criterio_id] = not so_peso
+
+        resultado.evento_criterios = sorted(
+            anteriores.values(), key=lambda evento_criterio: evento_criterio.ordem
+        )
+        return atualizar_coluna
+
+    def _remover_saidas(self, tabela):
+        """Tira da tabela as inscrições desistentes/excluídas"""
+        resultado = tabela.resultado
+        coorte = resultado.coorte
+        removeu = False
+
+        for inscricao_id in self.saidas:
+            try:
+                indice = coorte.indice(inscricao_id)
+            except ValueError:
+                continue
+
+            coorte.remover(indice)
+            for coluna in (resultado.pontos_base, resultado.pontos):
+                for valores in coluna.values():
+                    del valores[indice]
+            del resultado.scores[indice]
+            tabela.gravados.pop(inscricao_id, None)
+            removeu = True
+
+        return removeu
+
+    def _anexar_entradas(self, resultado, linhas):
+        """Acrescenta as novas inscrições calculando só as linhas delas"""
+        coorte = resultado.coorte
+        presentes = set(coorte.inscricao_ids)
+        novas = [inscricao_id for inscricao_id in self.entradas if inscricao_id not in presentes]
+        if not novas:
+            return False
+
+        nova_coorte = Coorte.carregar(
+            self.evento, inscricao_ids=novas, colunas=coorte.campos
+        )
+        if not len(nova_coorte):
+            return False
+
+        inicio = len(coorte)
+        precarga = precarregar(nova_coorte, resultado.evento_criterios)
+        for evento_criterio in resultado.evento_criterios:
+            if depende_da_coorte(evento_criterio):
+                # Recalculado depois, para a coorte inteira
+                base = [ZERO] * len(nova_coorte)
+            else:
+                base = pontos_criterio_lote(
+                    nova_coorte, evento_criterio, resultado.referencia, precarga
+                )
+            resultado.pontos_base[evento_criterio.id].extend(base)
+            resultado.pontos[evento_criterio.id].extend(ponderar(base, evento_criterio.peso))
+
+        coorte.anexar(nova_coorte)
+        resultado.scores.extend([ZERO] * len(nova_coorte))
+        linhas.update(range(inicio, len(coorte)))
+        return True
+
+    def _aplicar_validacoes(self, resultado, linhas):
+        """Atualiza a coluna customizada só nas linhas validadas"""
+        if not self.validacoes:
+            return
+
+        coorte = resultado.coorte
+        por_criterio = {
+            evento_criterio.criterio_id: evento_criterio
+            for evento_criterio in resultado.evento_criterios
+            if evento_criterio.criterio.tipo_criterio == TipoCriterio.CUSTOMIZADO
+        }
+        pares = [
+            (inscricao_id, criterio_id) for inscricao_id, criterio_id in self.validacoes
+            if criterio_id in por_criterio
+        ]
+        if not pares:
+            return
+
+        validados = {
+            (inscricao_id, criterio_id): decimal_para_centesimos(pontos)
+            for inscricao_id, criterio_id, pontos in InscricaoCriterioAtendido.objects.filter(
+                inscricao_id__in={inscricao_id for inscricao_id, _ in pares},
+                criterio_id__in={criterio_id for _, criterio_id in pares},
+                validado=True
+            ).values_list('inscricao_id', 'criterio_id', 'pontos_obtidos')
+        }
+
+        for inscricao_id, criterio_id in pares:
+            try:
+                indice = coorte.indice(inscricao_id)
+            except ValueError:
+                continue
+
+            evento_criterio = por_criterio[criterio_id]
+            base = validados.get((inscricao_id, criterio_id), ZERO)
+            resultado.pontos_base[evento_criterio.id][indice] = base
+            resultado.pontos[evento_criterio.id][indice] = ponderar(
+                [base], evento_criterio.peso
+            )[0]
+            linhas.add(indice)
+
+    def _gravar(self, tabela, linhas, atualizar_coluna, anteriores):
+        """
+        Refaz as posições e grava só o que mudou.
+
+        Args:
+            tabela (TabelaScores): Tabela já atualizada
+            linhas (set): Índices das inscrições novas ou validadas
+            atualizar_coluna (dict): Critérios cuja coluna inteira mudou
+            anteriores (dict): EventoCriterio.id → coluna de pontos
+                ponderados antes do recálculo
+        """
+        resultado = tabela.resultado
+        coorte = resultado.coorte
+        agora = timezone.now()
+
+        ordem = ordenar_resultado(resultado, self.evento.chaves_desempate())
+        situacoes = situacao_classificacao(self.evento, resultado, ordem)
+
+        # Linhas cujo detalhamento por critério mudou
+        detalhamento = set(linhas)
+        for evento_criterio_id, antiga in anteriores.items():
+            nova = resultado.pontos[evento_criterio_id]
+            detalhamento.update(
+                indice for indice, (antes, depois) in enumerate(zip(antiga, nova))
+                if antes != depois
+            )
+
+        classificacoes = []
+        status_alterados = {}
+        for indice, inscricao_id in enumerate(coorte.inscricao_ids):
+            atual = (resultado.scores[indice],) + situacoes[inscricao_id]
+            anterior = tabela.gravados.get(inscricao_id)
+            if atual == anterior and indice not in detalhamento:
+                continue
+
+            classificacoes.append(Classificacao(
+                inscricao_id=inscricao_id,
+                score_total=para_decimal(atual[0]),
+                posicao=atual[1],
+                cota_id=atual[3],
+                data_classificacao=agora,
+                pontos_criterios=pontos_compactos(resultado, indice)
+            ))
+            if anterior is None or anterior[2] != atual[2]:
+                status_alterados[inscricao_id] = atual[2]
+            tabela.gravados[inscricao_id] = atual
+
+        # Linhas de critérios customizados: colunas alteradas inteiras
+        # (critério trocado por um customizado) + demais critérios só nas
+        # linhas novas (sem repetir o mesmo par no mesmo comando)
+        colunas = [
+            evento_criterio for evento_criterio in resultado.evento_criterios
+            if evento_criterio.id in atualizar_coluna
+        ]
+        demais = [
+            evento_criterio for evento_criterio in resultado.evento_criterios
+            if evento_criterio.id not in atualizar_coluna
+        ]
+        customizados = linhas_customizados(resultado, range(len(coorte)), colunas)
+        if linhas and demais:
+            customizados += linhas_customizados(resultado, sorted(linhas), demais)
+
+        with transaction.atomic():
+            gravar_lotes(customizados, classificacoes, status_alterados)
+
+            Classificacao.objects.filter(
+                inscricao_id__in=self.saidas,
+                inscricao__status__in=STATUS_FORA_DA_CLASSIFICACAO
+            ).update(posicao=None, cota=None)
+
+            if classificacoes or customizados or self.saidas:
+                incrementar_versao_classificacao(self.evento.id)
+
+        if classificacoes:
+            tabela.gravado_em = agora
+        tabela.salvar()
+
+        return len(classificacoes)
+
+
+# ============================================
+# MARCAÇÃO PENDENTE (processada no commit)
+# ============================================
+# Várias mudanças na mesma transação (ex: um formulário com inlines) viram
+# uma única aplicação por evento, executada depois do commit.
+
+_pendentes = threading.local()
+
+
+def marcar(evento_id):
+    """
+    Reclassificador pendente do evento na thread atual.
+
+    O evento só é carregado na hora de aplicar: ele pode estar sendo
+    excluído (exclusão em cascata das inscrições).
+
+    Args:
+        evento_id (int): Evento afetado
+
+    Returns:
+        ReclassificadorIncremental: Onde as mudanças devem ser marcadas
+    """
+    pendentes = getattr(_pendentes, 'eventos', None)
+    if pendentes is None:
+        pendentes = _pendentes.eventos = {}
+
+    if evento_id not in pendentes:
+        pendentes[evento_id] = ReclassificadorIncremental(evento=None)
+
+    return pendentes[evento_id]
+
+
+def agendar():
+    """
+    Agenda o processamento das marcações para depois do commit.
+    Chamadas repetidas são inofensivas: a primeira processa tudo e as
+    demais encontram a lista vazia.
+    """
+    transaction.on_commit(processar_pendentes)
+
+
+def processar_pendentes():
+    """
+    Aplica todas as reclassificações marcadas.
+
+    Um erro aqui não pode desfazer a operação do usuário (já confirmada),
+    então a tabela do evento é descartada e a próxima classificação
+    completa corrige o estado.
+    """
+    from .models import Evento
+
+    pendentes = getattr(_pendentes, 'eventos', None) or {}
+    _pendentes.eventos = {}
+
+    for evento_id, reclassificador in pendentes.items():
+        reclassificador.evento = Evento.objects.filter(pk=evento_id).first()
+        if reclassificador.evento is None:
+            TabelaScores.invalidar(evento_id)
+            continue
+
+        try:
+            reclassificador.aplicar()
+        except ClassificacaoEmAndamento:
+            # A classificação em andamento pode ter lido a coorte antes
+            # destas mudanças: descarta a tabela e enfileira outra completa
+            logger.info(
+                'Evento %s em classificação: reclassificação completa enfileirada',
+                evento_id
+            )
+            reclassificador._classificar_completo()
+        except Exception:
+            logger.exception('Falha na reclassificação incremental do evento %s', evento_id)
+            TabelaScores.invalidar(evento_id)
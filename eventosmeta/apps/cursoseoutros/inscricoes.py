@@ -0,0 +1,402 @@
+"""
+ARQUIVO: apps/cursoseoutros/inscricoes.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Inscrição em evento com uma ida ao banco (pico de inscrições)
+         + modo fila: recibo na hora e inscrições criadas em lote depois
+         + inscrição em evento não classificado não marca reclassificação
+DATA/HORA: 2026-10-17 02:04:02
+"""
+
+from datetime import date, timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from .incremental import agendar, marcar
+from .models import (
+    Classificacao, Evento, Inscricao, InscricaoRecebida, StatusInscricao, StatusRecebimento,
+    TravaClassificacao
+)
+
+
+CHAVE_DESCRITOR = 'evento:descritor:v3:{evento_id}'
+TEMPO_CACHE_DESCRITOR = 60  # segundos
+
+# Envios processados por lote (processar_inscricoes)
+TAMANHO_LOTE_RECEBIDAS = 500
+
+MENSAGEM_JA_INSCRITO = 'Você já está inscrito neste evento.'
+
+# Guardado no cache para evento inexistente (None = não está no cache)
+_INEXISTENTE = False
+
+
+# ============================================
+# DESCRITOR DO EVENTO (cache)
+# ============================================
+
+class DescritorEvento:
+    """
+    O que a inscrição precisa saber do evento (status, período e se já foi
+    classificado), guardado no cache. Na abertura das inscrições de um
+    curso concorrido, centenas de envios por minuto validam o evento sem
+    consultar o banco.
+
+    Esquecido sempre que o evento ou o status dele é salvo (ver signals.py)
+    e quando uma classificação começa ou termina (ver services.py).
+
+    `classificado` (classificação gravada ou em andamento) decide se a
+    inscrição nova é marcada para a reclassificação incremental: evento
+    ainda não classificado não tem o que atualizar, e a inscrição fica só
+    no INSERT, sem as consultas do processamento depois do commit.
+    """
+
+    def __init__(self, evento_id, descricao, permite_inscricao, status,
+                 inicio_inscricoes, fim_inscricoes, inscricao_por_fila, classificado):
+        self.evento_id = evento_id
+        self.descricao = descricao
+        self.permite_inscricao = permite_inscricao
+        self.status = status
+        self.inicio_inscricoes = inicio_inscricoes
+        self.fim_inscricoes = fim_inscricoes
+        self.inscricao_por_fila = inscricao_por_fila
+        self.classificado = classificado
+
+    def erro_inscricao(self, hoje=None):
+        """
+        Motivo pelo qual o evento não aceita inscrições hoje.
+
+        Args:
+            hoje (date): Data considerada (padrão: hoje)
+
+        Returns:
+            str: Mensagem de erro ('' se aceita)
+        """
+        if not self.permite_inscricao:
+            return (
+                f'Este evento não está aceitando inscrições. '
+                f'Status atual: {self.status}'
+            )
+
+        return self.erro_periodo(hoje)
+
+    def erro_periodo(self, hoje=None):
+        """
+        Motivo pelo qual a data está fora do período de inscrições.
+
+        Args:
+            hoje (date): Data considerada (padrão: hoje)
+
+        Returns:
+            str: Mensagem de erro ('' se dentro do período)
+        """
+        hoje = hoje or date.today()
+
+        if self.inicio_inscricoes and hoje < self.inicio_inscricoes:
+            return (
+                f'As inscrições ainda não foram abertas. '
+                f'Início: {self.inicio_inscricoes.strftime("%d/%m/%Y")}'
+            )
+
+        if self.fim_inscricoes and hoje > self.fim_inscricoes:
+            return (
+                f'O período de inscrições foi encerrado em '
+                f'{self.fim_inscricoes.strftime("%d/%m/%Y")}.'
+            )
+
+        return ''
+
+
+def obter_descritor_evento(evento_id):
+    """
+    Descritor do evento, do cache (senão uma consulta com o status no JOIN).
+
+    Args:
+        evento_id (int): Evento
+
+    Returns:
+        DescritorEvento ou None (evento inexistente)
+    """
+    chave = CHAVE_DESCRITOR.format(evento_id=evento_id)
+
+    descritor = cache.get(chave)
+    if descritor is None:
+        linha = Evento.objects.filter(pk=evento_id).annotate(
+            classificacao_gravada=Exists(
+                Classificacao.objects.filter(inscricao__evento=OuterRef('pk'))
+            ),
+            classificacao_em_andamento=Exists(
+                TravaClassificacao.objects.filter(evento=OuterRef('pk'))
+            )
+        ).values_list(
+            'id', 'descricao', 'status__permite_inscricao', 'status__status',
+            'inicio_inscricoes', 'fim_inscricoes', 'inscricao_por_fila',
+            'classificacao_gravada', 'classificacao_em_andamento'
+        ).first()
+        descritor = DescritorEvento(
+            *linha[:-2], classificado=linha[-2] or linha[-1]
+        ) if linha else _INEXISTENTE
+        cache.set(chave, descritor, TEMPO_CACHE_DESCRITOR)
+
+    return descritor or None
+
+
+def esquecer_descritores(evento_ids):
+    """Remove do cache os descritores dos eventos (evento, status ou classificação alterados)"""
+    cache.delete_many([CHAVE_DESCRITOR.format(evento_id=evento_id) for evento_id in evento_ids])
+
+
+# ============================================
+# INSCRIÇÃO
+# ============================================
+
+def marcar_inscricao_nova(inscricao_id, evento_id):
+    """
+    Marca a inscrição nova para a reclassificação incremental, só se o
+    evento já foi classificado (ver DescritorEvento.classificado).
+
+    Returns:
+        bool: Se foi marcada
+    """
+    descritor = obter_descritor_evento(evento_id)
+    if descritor is None or not descritor.classificado:
+        return False
+
+    marcar(evento_id).inscricao_adicionada(inscricao_id)
+    return True
+
+
+def registrar_inscricao(evento_id, interessado, data_inscricao=None):
+    """
+    Grava a inscrição com um único INSERT, sem consultar antes se já existe.
+
+    A unicidade (evento, interessado) é garantida pelo banco: dois envios
+    simultâneos da mesma pessoa não passam os dois por uma verificação
+    prévia, o segundo INSERT é que falha, e vira "já inscrito" em vez de
+    erro 500. Só nesse caso é feita uma consulta a mais, para confirmar
+    que o conflito foi mesmo a inscrição repetida.
+
+    Args:
+        evento_id (int): Evento (já validado, ver obter_descritor_evento)
+        interessado (Interessado): Quem se inscreve
+        data_inscricao (datetime): Momento da inscrição (padrão: agora;
+            no modo fila, o momento do envio)
+
+    Returns:
+        tuple: (Inscricao, True) se criada; (None, False) se já inscrito
+
+    Raises:
+        IntegrityError: Outro conflito (ex: evento excluído nesse meio tempo)
+    """
+    try:
+        with transaction.atomic():
+            inscricao = Inscricao.objects.create(
+                evento_id=evento_id,
+                interessado=interessado,
+                data_inscricao=data_inscricao or timezone.now(),
+                status=StatusInscricao.INSCRITO
+            )
+        return inscricao, True
+    except IntegrityError:
+        if Inscricao.objects.filter(evento_id=evento_id, interessado=interessado).exists():
+            return None, False
+        raise
+
+
+# ============================================
+# MODO FILA (Evento.inscricao_por_fila)
+# ============================================
+# Nos lançamentos mais concorridos a requisição só grava o envio
+# (InscricaoRecebida) e devolve o recibo; processar_inscricoes cria as
+# inscrições em lote. A data da inscrição é a do envio, então a ordem de
+# chegada (critério ORDEM) não depende de quando o lote rodou.
+
+def receber_inscricao(evento_id, interessado):
+    """
+    Registra o envio da inscrição (um INSERT, sem verificar duplicidade:
+    isso fica para o processamento).
+
+    Args:
+        evento_id (int): Evento (já validado, ver obter_descritor_evento)
+        interessado (Interessado): Quem se inscreve
+
+    Returns:
+        InscricaoRecebida: Envio registrado (ver .recibo)
+    """
+    return InscricaoRecebida.objects.create(evento_id=evento_id, interessado=interessado)
+
+
+def reservar_recebidas(executor, tamanho_lote=TAMANHO_LOTE_RECEBIDAS):
+    """
+    Reserva os envios pendentes mais antigos para este executor.
+
+    Como em tarefas.reservar_proxima, a reserva é um UPDATE condicional
+    (status ainda PENDENTE): vários executores podem rodar juntos sem
+    processar o mesmo envio.
+
+    Args:
+        executor (str): Ver tarefas.identificar_executor()
+        tamanho_lote (int): Máximo de envios
+
+    Returns:
+        list: InscricaoRecebida reservadas, em ordem de chegada
+    """
+    ids = list(InscricaoRecebida.objects.filter(
+        status=StatusRecebimento.PENDENTE
+    ).order_by('id').values_list('id', flat=True)[:tamanho_lote])
+    if not ids:
+        return []
+
+    agora = timezone.now()
+    InscricaoRecebida.objects.filter(
+        id__in=ids, status=StatusRecebimento.PENDENTE
+    ).update(status=StatusRecebimento.PROCESSANDO, executor=executor, reservada_em=agora)
+
+    return list(InscricaoRecebida.objects.filter(
+        id__in=ids, status=StatusRecebimento.PROCESSANDO,
+        executor=executor, reservada_em=agora
+    ).order_by('id'))
+
+
+def processar_recebidas(recebidas):
+    """
+    Valida e cria as inscrições de um lote de envios reservados.
+
+    - evento excluído ou envio fora do período de inscrições (pela data do
+      envio): RECUSADA
+    - interessado já inscrito (antes ou no próprio lote): JA_INSCRITO,
+      ligado à inscrição existente
+    - demais: INSCRITA, com data_inscricao = recebida_em
+
+    As inscrições novas são gravadas com um bulk_create e os envios
+    atualizados na mesma transação: se o processo cair no meio, nada fica
+    pela metade (ver devolver_travadas).
+
+    Args:
+        recebidas (list): InscricaoRecebida reservadas (reservar_recebidas)
+
+    Returns:
+        dict: StatusRecebimento → quantidade
+    """
+    agora = timezone.now()
+
+    existentes = dict(
+        ((evento_id, interessado_id), inscricao_id)
+        for inscricao_id, evento_id, interessado_id in Inscricao.objects.filter(
+            evento_id__in={recebida.evento_id for recebida in recebidas},
+            interessado_id__in={recebida.interessado_id for recebida in recebidas}
+        ).values_list('id', 'evento_id', 'interessado_id')
+    )
+
+    novas = {}
+    for recebida in recebidas:
+        recebida.processada_em = agora
+        par = (recebida.evento_id, recebida.interessado_id)
+
+        descritor = obter_descritor_evento(recebida.evento_id)
+        erro = (
+            descritor.erro_periodo(timezone.localdate(recebida.recebida_em))
+            if descritor else 'Evento não encontrado.'
+        )
+        if erro:
+            recebida.status = StatusRecebimento.RECUSADA
+            recebida.mensagem = erro[:200]
+        elif par in existentes or par in novas:
+            recebida.status = StatusRecebimento.JA_INSCRITO
+            recebida.inscricao_id = existentes.get(par)
+        else:
+            recebida.status = StatusRecebimento.INSCRITA
+            novas[par] = Inscricao(
+                evento_id=recebida.evento_id,
+                interessado_id=recebida.interessado_id,
+                data_inscricao=recebida.recebida_em,
+                status=StatusInscricao.INSCRITO
+            )
+
+    try:
+        with transaction.atomic():
+            Inscricao.objects.bulk_create(novas.values(), batch_size=TAMANHO_LOTE_RECEBIDAS)
+            _gravar_recebidas(recebidas, novas)
+    except IntegrityError:
+        # Inscrição feita por fora (modo normal) no meio do lote: uma a uma
+        with transaction.atomic():
+            for recebida in recebidas:
+                if recebida.status != StatusRecebimento.INSCRITA:
+                    continue
+                par = (recebida.evento_id, recebida.interessado_id)
+                inscricao, criada = registrar_inscricao(
+                    recebida.evento_id, recebida.interessado, recebida.recebida_em
+                )
+                if criada:
+                    novas[par] = inscricao
+                    continue
+                del novas[par]
+                recebida.status = StatusRecebimento.JA_INSCRITO
+
+            # Repetidos no lote do par que conflitou também apontam para a
+            # inscrição feita por fora (não estão em `novas`)
+            sem_inscricao = [
+                recebida for recebida in recebidas
+                if recebida.status == StatusRecebimento.JA_INSCRITO
+                and recebida.inscricao_id is None
+                and (recebida.evento_id, recebida.interessado_id) not in novas
+            ]
+            if sem_inscricao:
+                existentes = dict(
+                    ((evento_id, interessado_id), inscricao_id)
+                    for inscricao_id, evento_id, interessado_id in Inscricao.objects.filter(
+                        evento_id__in={recebida.evento_id for recebida in sem_inscricao},
+                        interessado_id__in={recebida.interessado_id for recebida in sem_inscricao}
+                    ).values_list('id', 'evento_id', 'interessado_id')
+                )
+                for recebida in sem_inscricao:
+                    recebida.inscricao_id = existentes.get(
+                        (recebida.evento_id, recebida.interessado_id)
+                    )
+            _gravar_recebidas(recebidas, novas)
+
+    if novas and getattr(settings, 'CLASSIFICACAO_INCREMENTAL', False):
+        # bulk_create não dispara post_save (ver signals.inscricao_salva)
+        marcadas = [
+            marcar_inscricao_nova(inscricao.pk, inscricao.evento_id)
+            for inscricao in novas.values()
+        ]
+        if any(marcadas):
+            agendar()
+
+    contagem = {}
+    for recebida in recebidas:
+        contagem[recebida.status] = contagem.get(recebida.status, 0) + 1
+    return contagem
+
+
+def _gravar_recebidas(recebidas, novas):
+    """Liga os envios às inscrições criadas no lote e grava os envios"""
+    for recebida in recebidas:
+        nova = novas.get((recebida.evento_id, recebida.interessado_id))
+        if nova is not None and recebida.status in (
+            StatusRecebimento.INSCRITA, StatusRecebimento.JA_INSCRITO
+        ):
+            recebida.inscricao_id = nova.pk
+
+    InscricaoRecebida.objects.bulk_update(
+        recebidas, ['status', 'inscricao', 'mensagem', 'processada_em'],
+        batch_size=TAMANHO_LOTE_RECEBIDAS
+    )
+
+
+def devolver_travadas(minutos):
+    """
+    Devolve à fila os envios reservados há mais de `minutos` (executor que
+    parou no meio). O lote é gravado numa transação só, então um envio
+    reservado e não concluído não criou nada.
+
+    Returns:
+        int: Envios devolvidos
+    """
+    limite = timezone.now() - timedelta(minutes=minutos)
+    return InscricaoRecebida.objects.filter(
+        status=StatusRecebimento.PROCESSANDO,
+        reservada_em__lt=limite
+    ).update(status=StatusRecebimento.PENDENTE, executor='', reservada_em=None)
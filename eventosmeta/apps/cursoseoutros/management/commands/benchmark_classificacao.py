@@ -0,0 +1,155 @@
+"""
+ARQUIVO: apps/cursoseoutros/management/commands/benchmark_classificacao.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Benchmark da classificação (tempo, consultas e memória) em JSON
+DATA/HORA: 2026-10-17 01:49:34
+"""
+
+import json
+import platform
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+
+# Cache próprio durante o benchmark: os eventos gerados no banco de teste
+# têm ids que podem coincidir com eventos reais no cache compartilhado.
+CACHE_BENCHMARK = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'benchmark-classificacao',
+    }
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede a classificação (completa, incremental, relatório e exportação) '
+        'sobre eventos sintéticos num banco de teste descartável e gera JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tamanhos',
+            default='1000,10000',
+            help='Inscrições por evento, separadas por vírgula (ex: 1000,10000,100000)'
+        )
+        parser.add_argument(
+            '--semente',
+            type=int,
+            default=2026,
+            help='Semente do gerador de dados (mesma semente = mesmos dados)'
+        )
+        parser.add_argument(
+            '--cenarios',
+            help='Cenários separados por vírgula (padrão: todos)'
+        )
+        parser.add_argument(
+            '--repeticoes',
+            type=int,
+            default=3,
+            help='Execuções cronometradas por cenário (padrão: 3)'
+        )
+        parser.add_argument(
+            '--saida',
+            help='Arquivo JSON de saída (padrão: imprime o JSON)'
+        )
+        parser.add_argument(
+            '--comparar',
+            help='JSON de uma execução anterior: falha se houver regressão'
+        )
+        parser.add_argument(
+            '--tolerancia',
+            type=float,
+            default=0.25,
+            help='Aumento aceito de tempo e memória na comparação (padrão: 0.25 = 25%%)'
+        )
+        parser.add_argument(
+            '--keepdb',
+            action='store_true',
+            help='Reaproveita o banco de teste (não recria nem apaga)'
+        )
+
+    def handle(self, *args, **options):
+        from apps.cursoseoutros.benchmark import CENARIOS, comparar_resultados, executar_benchmark
+
+        try:
+            tamanhos = [int(tamanho) for tamanho in options['tamanhos'].split(',')]
+        except ValueError:
+            raise CommandError('--tamanhos deve ser uma lista de inteiros (ex: 1000,10000)')
+
+        cenarios = list(CENARIOS)
+        if options['cenarios']:
+            cenarios = [nome.strip() for nome in options['cenarios'].split(',')]
+            desconhecidos = set(cenarios) - set(CENARIOS)
+            if desconhecidos:
+                raise CommandError(
+                    f'Cenários desconhecidos: {", ".join(sorted(desconhecidos))}. '
+                    f'Disponíveis: {", ".join(CENARIOS)}'
+                )
+
+        if options['repeticoes'] < 1:
+            raise CommandError('--repeticoes deve ser pelo menos 1')
+
+        base = None
+        if options['comparar']:
+            with open(options['comparar'], encoding='utf-8') as arquivo:
+                base = json.load(arquivo)['resultados']
+
+        # Banco de teste descartável: os dados gerados nunca tocam o banco real
+        nome_original = connection.settings_dict['NAME']
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False, keepdb=options['keepdb']
+        )
+
+        resultados = []
+        try:
+            with override_settings(CACHES=CACHE_BENCHMARK, CLASSIFICACAO_INCREMENTAL=False):
+                for indice, tamanho in enumerate(tamanhos):
+                    self.stderr.write(f'Gerando e medindo evento com {tamanho} inscrições...')
+                    for resultado in executar_benchmark(
+                        tamanho, options['semente'] + indice, cenarios,
+                        options['repeticoes'], prefixo_cpf=indice
+                    ):
+                        self._mostrar(resultado)
+                        resultados.append(resultado)
+        finally:
+            connection.creation.destroy_test_db(
+                nome_original, verbosity=0, keepdb=options['keepdb']
+            )
+
+        relatorio = {
+            'gerado_em': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'banco': connection.vendor,
+            'semente': options['semente'],
+            'repeticoes': options['repeticoes'],
+            'resultados': resultados,
+        }
+
+        conteudo = json.dumps(relatorio, ensure_ascii=False, indent=2)
+        if options['saida']:
+            with open(options['saida'], 'w', encoding='utf-8') as arquivo:
+                arquivo.write(conteudo + '\n')
+            self.stderr.write(self.style.SUCCESS(f'Resultados gravados em {options["saida"]}'))
+        else:
+            self.stdout.write(conteudo)
+
+        if base is not None:
+            regressoes = comparar_resultados(resultados, base, options['tolerancia'])
+            if regressoes:
+                for regressao in regressoes:
+                    self.stderr.write(self.style.ERROR(regressao))
+                raise CommandError(f'{len(regressoes)} regressão(ões) de desempenho')
+            self.stderr.write(self.style.SUCCESS('Sem regressões em relação à execução anterior.'))
+
+    def _mostrar(self, resultado):
+        """Uma linha legível por cenário (o JSON vai para a saída padrão)"""
+        self.stderr.write(
+            f'  {resultado["cenario"]:<28} {resultado["tamanho"]:>7} inscrições: '
+            f'{resultado["segundos_min"]:.3f}s (mediana {resultado["segundos_mediana"]:.3f}s), '
+            f'{resultado["consultas"]} consultas, pico {resultado["pico_memoria_mb"]:.1f} MB'
+        )
@@ -0,0 +1,230 @@
+"""
+ARQUIVO: apps/cursoseoutros/management/commands/classificar_eventos.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Classificação de vários eventos em paralelo (pool de processos)
+         + pool interrompido: os eventos restantes são refeitos um a um
+DATA/HORA: 2026-10-17 01:31:57
+"""
+
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+# ============================================
+# EXECUÇÃO NOS PROCESSOS DO POOL
+# ============================================
+# Funções de módulo (não métodos) para poderem ser enviadas aos processos.
+# Os models só são importados dentro delas: com o método "spawn" o processo
+# filho importa este módulo antes de o Django estar configurado.
+
+def iniciar_processo():
+    """
+    Inicializa um processo do pool.
+    Cada processo abre a sua própria conexão com o banco: conexões herdadas
+    do processo pai (fork) não podem ser compartilhadas.
+    """
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+    connections.close_all()
+
+
+def classificar_um_evento(evento_id):
+    """
+    Classifica um evento. A gravação é feita numa transação própria
+    (persistir_classificacao): o cálculo fica fora dela e o primeiro comando
+    da transação já é de escrita, então no SQLite os processos esperam a vez
+    de gravar em vez de falharem com "database is locked".
+
+    Qualquer erro é devolvido no resultado (e a transação do evento é
+    desfeita), para não interromper os demais eventos do lote.
+
+    Args:
+        evento_id (int): Evento a classificar
+
+    Returns:
+        dict: evento_id, descricao, ok, inscricoes, aprovados, segundos, erro
+    """
+    from apps.cursoseoutros.models import Evento, StatusInscricao
+    from apps.cursoseoutros.services import ClassificadorService
+
+    inicio = time.perf_counter()
+    resultado = {
+        'evento_id': evento_id,
+        'descricao': '',
+        'ok': False,
+        'inscricoes': 0,
+        'aprovados': 0,
+        'segundos': 0.0,
+        'erro': '',
+    }
+
+    try:
+        evento = Evento.objects.get(pk=evento_id)
+        resultado['descricao'] = evento.descricao
+
+        ClassificadorService.classificar_evento(evento)
+
+        resultado['inscricoes'] = evento.inscricoes.filter(classificacao__posicao__isnull=False).count()
+        resultado['aprovados'] = evento.inscricoes.filter(status=StatusInscricao.APROVADO).count()
+        resultado['ok'] = True
+    except Exception:
+        resultado['erro'] = traceback.format_exc()
+
+    resultado['segundos'] = time.perf_counter() - inicio
+    return resultado
+
+
+def resultado_com_erro(evento_id):
+    """Resultado de um evento cujo processo falhou (chamar dentro do except)"""
+    return {
+        'evento_id': evento_id,
+        'descricao': '',
+        'ok': False,
+        'inscricoes': 0,
+        'aprovados': 0,
+        'segundos': 0.0,
+        'erro': traceback.format_exc(),
+    }
+
+
+# ============================================
+# COMANDO
+# ============================================
+
+class Command(BaseCommand):
+    help = (
+        'Classifica vários eventos em paralelo, um processo por evento '
+        '(cada evento é gravado na sua própria transação).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'evento_ids',
+            nargs='*',
+            type=int,
+            help='Eventos a classificar (padrão: todos os eventos com inscrições)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Quantidade de processos (padrão: número de CPUs; 1 = sem pool)'
+        )
+        parser.add_argument(
+            '--status',
+            help='Só eventos com este status (nome do Status)'
+        )
+
+    def handle(self, *args, **options):
+        from apps.cursoseoutros.models import Evento
+
+        workers = options['workers']
+        if workers < 1:
+            raise CommandError('--workers deve ser pelo menos 1')
+
+        eventos = Evento.objects.filter(inscricoes__isnull=False)
+        if options['evento_ids']:
+            eventos = Evento.objects.filter(pk__in=options['evento_ids'])
+        if options['status']:
+            eventos = eventos.filter(status__status=options['status'])
+        evento_ids = list(eventos.order_by('pk').values_list('pk', flat=True).distinct())
+
+        inexistentes = set(options['evento_ids']) - set(evento_ids)
+        if inexistentes:
+            self.stdout.write(self.style.WARNING(
+                'Ignorados (inexistentes ou fora do status): '
+                + ', '.join(str(evento_id) for evento_id in sorted(inexistentes))
+            ))
+
+        if not evento_ids:
+            self.stdout.write(self.style.WARNING('Nenhum evento para classificar.'))
+            return
+
+        total = len(evento_ids)
+        workers = min(workers, total)
+        self.stdout.write(f'Classificando {total} evento(s) com {workers} processo(s)...')
+
+        inicio = time.perf_counter()
+        falhas = []
+
+        for concluidos, resultado in enumerate(self._executar(evento_ids, workers), start=1):
+            self._mostrar(concluidos, total, resultado)
+            if not resultado['ok']:
+                falhas.append(resultado['evento_id'])
+
+        segundos = time.perf_counter() - inicio
+        self.stdout.write(
+            f'Concluído em {segundos:.2f}s: {total - len(falhas)} classificado(s), '
+            f'{len(falhas)} com erro.'
+        )
+
+        if falhas:
+            raise CommandError(
+                'Eventos com erro: ' + ', '.join(str(evento_id) for evento_id in sorted(falhas))
+            )
+
+    def _executar(self, evento_ids, workers):
+        """Gera os resultados na ordem em que os eventos terminam"""
+        if workers == 1:
+            for evento_id in evento_ids:
+                yield classificar_um_evento(evento_id)
+            return
+
+        # A conexão do processo pai não pode ir para os filhos
+        connections.close_all()
+
+        interrompidos = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=iniciar_processo) as pool:
+            futuros = {
+                pool.submit(classificar_um_evento, evento_id): evento_id
+                for evento_id in evento_ids
+            }
+            for futuro in as_completed(futuros):
+                try:
+                    yield futuro.result()
+                except BrokenProcessPool:
+                    # Um processo do pool morreu (ex: falta de memória) e o
+                    # pool parou: os eventos que não terminaram são refeitos
+                    interrompidos.append(futuros[futuro])
+                except Exception:
+                    yield resultado_com_erro(futuros[futuro])
+
+        # Um por vez, cada um no seu processo: só o evento que derruba o
+        # processo fica com erro
+        for evento_id in sorted(interrompidos):
+            yield self._executar_isolado(evento_id)
+
+    def _executar_isolado(self, evento_id):
+        """Classifica um evento num processo próprio"""
+        connections.close_all()
+
+        with ProcessPoolExecutor(max_workers=1, initializer=iniciar_processo) as pool:
+            try:
+                return pool.submit(classificar_um_evento, evento_id).result()
+            except Exception:
+                return resultado_com_erro(evento_id)
+
+    def _mostrar(self, concluidos, total, resultado):
+        """Uma linha de progresso por evento"""
+        prefixo = f'[{concluidos}/{total}] Evento #{resultado["evento_id"]}'
+        if resultado['descricao']:
+            prefixo += f' ({resultado["descricao"]})'
+
+        if resultado['ok']:
+            self.stdout.write(self.style.SUCCESS(
+                f'{prefixo}: {resultado["inscricoes"]} classificado(s), '
+                f'{resultado["aprovados"]} aprovado(s) em {resultado["segundos"]:.2f}s'
+            ))
+        else:
+            self.stderr.write(self.style.ERROR(
+                f'{prefixo}: erro após {resultado["segundos"]:.2f}s'
+            ))
+            self.stderr.write(resultado['erro'])
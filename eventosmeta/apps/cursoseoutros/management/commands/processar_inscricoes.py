@@ -0,0 +1,107 @@
+"""
+ARQUIVO: apps/cursoseoutros/management/commands/processar_inscricoes.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Consumidor dos envios de inscrição do modo fila (Evento.inscricao_por_fila)
+DATA/HORA: 2026-10-17 02:15:34
+"""
+
+import signal
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Cria as inscrições recebidas no modo fila, em lotes, com a data do envio. '
+        'Rode um ou mais processos deste comando durante o lançamento.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--uma-vez',
+            action='store_true',
+            help='Processa os envios pendentes e termina (ex: para uso no cron)'
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=1,
+            help='Segundos de espera quando a fila está vazia (padrão: 1)'
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=500,
+            help='Envios processados por vez (padrão: 500)'
+        )
+        parser.add_argument(
+            '--devolver-travadas',
+            type=int,
+            default=10,
+            metavar='MINUTOS',
+            help='Devolve à fila envios reservados há mais de N minutos '
+                 '(padrão: 10; 0 = não devolver)'
+        )
+
+    def handle(self, *args, **options):
+        from apps.cursoseoutros.inscricoes import (
+            devolver_travadas, processar_recebidas, reservar_recebidas
+        )
+        from apps.cursoseoutros.tarefas import identificar_executor
+
+        if options['intervalo'] <= 0:
+            raise CommandError('--intervalo deve ser maior que zero')
+        if options['lote'] <= 0:
+            raise CommandError('--lote deve ser maior que zero')
+
+        self.parar = False
+        signal.signal(signal.SIGTERM, self._pedir_parada)
+
+        executor = identificar_executor()
+        self.stdout.write(f'Executor {executor} aguardando inscrições...')
+
+        total = {}
+        try:
+            while not self.parar:
+                close_old_connections()
+
+                if options['devolver_travadas']:
+                    devolvidas = devolver_travadas(options['devolver_travadas'])
+                    if devolvidas:
+                        self.stderr.write(self.style.WARNING(
+                            f'{devolvidas} envio(s) travado(s) devolvido(s) à fila'
+                        ))
+
+                recebidas = reservar_recebidas(executor, options['lote'])
+                if not recebidas:
+                    if options['uma_vez']:
+                        break
+                    time.sleep(options['intervalo'])
+                    continue
+
+                inicio = time.perf_counter()
+                contagem = processar_recebidas(recebidas)
+                segundos = time.perf_counter() - inicio
+
+                for status, quantidade in contagem.items():
+                    total[status] = total.get(status, 0) + quantidade
+                self.stdout.write(
+                    f'Lote de {len(recebidas)} envio(s) em {segundos:.2f}s: {self._resumo(contagem)}'
+                )
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(f'Executor {executor} encerrado: {self._resumo(total) or "nenhum envio"}.')
+
+    def _pedir_parada(self, numero_sinal, quadro):
+        """SIGTERM: termina o lote atual e sai"""
+        self.parar = True
+
+    def _resumo(self, contagem):
+        from apps.cursoseoutros.models import StatusRecebimento
+
+        return ', '.join(
+            f'{quantidade} {StatusRecebimento(status).label.lower()}'
+            for status, quantidade in sorted(contagem.items())
+        )
@@ -0,0 +1,110 @@
+"""
+ARQUIVO: apps/cursoseoutros/management/commands/processar_tarefas.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Executor da fila de tarefas em segundo plano (sem broker externo)
+         + tarefas travadas detectadas pelo sinal de vida, não pelo início
+DATA/HORA: 2026-10-17 01:52:35
+"""
+
+import signal
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Executa as tarefas em segundo plano (classificação, exportação) '
+        'pedidas pelo admin. Rode um ou mais processos deste comando.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--uma-vez',
+            action='store_true',
+            help='Processa as tarefas pendentes e termina (ex: para uso no cron)'
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=5,
+            help='Segundos de espera quando a fila está vazia (padrão: 5)'
+        )
+        parser.add_argument(
+            '--max-tarefas',
+            type=int,
+            default=0,
+            help='Termina após N tarefas (padrão: 0 = sem limite)'
+        )
+        parser.add_argument(
+            '--liberar-travadas',
+            type=int,
+            default=10,
+            metavar='MINUTOS',
+            help='Marca como erro tarefas em execução sem sinal de vida do '
+                 'executor há mais de N minutos (padrão: 10; 0 = não liberar)'
+        )
+
+    def handle(self, *args, **options):
+        from apps.cursoseoutros.tarefas import (
+            executar_tarefa, identificar_executor, liberar_travadas, reservar_proxima
+        )
+
+        if options['intervalo'] <= 0:
+            raise CommandError('--intervalo deve ser maior que zero')
+
+        self.parar = False
+        signal.signal(signal.SIGTERM, self._pedir_parada)
+
+        executor = identificar_executor()
+        self.stdout.write(f'Executor {executor} aguardando tarefas...')
+
+        executadas = 0
+        try:
+            while not self.parar:
+                close_old_connections()
+
+                if options['liberar_travadas']:
+                    liberadas = liberar_travadas(options['liberar_travadas'])
+                    if liberadas:
+                        self.stderr.write(self.style.WARNING(
+                            f'{liberadas} tarefa(s) travada(s) marcada(s) como erro'
+                        ))
+
+                tarefa = reservar_proxima(executor)
+                if tarefa is None:
+                    if options['uma_vez']:
+                        break
+                    time.sleep(options['intervalo'])
+                    continue
+
+                self._executar(tarefa, executar_tarefa)
+                executadas += 1
+                if options['max_tarefas'] and executadas >= options['max_tarefas']:
+                    break
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(f'Executor {executor} encerrado: {executadas} tarefa(s) executada(s).')
+
+    def _pedir_parada(self, numero_sinal, quadro):
+        """SIGTERM: termina a tarefa atual e sai"""
+        self.parar = True
+
+    def _executar(self, tarefa, executar_tarefa):
+        from apps.cursoseoutros.models import StatusTarefa
+
+        prefixo = f'Tarefa #{tarefa.pk} ({tarefa.get_tipo_display()}, evento #{tarefa.evento_id})'
+        self.stdout.write(f'{prefixo}: iniciada')
+
+        inicio = time.perf_counter()
+        status = executar_tarefa(tarefa)
+        segundos = time.perf_counter() - inicio
+
+        mensagem = f'{prefixo}: {StatusTarefa(status).label.lower()} em {segundos:.2f}s'
+        if status == StatusTarefa.CONCLUIDA:
+            self.stdout.write(self.style.SUCCESS(mensagem))
+        elif status == StatusTarefa.CANCELADA:
+            self.stdout.write(self.style.WARNING(mensagem))
+        else:
+            self.stderr.write(self.style.ERROR(mensagem))
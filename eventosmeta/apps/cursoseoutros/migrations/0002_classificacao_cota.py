@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursoseoutros', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='classificacao',
+            name='cota',
+            field=models.ForeignKey(blank=True, help_text='Reserva que garantiu a vaga (vazio = ampla concorrência ou fila de espera)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='aprovados_cota', to='cursoseoutros.eventocriterio', verbose_name='Cota'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursoseoutros', '0002_classificacao_cota'),
+        ('interessados', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventocriterio',
+            name='fototipos_prioritarios',
+            field=models.ManyToManyField(blank=True, help_text='Para FOTOTIPO: fototipos que recebem 100 pontos (demais = 0)', related_name='evento_criterios', to='interessados.fototipo', verbose_name='Fototipos Prioritários'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursoseoutros', '0003_eventocriterio_fototipos_prioritarios'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='versao_classificacao',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Incrementada a cada classificação gravada (chave do cache de resultados)', verbose_name='Versão da Classificação'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursoseoutros', '0004_evento_versao_classificacao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='data_referencia_idade',
+            field=models.DateField(blank=True, help_text='Usada quando a idade é calculada em uma data fixa', null=True, verbose_name='Data de Referência da Idade'),
+        ),
+        migrations.AddField(
+            model_name='evento',
+            name='referencia_idade',
+            field=models.CharField(choices=[('CLASSIFICACAO', 'Data da Classificação'), ('FIM_INSCRICOES', 'Fim das Inscrições'), ('INICIO_AULAS', 'Início das Aulas'), ('DATA_FIXA', 'Data Fixa')], default='CLASSIFICACAO', help_text='Data de referência das idades nos critérios de idade e faixa etária', max_length=15, verbose_name='Idade Calculada em'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:50
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursoseoutros', '0005_evento_referencia_idade'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tarefa',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('CLASSIFICAR', 'Classificar Evento'), ('EXPORTAR_CSV', 'Exportar Classificação (CSV)'), ('EXPORTAR_XLSX', 'Exportar Classificação (XLSX)')], max_length=15, verbose_name='Tipo')),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('EXECUTANDO', 'Executando'), ('CONCLUIDA', 'Concluída'), ('ERRO', 'Erro'), ('CANCELADA', 'Cancelada')], default='PENDENTE', max_length=10, verbose_name='Status')),
+                ('progresso', models.PositiveSmallIntegerField(default=0, validators=[django.core.validators.MaxValueValidator(100)], verbose_name='Progresso (%)')),
+                ('mensagem', models.CharField(blank=True, default='', help_text='Etapa atual ou resultado', max_length=200, verbose_name='Mensagem')),
+                ('erro', models.TextField(blank=True, default='', verbose_name='Erro')),
+                ('arquivo', models.FileField(blank=True, help_text='Resultado das tarefas de exportação', upload_to='exportacoes/%Y/%m/', verbose_name='Arquivo')),
+                ('cancelamento_solicitado', models.BooleanField(default=False, help_text='A tarefa em execução para na próxima etapa', verbose_name='Cancelamento Solicitado')),
+                ('executor', models.CharField(blank=True, default='', help_text='Processo que executou (máquina:pid)', max_length=100, verbose_name='Executor')),
+                ('criado_em', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('iniciado_em', models.DateTimeField(blank=True, null=True, verbose_name='Iniciado em')),
+                ('concluido_em', models.DateTimeField(blank=True, null=True, verbose_name='Concluído em')),
+                ('evento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tarefas', to='cursoseoutros.evento', verbose_name='Evento')),
+                ('solicitado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tarefas_solicitadas', to=settings.AUTH_USER_MODEL, verbose_name='Solicitado Por')),
+            ],
+            options={
+                'verbose_name': 'Tarefa em Segundo Plano',
+                'verbose_name_plural': 'Tarefas em Segundo Plano',
+                'ordering': ['-criado_em'],
+                'indexes': [models.Index(fields=['status', 'criado_em'], name='tarefa_fila_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status__in', ['PENDENTE', 'EXECUTANDO']), ('tipo', 'CLASSIFICAR')), fields=('evento',), name='uma_classificacao_ativa_por_evento')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursoseoutros', '0006_tarefa'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TravaClassificacao',
+            fields=[
+                ('evento', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trava_classificacao', serialize=False, to='cursoseoutros.evento', verbose_name='Evento')),
+                ('dono', models.CharField(help_text='Execução que obteve a trava (máquina:pid:identificador)', max_length=100, verbose_name='Dono')),
+                ('adquirida_em', models.DateTimeField(verbose_name='Adquirida em')),
+                ('expira_em', models.DateTimeField(help_text='Depois disso outra execução pode assumir (dono interrompido)', verbose_name='Expira em')),
+            ],
+            options={
+                'verbose_name': 'Trava de Classificação',
+                'verbose_name_plural': 'Travas de Classificação',
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:56
+
+import apps.cursoseoutros.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursoseoutros', '0007_travaclassificacao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='desempate',
+            field=models.CharField(blank=True, default='DATA_INSCRICAO', help_text='Chaves aplicadas em ordem quando o score empata, separadas por vírgula: CRITERIO_PRIORITARIO (mais pontos no critério de menor ordem), MAIS_VELHO, MAIS_NOVO, DATA_INSCRICAO. Ex: MAIS_VELHO,CRITERIO_PRIORITARIO,DATA_INSCRICAO', max_length=100, validators=[apps.cursoseoutros.models.validar_desempate], verbose_name='Desempate'),
+        ),
+    ]
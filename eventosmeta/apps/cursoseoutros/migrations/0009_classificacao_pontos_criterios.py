@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursoseoutros', '0008_evento_desempate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='classificacao',
+            name='pontos_criterios',
+            field=models.JSONField(blank=True, default=dict, help_text='Pontos ponderados de cada critério em milésimos, por id do critério do evento (ausente = 0). Ex: {"12": 64125} = 64,125 pontos', verbose_name='Pontos por Critério'),
+        ),
+    ]
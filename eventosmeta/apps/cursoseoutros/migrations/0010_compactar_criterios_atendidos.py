@@ -0,0 +1,108 @@
+"""
+ARQUIVO: apps/cursoseoutros/migrations/0010_compactar_criterios_atendidos.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Move os pontos por critério de InscricaoCriterioAtendido para
+         Classificacao.pontos_criterios (só as validações de critérios
+         customizados continuam como linhas)
+DATA/HORA: 2026-10-17 02:01:32
+"""
+
+from decimal import Decimal
+from django.db import migrations
+
+
+CUSTOMIZADO = 'CUSTOMIZADO'
+TAMANHO_LOTE = 500
+
+
+def compactar(apps, schema_editor):
+    """Preenche pontos_criterios a partir das linhas e apaga as não customizadas"""
+    Classificacao = apps.get_model('cursoseoutros', 'Classificacao')
+    EventoCriterio = apps.get_model('cursoseoutros', 'EventoCriterio')
+    InscricaoCriterioAtendido = apps.get_model('cursoseoutros', 'InscricaoCriterioAtendido')
+
+    evento_ids = EventoCriterio.objects.values_list('evento_id', flat=True).distinct()
+    for evento_id in list(evento_ids):
+        # criterio_id → (EventoCriterio.id, peso, tipo)
+        criterios = {
+            criterio_id: (evento_criterio_id, peso, tipo)
+            for evento_criterio_id, criterio_id, peso, tipo in EventoCriterio.objects.filter(
+                evento_id=evento_id
+            ).values_list('id', 'criterio_id', 'peso', 'criterio__tipo_criterio')
+        }
+
+        pontos_por_inscricao = {}
+        for inscricao_id, criterio_id, pontos, validado in InscricaoCriterioAtendido.objects.filter(
+            inscricao__evento_id=evento_id
+        ).values_list('inscricao_id', 'criterio_id', 'pontos_obtidos', 'validado').iterator():
+            if criterio_id not in criterios:
+                continue
+
+            evento_criterio_id, peso, tipo = criterios[criterio_id]
+            if tipo == CUSTOMIZADO:
+                # Linha guarda os pontos base validados: aplica o peso
+                milesimos = int(pontos * 100) * peso if validado else 0
+            else:
+                milesimos = int((pontos * 1000).to_integral_value())
+
+            if milesimos:
+                pontos_por_inscricao.setdefault(inscricao_id, {})[str(evento_criterio_id)] = milesimos
+
+        classificacoes = []
+        for classificacao in Classificacao.objects.filter(
+            inscricao__evento_id=evento_id
+        ).only('id', 'inscricao_id').iterator():
+            pontos = pontos_por_inscricao.get(classificacao.inscricao_id)
+            if pontos:
+                classificacao.pontos_criterios = pontos
+                classificacoes.append(classificacao)
+
+        Classificacao.objects.bulk_update(classificacoes, ['pontos_criterios'], batch_size=TAMANHO_LOTE)
+
+    InscricaoCriterioAtendido.objects.exclude(criterio__tipo_criterio=CUSTOMIZADO).delete()
+
+
+def expandir(apps, schema_editor):
+    """Volta a criar uma linha por inscrição × critério não customizado"""
+    Classificacao = apps.get_model('cursoseoutros', 'Classificacao')
+    EventoCriterio = apps.get_model('cursoseoutros', 'EventoCriterio')
+    InscricaoCriterioAtendido = apps.get_model('cursoseoutros', 'InscricaoCriterioAtendido')
+
+    # EventoCriterio.id → Criterio.id (só não customizados)
+    criterios = dict(
+        EventoCriterio.objects.exclude(
+            criterio__tipo_criterio=CUSTOMIZADO
+        ).values_list('id', 'criterio_id')
+    )
+
+    linhas = []
+    for inscricao_id, pontos in Classificacao.objects.exclude(
+        pontos_criterios={}
+    ).values_list('inscricao_id', 'pontos_criterios').iterator():
+        for evento_criterio_id, milesimos in pontos.items():
+            criterio_id = criterios.get(int(evento_criterio_id))
+            if criterio_id is None:
+                continue
+            linhas.append(InscricaoCriterioAtendido(
+                inscricao_id=inscricao_id,
+                criterio_id=criterio_id,
+                pontos_obtidos=Decimal(milesimos).scaleb(-3),
+                validado=True
+            ))
+
+        if len(linhas) >= TAMANHO_LOTE:
+            InscricaoCriterioAtendido.objects.bulk_create(linhas, ignore_conflicts=True)
+            linhas = []
+
+    InscricaoCriterioAtendido.objects.bulk_create(linhas, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursoseoutros', '0009_classificacao_pontos_criterios'),
+    ]
+
+    operations = [
+        migrations.RunPython(compactar, expandir),
+    ]
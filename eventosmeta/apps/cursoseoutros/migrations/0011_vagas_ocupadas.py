@@ -0,0 +1,50 @@
+"""
+ARQUIVO: apps/cursoseoutros/migrations/0011_vagas_ocupadas.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Contadores de vagas ocupadas da turma e do evento (e limite de
+         vagas da turma), preenchidos com as matrículas confirmadas existentes
+DATA/HORA: 2026-10-17 02:07:58
+"""
+
+from django.db import migrations, models
+
+
+def contar_vagas_ocupadas(apps, schema_editor):
+    """Preenche os contadores com as matrículas confirmadas existentes"""
+    Evento = apps.get_model('cursoseoutros', 'Evento')
+    Turma = apps.get_model('cursoseoutros', 'Turma')
+    confirmadas = models.Count('matriculas', filter=models.Q(matriculas__status='CONFIRMADA'))
+
+    for turma_id, total in Turma.objects.annotate(total=confirmadas).values_list('id', 'total'):
+        Turma.objects.filter(pk=turma_id).update(vagas_ocupadas=total)
+
+    for evento_id, total in Evento.objects.annotate(
+        total=models.Sum('turmas__vagas_ocupadas')
+    ).values_list('id', 'total'):
+        Evento.objects.filter(pk=evento_id).update(vagas_ocupadas=total or 0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursoseoutros', '0010_compactar_criterios_atendidos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='vagas_ocupadas',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Matrículas confirmadas em todas as turmas (contador mantido pela matrícula)', verbose_name='Vagas Ocupadas'),
+        ),
+        migrations.AddField(
+            model_name='turma',
+            name='vagas',
+            field=models.PositiveIntegerField(blank=True, help_text='Limite desta turma (vazio = só o limite de vagas do evento)', null=True, verbose_name='Vagas da Turma'),
+        ),
+        migrations.AddField(
+            model_name='turma',
+            name='vagas_ocupadas',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Matrículas confirmadas (contador mantido pela matrícula)', verbose_name='Vagas Ocupadas'),
+        ),
+        migrations.RunPython(contar_vagas_ocupadas, migrations.RunPython.noop),
+    ]
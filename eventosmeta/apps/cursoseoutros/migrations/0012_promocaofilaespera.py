@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursoseoutros', '0011_vagas_ocupadas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PromocaoFilaEspera',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('motivo', models.CharField(choices=[('DESISTENCIA', 'Desistência'), ('NAO_COMPARECEU', 'Não Compareceu'), ('MATRICULA_CANCELADA', 'Matrícula Cancelada'), ('MATRICULA_TRANCADA', 'Matrícula Trancada')], max_length=20, verbose_name='Motivo')),
+                ('posicao_promovida', models.IntegerField(blank=True, null=True, verbose_name='Posição da Promovida')),
+                ('criado_em', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('cota_liberada', models.ForeignKey(blank=True, help_text='Reserva da vaga liberada (vazio = ampla concorrência)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='cursoseoutros.eventocriterio', verbose_name='Cota Liberada')),
+                ('cota_preenchida', models.ForeignKey(blank=True, help_text='Reserva pela qual a promovida entrou (vazio = ampla concorrência)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='cursoseoutros.eventocriterio', verbose_name='Cota Preenchida')),
+                ('evento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='promocoes_fila', to='cursoseoutros.evento', verbose_name='Evento')),
+                ('inscricao_liberada', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='vagas_liberadas', to='cursoseoutros.inscricao', verbose_name='Vaga Liberada Por')),
+                ('inscricao_promovida', models.ForeignKey(blank=True, help_text='Vazio = ninguém na fila de espera para esta vaga', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='promocoes_fila', to='cursoseoutros.inscricao', verbose_name='Promovida')),
+            ],
+            options={
+                'verbose_name': 'Promoção da Fila de Espera',
+                'verbose_name_plural': 'Promoções da Fila de Espera',
+                'ordering': ['-criado_em'],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:14
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursoseoutros', '0012_promocaofilaespera'),
+        ('interessados', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='inscricao_por_fila',
+            field=models.BooleanField(default=False, help_text='Para lançamentos muito concorridos: o envio só é registrado e recebe um número de recibo; a inscrição é criada logo depois pelo comando processar_inscricoes, com a data/hora do envio', verbose_name='Inscrição por Fila'),
+        ),
+        migrations.CreateModel(
+            name='InscricaoRecebida',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recebida_em', models.DateTimeField(default=django.utils.timezone.now, help_text='Vira a data da inscrição (ordem de chegada)', verbose_name='Recebida em')),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('PROCESSANDO', 'Processando'), ('INSCRITA', 'Inscrição Criada'), ('JA_INSCRITO', 'Já Inscrito'), ('RECUSADA', 'Recusada')], default='PENDENTE', max_length=15, verbose_name='Status')),
+                ('mensagem', models.CharField(blank=True, default='', help_text='Motivo da recusa', max_length=200, verbose_name='Mensagem')),
+                ('executor', models.CharField(blank=True, default='', help_text='Processo que processou (máquina:pid)', max_length=100, verbose_name='Executor')),
+                ('reservada_em', models.DateTimeField(blank=True, null=True, verbose_name='Reservada em')),
+                ('processada_em', models.DateTimeField(blank=True, null=True, verbose_name='Processada em')),
+                ('evento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inscricoes_recebidas', to='cursoseoutros.evento', verbose_name='Evento')),
+                ('inscricao', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='recebimentos', to='cursoseoutros.inscricao', verbose_name='Inscrição')),
+                ('interessado', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inscricoes_recebidas', to='interessados.interessado', verbose_name='Interessado')),
+            ],
+            options={
+                'verbose_name': 'Inscrição Recebida (Fila)',
+                'verbose_name_plural': 'Inscrições Recebidas (Fila)',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['status', 'id'], name='recebida_fila_idx')],
+            },
+        ),
+    ]
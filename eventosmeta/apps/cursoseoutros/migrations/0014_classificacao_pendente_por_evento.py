@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursoseoutros', '0013_inscricaorecebida'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='tarefa',
+            name='uma_classificacao_ativa_por_evento',
+        ),
+        migrations.AddConstraint(
+            model_name='tarefa',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'PENDENTE'), ('tipo', 'CLASSIFICAR')), fields=('evento',), name='uma_classificacao_pendente_por_evento'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursoseoutros', '0014_classificacao_pendente_por_evento'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tarefa',
+            name='sinal_de_vida_em',
+            field=models.DateTimeField(blank=True, help_text='Renovado pelo executor enquanto a tarefa roda', null=True, verbose_name='Último Sinal de Vida'),
+        ),
+    ]
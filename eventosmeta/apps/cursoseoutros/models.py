@@ -5,9 +5,11 @@ MUDANÇA: Models completos para sistema de eventos, cursos, inscrições, classi
 DATA/HORA: 2025-10-29 14:30:00
 """
 
-from django.db import models
+from django.db import models, transaction
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator, RegexValidator
 from django.utils import timezone
+from datetime import date
 from decimal import Decimal
 
 
@@ -98,6 +100,57 @@ class Modalidade(models.TextChoices):
     HIBRIDO = 'HIBRIDO', 'Híbrido'
 
 
+class ReferenciaIdade(models.TextChoices):
+    """Data em que a idade dos inscritos é calculada na classificação"""
+    CLASSIFICACAO = 'CLASSIFICACAO', 'Data da Classificação'
+    FIM_INSCRICOES = 'FIM_INSCRICOES', 'Fim das Inscrições'
+    INICIO_AULAS = 'INICIO_AULAS', 'Início das Aulas'
+    DATA_FIXA = 'DATA_FIXA', 'Data Fixa'
+
+
+class ChaveDesempate(models.TextChoices):
+    """Chaves de desempate da classificação, aplicadas depois do score"""
+    CRITERIO_PRIORITARIO = 'CRITERIO_PRIORITARIO', 'Mais Pontos no Critério Prioritário'
+    MAIS_VELHO = 'MAIS_VELHO', 'Maior Idade'
+    MAIS_NOVO = 'MAIS_NOVO', 'Menor Idade'
+    DATA_INSCRICAO = 'DATA_INSCRICAO', 'Inscrição Mais Antiga'
+
+
+def validar_desempate(valor):
+    """Chaves de desempate separadas por vírgula: conhecidas e sem repetição"""
+    chaves = [chave.strip() for chave in valor.split(',') if chave.strip()]
+    
+    desconhecidas = [chave for chave in chaves if chave not in ChaveDesempate.values]
+    if desconhecidas:
+        raise ValidationError(
+            f'Chave(s) de desempate inválida(s): {", ".join(desconhecidas)}. '
+            f'Use: {", ".join(ChaveDesempate.values)}.'
+        )
+    
+    if len(set(chaves)) != len(chaves):
+        raise ValidationError('Chave de desempate repetida.')
+    
+    if ChaveDesempate.MAIS_VELHO in chaves and ChaveDesempate.MAIS_NOVO in chaves:
+        raise ValidationError('Use só uma das chaves de idade (MAIS_VELHO ou MAIS_NOVO).')
+
+
+def _preservar_contadores(instancia, kwargs, contadores):
+    """
+    Em save() de instância existente, grava todos os campos menos os
+    contadores (mantidos só por UPDATE com F(), ver Evento.save).
+    
+    Args:
+        instancia (Model): Instância sendo salva
+        kwargs (dict): Argumentos do save() (update_fields é preenchido)
+        contadores (tuple): Nomes dos campos a preservar
+    """
+    if not instancia._state.adding and kwargs.get('update_fields') is None:
+        kwargs['update_fields'] = [
+            campo.name for campo in instancia._meta.concrete_fields
+            if not campo.primary_key and campo.name not in contadores
+        ]
+
+
 class Evento(models.Model):
     """
     Eventos/Cursos oferecidos pela MetaReciclagem.
@@ -168,6 +221,13 @@ class Evento(models.Model):
         help_text='Mínimo de alunos para viabilizar o curso'
     )
     
+    vagas_ocupadas = models.PositiveIntegerField(
+        'Vagas Ocupadas',
+        default=0,
+        editable=False,
+        help_text='Matrículas confirmadas em todas as turmas (contador mantido pela matrícula)'
+    )
+    
     modalidade = models.CharField(
         'Modalidade',
         max_length=15,
@@ -188,6 +248,16 @@ class Evento(models.Model):
         blank=True
     )
     
+    inscricao_por_fila = models.BooleanField(
+        'Inscrição por Fila',
+        default=False,
+        help_text=(
+            'Para lançamentos muito concorridos: o envio só é registrado e recebe '
+            'um número de recibo; a inscrição é criada logo depois pelo comando '
+            'processar_inscricoes, com a data/hora do envio'
+        )
+    )
+    
     # DATAS - MATRÍCULAS
     inicio_matricula = models.DateField(
         'Início das Matrículas',
@@ -247,6 +317,43 @@ class Evento(models.Model):
         help_text='Informações adicionais'
     )
     
+    # CLASSIFICAÇÃO
+    referencia_idade = models.CharField(
+        'Idade Calculada em',
+        max_length=15,
+        choices=ReferenciaIdade.choices,
+        default=ReferenciaIdade.CLASSIFICACAO,
+        help_text='Data de referência das idades nos critérios de idade e faixa etária'
+    )
+    
+    data_referencia_idade = models.DateField(
+        'Data de Referência da Idade',
+        null=True,
+        blank=True,
+        help_text='Usada quando a idade é calculada em uma data fixa'
+    )
+    
+    desempate = models.CharField(
+        'Desempate',
+        max_length=100,
+        default=ChaveDesempate.DATA_INSCRICAO,
+        blank=True,
+        validators=[validar_desempate],
+        help_text=(
+            'Chaves aplicadas em ordem quando o score empata, separadas por vírgula: '
+            'CRITERIO_PRIORITARIO (mais pontos no critério de menor ordem), '
+            'MAIS_VELHO, MAIS_NOVO, DATA_INSCRICAO. '
+            'Ex: MAIS_VELHO,CRITERIO_PRIORITARIO,DATA_INSCRICAO'
+        )
+    )
+    
+    versao_classificacao = models.PositiveIntegerField(
+        'Versão da Classificação',
+        default=0,
+        editable=False,
+        help_text='Incrementada a cada classificação gravada (chave do cache de resultados)'
+    )
+    
     # AUDITORIA
     criado_em = models.DateTimeField('Criado em', auto_now_add=True)
     atualizado_em = models.DateTimeField('Atualizado em', auto_now=True)
@@ -262,16 +369,72 @@ class Evento(models.Model):
     def __str__(self):
         return f"{self.descricao} ({self.status})"
     
+    def save(self, *args, **kwargs):
+        """
+        Salva o evento sem regravar versao_classificacao nem vagas_ocupadas.
+        Os contadores só mudam por UPDATE com F() (gravação da classificação,
+        confirmação de matrícula): uma instância carregada antes e salva
+        depois não pode voltá-los.
+        """
+        _preservar_contadores(self, kwargs, ('versao_classificacao', 'vagas_ocupadas'))
+        super().save(*args, **kwargs)
+    
+    def data_referencia_idades(self):
+        """
+        Data em que as idades são calculadas na classificação.
+        
+        Fixa (fim das inscrições, início das aulas ou data informada) torna
+        o resultado reproduzível; sem a data escolhida preenchida, usa hoje.
+        
+        Returns:
+            date: Data de referência
+        """
+        datas = {
+            ReferenciaIdade.FIM_INSCRICOES: self.fim_inscricoes,
+            ReferenciaIdade.INICIO_AULAS: self.inicio_aulas,
+            ReferenciaIdade.DATA_FIXA: self.data_referencia_idade,
+        }
+        return datas.get(self.referencia_idade) or date.today()
+    
+    def chaves_desempate(self):
+        """
+        Chaves de desempate configuradas, em ordem (o id da inscrição é
+        sempre o último desempate, ver desempate.py).
+        
+        Returns:
+            list: ChaveDesempate
+        """
+        return [
+            ChaveDesempate(chave.strip())
+            for chave in self.desempate.split(',') if chave.strip()
+        ]
+    
     def total_inscricoes(self):
         """Retorna o total de inscrições neste evento"""
         return self.inscricoes.count()
     
     def vagas_disponiveis(self):
-        """Calcula vagas disponíveis"""
-        matriculas_confirmadas = self.turmas.aggregate(
-            total=models.Count('matriculas', filter=models.Q(matriculas__status='CONFIRMADA'))
-        )['total'] or 0
-        return self.vagas - matriculas_confirmadas
+        """Vagas disponíveis, pelo contador de vagas ocupadas (sem consulta)"""
+        return self.vagas - self.vagas_ocupadas
+    
+    def recontar_vagas(self):
+        """
+        Refaz os contadores de vagas ocupadas do evento e das turmas a partir
+        das matrículas confirmadas. Necessário só depois de alterações que
+        não passam por Matricula.save() (ex: queryset.update() no shell).
+        """
+        with transaction.atomic():
+            for turma in self.turmas.annotate(
+                confirmadas=models.Count(
+                    'matriculas', filter=models.Q(matriculas__status=StatusMatricula.CONFIRMADA)
+                )
+            ):
+                Turma.objects.filter(pk=turma.pk).update(vagas_ocupadas=turma.confirmadas)
+            
+            self.vagas_ocupadas = Matricula.objects.filter(
+                turma__evento=self, status=StatusMatricula.CONFIRMADA
+            ).count()
+            Evento.objects.filter(pk=self.pk).update(vagas_ocupadas=self.vagas_ocupadas)
     
     class Meta:
         verbose_name = 'Evento/Curso'
@@ -367,6 +530,15 @@ class EventoCriterio(models.Model):
         help_text='Para FAIXA_ETARIA: idade máxima prioritária'
     )
     
+    # CONFIGURAÇÃO ESPECÍFICA PARA FOTOTIPO
+    fototipos_prioritarios = models.ManyToManyField(
+        'interessados.Fototipo',
+        blank=True,
+        related_name='evento_criterios',
+        verbose_name='Fototipos Prioritários',
+        help_text='Para FOTOTIPO: fototipos que recebem 100 pontos (demais = 0)'
+    )
+    
     observacao = models.TextField(
         'Observações',
         blank=True,
@@ -431,6 +603,31 @@ class Inscricao(models.Model):
     def __str__(self):
         return f"{self.interessado.nome} → {self.evento.descricao}"
     
+    def save(self, *args, **kwargs):
+        """
+        Salva a inscrição. Se uma inscrição aprovada ou matriculada sai do
+        processo (desistente, não compareceu), a vaga vai para o próximo da
+        fila de espera na mesma transação (ver fila_espera.py).
+        
+        Inscrição nova é só o INSERT (caminho rápido de inscricoes.py).
+        """
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            return
+        
+        with transaction.atomic():
+            status_gravado = Inscricao.objects.select_for_update().filter(
+                pk=self.pk
+            ).values_list('status', flat=True).first()
+            
+            # Lido por signals.inscricao_salva (versão da classificação)
+            self._status_gravado = status_gravado
+            super().save(*args, **kwargs)
+            
+            if status_gravado is not None and status_gravado != self.status:
+                from .fila_espera import liberar_vaga_inscricao
+                liberar_vaga_inscricao(self, status_gravado)
+    
     class Meta:
         verbose_name = 'Inscrição'
         verbose_name_plural = 'Inscrições'
@@ -464,16 +661,49 @@ class Classificacao(models.Model):
         blank=True,
         help_text='Posição final na classificação (1=primeiro lugar)'
     )
-    
+
+    cota = models.ForeignKey(
+        EventoCriterio,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='aprovados_cota',
+        verbose_name='Cota',
+        help_text='Reserva que garantiu a vaga (vazio = ampla concorrência ou fila de espera)'
+    )
+
     data_classificacao = models.DateTimeField(
         'Data da Classificação',
         default=timezone.now,
         help_text='Quando a classificação foi processada'
     )
     
+    pontos_criterios = models.JSONField(
+        'Pontos por Critério',
+        default=dict,
+        blank=True,
+        help_text=(
+            'Pontos ponderados de cada critério em milésimos, por id do '
+            'critério do evento (ausente = 0). Ex: {"12": 64125} = 64,125 pontos'
+        )
+    )
+    
     def __str__(self):
         return f"{self.inscricao.interessado.nome} - Posição: {self.posicao} (Score: {self.score_total})"
     
+    def pontos_por_criterio(self):
+        """
+        Detalhamento do score: pontos ponderados de cada critério.
+        
+        Returns:
+            dict: EventoCriterio.id → pontos (Decimal, 3 casas); critérios
+                  sem pontos ficam de fora
+        """
+        return {
+            int(evento_criterio_id): Decimal(milesimos).scaleb(-3)
+            for evento_criterio_id, milesimos in self.pontos_criterios.items()
+        }
+    
     class Meta:
         verbose_name = 'Classificação'
         verbose_name_plural = 'Classificações'
@@ -482,8 +712,9 @@ class Classificacao(models.Model):
 
 class InscricaoCriterioAtendido(models.Model):
     """
-    Registra quais critérios cada inscrição atende.
-    Para critérios CUSTOMIZADOS, permite validação manual pelo operador.
+    Validação manual de um critério CUSTOMIZADO para uma inscrição.
+    Os pontos dos demais critérios ficam em Classificacao.pontos_criterios
+    (uma linha por inscrição, não uma por inscrição × critério).
     """
     inscricao = models.ForeignKey(
         Inscricao,
@@ -538,6 +769,10 @@ class InscricaoCriterioAtendido(models.Model):
         unique_together = ['inscricao', 'criterio']
 
 
+class VagasEsgotadas(ValidationError):
+    """Matrícula confirmada sem vaga na turma ou no evento"""
+
+
 class Turma(models.Model):
     """
     Turma/Classe formada após matrículas.
@@ -584,12 +819,105 @@ class Turma(models.Model):
         help_text='Sala/local específico desta turma'
     )
     
+    vagas = models.PositiveIntegerField(
+        'Vagas da Turma',
+        null=True,
+        blank=True,
+        help_text='Limite desta turma (vazio = só o limite de vagas do evento)'
+    )
+    
+    vagas_ocupadas = models.PositiveIntegerField(
+        'Vagas Ocupadas',
+        default=0,
+        editable=False,
+        help_text='Matrículas confirmadas (contador mantido pela matrícula)'
+    )
+    
     def __str__(self):
         return f"{self.evento.descricao} - {self.descricao_turma}"
     
+    def save(self, *args, **kwargs):
+        """Salva a turma sem regravar vagas_ocupadas (ver Evento.save)"""
+        _preservar_contadores(self, kwargs, ('vagas_ocupadas',))
+        super().save(*args, **kwargs)
+    
     def total_alunos(self):
-        """Retorna total de alunos matriculados"""
-        return self.matriculas.filter(status='CONFIRMADA').count()
+        """Retorna total de alunos matriculados (contador, sem consulta)"""
+        return self.vagas_ocupadas
+    
+    def erro_vagas(self, contar_evento=True):
+        """
+        Motivo pelo qual a turma não comporta mais uma matrícula confirmada,
+        pelos contadores já carregados. Só uma verificação prévia, para a
+        mensagem do formulário: quem garante a vaga é ocupar_vaga().
+        
+        Args:
+            contar_evento (bool): Verifica também as vagas do evento (False
+                quando a matrícula só troca de turma dentro do evento)
+        
+        Returns:
+            str: Mensagem de erro ('' se há vaga)
+        """
+        if self.vagas is not None and self.vagas_ocupadas >= self.vagas:
+            return f'A turma está lotada ({self.vagas} vagas).'
+        if contar_evento and self.evento.vagas_ocupadas >= self.evento.vagas:
+            return f'Todas as vagas do evento já estão ocupadas ({self.evento.vagas} vagas).'
+        return ''
+    
+    @staticmethod
+    def ocupar_vaga(turma_id, contar_evento=True):
+        """
+        Ocupa uma vaga na turma e no evento dela.
+        
+        Cada contador sobe com um UPDATE condicional (... WHERE vagas_ocupadas
+        < vagas): o banco decide, então duas confirmações simultâneas da
+        última vaga nunca passam as duas, ao contrário de contar as matrículas
+        e depois gravar. Deve rodar dentro de transação (Matricula.save): se
+        o evento estiver lotado, a vaga já ocupada na turma é desfeita.
+        
+        Args:
+            turma_id (int): Turma
+            contar_evento (bool): Ocupa também a vaga do evento (False
+                quando a matrícula só troca de turma dentro do evento)
+        
+        Raises:
+            VagasEsgotadas: Turma ou evento sem vaga
+        """
+        ocupada = Turma.objects.filter(pk=turma_id).filter(
+            models.Q(vagas__isnull=True) | models.Q(vagas_ocupadas__lt=models.F('vagas'))
+        ).update(vagas_ocupadas=models.F('vagas_ocupadas') + 1)
+        if not ocupada:
+            raise VagasEsgotadas('A turma está lotada.')
+        
+        if not contar_evento:
+            return
+        
+        ocupada = Evento.objects.filter(
+            pk=models.Subquery(Turma.objects.filter(pk=turma_id).values('evento_id')),
+            vagas_ocupadas__lt=models.F('vagas')
+        ).update(vagas_ocupadas=models.F('vagas_ocupadas') + 1)
+        if not ocupada:
+            raise VagasEsgotadas('Todas as vagas do evento já estão ocupadas.')
+    
+    @staticmethod
+    def liberar_vaga(turma_id, contar_evento=True):
+        """
+        Libera uma vaga na turma e no evento dela (UPDATE com F(), nunca
+        abaixo de zero).
+        
+        Args:
+            turma_id (int): Turma
+            contar_evento (bool): Libera também a vaga do evento
+        """
+        Turma.objects.filter(pk=turma_id, vagas_ocupadas__gt=0).update(
+            vagas_ocupadas=models.F('vagas_ocupadas') - 1
+        )
+        if not contar_evento:
+            return
+        Evento.objects.filter(
+            pk=models.Subquery(Turma.objects.filter(pk=turma_id).values('evento_id')),
+            vagas_ocupadas__gt=0
+        ).update(vagas_ocupadas=models.F('vagas_ocupadas') - 1)
     
     class Meta:
         verbose_name = 'Turma'
@@ -639,6 +967,71 @@ class Matricula(models.Model):
     def __str__(self):
         return f"{self.interessado.nome} - {self.turma.descricao_turma}"
     
+    def save(self, *args, **kwargs):
+        """
+        Salva a matrícula ocupando ou liberando a vaga na mesma transação.
+        
+        Só a matrícula CONFIRMADA ocupa vaga: confirmar ocupa, cancelar ou
+        trancar libera (e promove o próximo da fila de espera do evento,
+        ver fila_espera.py), trocar de turma move a vaga. A situação anterior é
+        lida do banco (travando a linha onde o banco permite), não da
+        instância, que pode ter sido carregada antes de outra alteração.
+        
+        Raises:
+            VagasEsgotadas: Confirmação sem vaga na turma ou no evento
+                (nada é gravado)
+        """
+        vaga = self.turma_id if self.status == StatusMatricula.CONFIRMADA else None
+        
+        with transaction.atomic():
+            vaga_gravada = None
+            if not self._state.adding:
+                vaga_gravada = Matricula.objects.select_for_update().filter(
+                    pk=self.pk, status=StatusMatricula.CONFIRMADA
+                ).values_list('turma_id', flat=True).first()
+            
+            if vaga != vaga_gravada:
+                # Troca de turma no mesmo evento: a vaga do evento continua ocupada
+                contar_evento = vaga is None or vaga_gravada is None or (
+                    Turma.objects.filter(pk__in=[vaga, vaga_gravada]).values(
+                        'evento_id'
+                    ).distinct().count() > 1
+                )
+                if vaga is not None:
+                    Turma.ocupar_vaga(vaga, contar_evento)
+                if vaga_gravada is not None:
+                    Turma.liberar_vaga(vaga_gravada, contar_evento)
+            
+            super().save(*args, **kwargs)
+            
+            # Confirmada → cancelada/trancada: a vaga no evento vai para a fila de espera
+            if vaga_gravada is not None and self.status in (
+                StatusMatricula.CANCELADA, StatusMatricula.TRANCADA
+            ):
+                from .fila_espera import liberar_vaga_matricula
+                liberar_vaga_matricula(self)
+    
+    def erro_vagas(self, turma, status):
+        """
+        Verificação prévia de vaga para o formulário (ver Turma.erro_vagas).
+        
+        Args:
+            turma (Turma): Turma escolhida
+            status (str): StatusMatricula escolhido
+        
+        Returns:
+            str: Mensagem de erro ('' se há vaga ou se não vai ocupar vaga nova)
+        """
+        if turma is None or status != StatusMatricula.CONFIRMADA:
+            return ''
+        confirmada = self.pk and self.status == StatusMatricula.CONFIRMADA
+        if confirmada and self.turma_id == turma.pk:
+            return ''  # já ocupa vaga nesta turma
+        # Troca de turma no mesmo evento: já ocupa a vaga do evento
+        return turma.erro_vagas(
+            contar_evento=not (confirmada and self.turma.evento_id == turma.evento_id)
+        )
+    
     class Meta:
         verbose_name = 'Matrícula'
         verbose_name_plural = 'Matrículas'
@@ -696,4 +1089,341 @@ class Avaliacao(models.Model):
     class Meta:
         verbose_name = 'Avaliação'
         verbose_name_plural = 'Avaliações'
-        ordering = ['matricula__turma']
\ No newline at end of file
+        ordering = ['matricula__turma']
+
+
+class TipoTarefa(models.TextChoices):
+    """Tipos de tarefa executados em segundo plano"""
+    CLASSIFICAR = 'CLASSIFICAR', 'Classificar Evento'
+    EXPORTAR_CSV = 'EXPORTAR_CSV', 'Exportar Classificação (CSV)'
+    EXPORTAR_XLSX = 'EXPORTAR_XLSX', 'Exportar Classificação (XLSX)'
+
+
+class StatusTarefa(models.TextChoices):
+    """Status possíveis de uma tarefa em segundo plano"""
+    PENDENTE = 'PENDENTE', 'Pendente'
+    EXECUTANDO = 'EXECUTANDO', 'Executando'
+    CONCLUIDA = 'CONCLUIDA', 'Concluída'
+    ERRO = 'ERRO', 'Erro'
+    CANCELADA = 'CANCELADA', 'Cancelada'
+
+
+class Tarefa(models.Model):
+    """
+    Tarefa da fila de execução em segundo plano (classificação, exportação).
+    Gravada pelo admin e executada pelo comando processar_tarefas, sem
+    depender de um broker externo.
+    """
+    ATIVAS = [StatusTarefa.PENDENTE, StatusTarefa.EXECUTANDO]
+    
+    evento = models.ForeignKey(
+        Evento,
+        on_delete=models.CASCADE,
+        related_name='tarefas',
+        verbose_name='Evento'
+    )
+    
+    tipo = models.CharField(
+        'Tipo',
+        max_length=15,
+        choices=TipoTarefa.choices
+    )
+    
+    status = models.CharField(
+        'Status',
+        max_length=10,
+        choices=StatusTarefa.choices,
+        default=StatusTarefa.PENDENTE
+    )
+    
+    progresso = models.PositiveSmallIntegerField(
+        'Progresso (%)',
+        default=0,
+        validators=[MaxValueValidator(100)]
+    )
+    
+    mensagem = models.CharField(
+        'Mensagem',
+        max_length=200,
+        blank=True,
+        default='',
+        help_text='Etapa atual ou resultado'
+    )
+    
+    erro = models.TextField(
+        'Erro',
+        blank=True,
+        default=''
+    )
+    
+    arquivo = models.FileField(
+        'Arquivo',
+        upload_to='exportacoes/%Y/%m/',
+        blank=True,
+        help_text='Resultado das tarefas de exportação'
+    )
+    
+    cancelamento_solicitado = models.BooleanField(
+        'Cancelamento Solicitado',
+        default=False,
+        help_text='A tarefa em execução para na próxima etapa'
+    )
+    
+    solicitado_por = models.ForeignKey(
+        'accounts.Usuario',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='tarefas_solicitadas',
+        verbose_name='Solicitado Por'
+    )
+    
+    executor = models.CharField(
+        'Executor',
+        max_length=100,
+        blank=True,
+        default='',
+        help_text='Processo que executou (máquina:pid)'
+    )
+    
+    criado_em = models.DateTimeField('Criado em', auto_now_add=True)
+    iniciado_em = models.DateTimeField('Iniciado em', null=True, blank=True)
+    sinal_de_vida_em = models.DateTimeField(
+        'Último Sinal de Vida',
+        null=True,
+        blank=True,
+        help_text='Renovado pelo executor enquanto a tarefa roda'
+    )
+    concluido_em = models.DateTimeField('Concluído em', null=True, blank=True)
+    
+    def __str__(self):
+        return f"{self.get_tipo_display()} - {self.evento.descricao} ({self.get_status_display()})"
+    
+    @property
+    def ativa(self):
+        """Se ainda vai ou está rodando"""
+        return self.status in self.ATIVAS
+    
+    class Meta:
+        verbose_name = 'Tarefa em Segundo Plano'
+        verbose_name_plural = 'Tarefas em Segundo Plano'
+        ordering = ['-criado_em']
+        indexes = [
+            models.Index(fields=['status', 'criado_em'], name='tarefa_fila_idx'),
+        ]
+        constraints = [
+            # Uma classificação pendente por evento (pedidos repetidos se
+            # juntam); a execução em si é serializada por reservar_proxima
+            models.UniqueConstraint(
+                fields=['evento'],
+                condition=models.Q(tipo='CLASSIFICAR', status='PENDENTE'),
+                name='uma_classificacao_pendente_por_evento'
+            ),
+        ]
+
+
+class TravaClassificacao(models.Model):
+    """
+    Trava de classificação por evento: enquanto existe (e não venceu), só
+    o dono pode classificar o evento. Uma linha por evento (chave primária),
+    então duas execuções nunca obtêm a trava ao mesmo tempo, em qualquer
+    banco (ver travas.py).
+    """
+    evento = models.OneToOneField(
+        Evento,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trava_classificacao',
+        verbose_name='Evento'
+    )
+    
+    dono = models.CharField(
+        'Dono',
+        max_length=100,
+        help_text='Execução que obteve a trava (máquina:pid:identificador)'
+    )
+    
+    adquirida_em = models.DateTimeField('Adquirida em')
+    
+    expira_em = models.DateTimeField(
+        'Expira em',
+        help_text='Depois disso outra execução pode assumir (dono interrompido)'
+    )
+    
+    def __str__(self):
+        return f"Trava do evento #{self.evento_id} ({self.dono})"
+    
+    class Meta:
+        verbose_name = 'Trava de Classificação'
+        verbose_name_plural = 'Travas de Classificação'
+
+
+class MotivoVagaLiberada(models.TextChoices):
+    """Por que uma vaga aprovada voltou para a fila de espera"""
+    DESISTENCIA = 'DESISTENCIA', 'Desistência'
+    NAO_COMPARECEU = 'NAO_COMPARECEU', 'Não Compareceu'
+    MATRICULA_CANCELADA = 'MATRICULA_CANCELADA', 'Matrícula Cancelada'
+    MATRICULA_TRANCADA = 'MATRICULA_TRANCADA', 'Matrícula Trancada'
+
+
+class PromocaoFilaEspera(models.Model):
+    """
+    Auditoria da promoção automática da fila de espera: quem liberou a vaga,
+    por quê, e quem a recebeu (ver fila_espera.py).
+    """
+    evento = models.ForeignKey(
+        Evento,
+        on_delete=models.CASCADE,
+        related_name='promocoes_fila',
+        verbose_name='Evento'
+    )
+    
+    motivo = models.CharField(
+        'Motivo',
+        max_length=20,
+        choices=MotivoVagaLiberada.choices
+    )
+    
+    inscricao_liberada = models.ForeignKey(
+        Inscricao,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='vagas_liberadas',
+        verbose_name='Vaga Liberada Por'
+    )
+    
+    cota_liberada = models.ForeignKey(
+        EventoCriterio,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Cota Liberada',
+        help_text='Reserva da vaga liberada (vazio = ampla concorrência)'
+    )
+    
+    inscricao_promovida = models.ForeignKey(
+        Inscricao,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='promocoes_fila',
+        verbose_name='Promovida',
+        help_text='Vazio = ninguém na fila de espera para esta vaga'
+    )
+    
+    posicao_promovida = models.IntegerField(
+        'Posição da Promovida',
+        null=True,
+        blank=True
+    )
+    
+    cota_preenchida = models.ForeignKey(
+        EventoCriterio,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Cota Preenchida',
+        help_text='Reserva pela qual a promovida entrou (vazio = ampla concorrência)'
+    )
+    
+    criado_em = models.DateTimeField('Criado em', auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.evento.descricao} - {self.get_motivo_display()} ({self.criado_em:%d/%m/%Y %H:%M})"
+    
+    class Meta:
+        verbose_name = 'Promoção da Fila de Espera'
+        verbose_name_plural = 'Promoções da Fila de Espera'
+        ordering = ['-criado_em']
+
+
+class StatusRecebimento(models.TextChoices):
+    """Situação de um envio de inscrição recebido no modo fila"""
+    PENDENTE = 'PENDENTE', 'Pendente'
+    PROCESSANDO = 'PROCESSANDO', 'Processando'
+    INSCRITA = 'INSCRITA', 'Inscrição Criada'
+    JA_INSCRITO = 'JA_INSCRITO', 'Já Inscrito'
+    RECUSADA = 'RECUSADA', 'Recusada'
+
+
+class InscricaoRecebida(models.Model):
+    """
+    Envio de inscrição recebido no modo fila (Evento.inscricao_por_fila).
+    
+    A requisição só grava esta linha (um INSERT) e devolve o número do
+    recibo; o comando processar_inscricoes valida e cria as inscrições em
+    lote, com data_inscricao = recebida_em (ver inscricoes.py).
+    """
+    evento = models.ForeignKey(
+        Evento,
+        on_delete=models.CASCADE,
+        related_name='inscricoes_recebidas',
+        verbose_name='Evento'
+    )
+    
+    interessado = models.ForeignKey(
+        'interessados.Interessado',
+        on_delete=models.CASCADE,
+        related_name='inscricoes_recebidas',
+        verbose_name='Interessado'
+    )
+    
+    recebida_em = models.DateTimeField(
+        'Recebida em',
+        default=timezone.now,
+        help_text='Vira a data da inscrição (ordem de chegada)'
+    )
+    
+    status = models.CharField(
+        'Status',
+        max_length=15,
+        choices=StatusRecebimento.choices,
+        default=StatusRecebimento.PENDENTE
+    )
+    
+    inscricao = models.ForeignKey(
+        Inscricao,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='recebimentos',
+        verbose_name='Inscrição'
+    )
+    
+    mensagem = models.CharField(
+        'Mensagem',
+        max_length=200,
+        blank=True,
+        default='',
+        help_text='Motivo da recusa'
+    )
+    
+    executor = models.CharField(
+        'Executor',
+        max_length=100,
+        blank=True,
+        default='',
+        help_text='Processo que processou (máquina:pid)'
+    )
+    
+    reservada_em = models.DateTimeField('Reservada em', null=True, blank=True)
+    processada_em = models.DateTimeField('Processada em', null=True, blank=True)
+    
+    def __str__(self):
+        return f"Recibo {self.recibo} ({self.get_status_display()})"
+    
+    @property
+    def recibo(self):
+        """Número do recibo mostrado ao interessado"""
+        return f'{self.pk:08d}'
+    
+    class Meta:
+        verbose_name = 'Inscrição Recebida (Fila)'
+        verbose_name_plural = 'Inscrições Recebidas (Fila)'
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['status', 'id'], name='recebida_fila_idx'),
+        ]
@@ -0,0 +1,243 @@
+"""
+ARQUIVO: apps/cursoseoutros/persistencia.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Gravação em lote de classificações, critérios atendidos e status
+         + matriculados mantêm status e vaga na reclassificação
+DATA/HORA: 2026-10-17 01:12:20
+"""
+
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .coorte import STATUS_FORA_DA_CLASSIFICACAO, STATUS_VAGA_GARANTIDA
+from .cotas import alocar_vagas
+from .models import (
+    Evento, Inscricao, Classificacao, InscricaoCriterioAtendido,
+    StatusInscricao, TipoCriterio
+)
+from .pontuacao import para_decimal
+from .relatorio import esquecer_versao
+
+
+# Quantidade de linhas por comando INSERT/UPDATE.
+# Mantém cada comando abaixo do limite de parâmetros do SQLite.
+TAMANHO_LOTE = 500
+
+
+def _em_lotes(itens, tamanho):
+    """Divide uma lista em fatias de no máximo `tamanho` itens"""
+    for inicio in range(0, len(itens), tamanho):
+        yield itens[inicio:inicio + tamanho]
+
+
+def situacao_classificacao(evento, resultado, ordem):
+    """
+    Posição, status e cota de cada inscrição da coorte.
+    As vagas são distribuídas por alocar_vagas (ampla concorrência + reservas):
+    aprovados = APROVADO, demais = FILA_ESPERA. Quem já garantiu a vaga
+    (STATUS_VAGA_GARANTIDA) mantém o status e a cota gravados.
+
+    Args:
+        evento (Evento): Evento classificado
+        resultado (ResultadoPontuacao): Pontos e scores calculados
+        ordem (list): Índices da coorte na ordem de classificação
+
+    Returns:
+        dict: inscricao_id → (posição, StatusInscricao, EventoCriterio.id da cota ou None)
+    """
+    inscricao_ids = resultado.coorte.inscricao_ids
+
+    garantidas = {}
+    status_garantido = {}
+    for inscricao_id, status, cota_id in Inscricao.objects.filter(
+        evento=evento, status__in=STATUS_VAGA_GARANTIDA
+    ).values_list('id', 'status', 'classificacao__cota_id'):
+        garantidas[inscricao_id] = cota_id
+        status_garantido[inscricao_id] = status
+
+    cotas = alocar_vagas(evento, resultado, ordem, garantidas).cotas
+
+    situacoes = {}
+    for posicao, indice in enumerate(ordem, start=1):
+        inscricao_id = inscricao_ids[indice]
+        if inscricao_id in status_garantido:
+            situacoes[inscricao_id] = (posicao, status_garantido[inscricao_id], cotas[inscricao_id])
+        elif inscricao_id in cotas:
+            situacoes[inscricao_id] = (posicao, StatusInscricao.APROVADO, cotas[inscricao_id])
+        else:
+            situacoes[inscricao_id] = (posicao, StatusInscricao.FILA_ESPERA, None)
+
+    return situacoes
+
+
+def pontos_compactos(resultado, indice):
+    """
+    Detalhamento do score de uma inscrição no formato de
+    Classificacao.pontos_criterios: id do critério do evento → pontos
+    ponderados em milésimos, só os critérios com pontos.
+
+    Args:
+        resultado (ResultadoPontuacao): Pontos calculados
+        indice (int): Posição da inscrição na coorte
+
+    Returns:
+        dict: str(EventoCriterio.id) → int
+    """
+    compactos = {}
+    for evento_criterio in resultado.evento_criterios:
+        pontos = resultado.pontos[evento_criterio.id][indice]
+        if pontos:
+            compactos[str(evento_criterio.id)] = pontos
+    return compactos
+
+
+def linhas_customizados(resultado, indices, evento_criterios=None):
+    """
+    Monta as linhas de InscricaoCriterioAtendido dos critérios customizados
+    (a validação manual fica nelas). Os demais critérios não têm linha: os
+    pontos vão em Classificacao.pontos_criterios.
+
+    Args:
+        resultado (ResultadoPontuacao): Pontos calculados
+        indices (iterable): Posições da coorte a gravar
+        evento_criterios (list): Critérios a considerar (padrão: todos)
+
+    Returns:
+        list: Linhas a criar (as já existentes são mantidas na gravação)
+    """
+    inscricao_ids = resultado.coorte.inscricao_ids
+    indices = list(indices)
+
+    if evento_criterios is None:
+        evento_criterios = resultado.evento_criterios
+
+    customizados = []
+    for evento_criterio in evento_criterios:
+        criterio = evento_criterio.criterio
+        if criterio.tipo_criterio != TipoCriterio.CUSTOMIZADO:
+            continue
+
+        customizados.extend(
+            InscricaoCriterioAtendido(
+                inscricao_id=inscricao_ids[indice],
+                criterio=criterio,
+                pontos_obtidos=Decimal('0.00'),
+                validado=False
+            )
+            for indice in indices
+        )
+
+    return customizados
+
+
+def gravar_lotes(customizados, classificacoes, status, tamanho_lote=TAMANHO_LOTE):
+    """
+    Grava linhas já montadas com comandos em lote, numa única transação.
+
+    No SQLite o bloqueio de escrita é obtido uma vez só, em vez de uma vez
+    por linha.
+
+    - InscricaoCriterioAtendido: critérios customizados, só criados se
+      ainda não existirem (para não apagar a validação manual)
+    - Classificacao: INSERT ... ON CONFLICT DO UPDATE com score, posição,
+      cota e pontos por critério
+    - Inscricao.status: um UPDATE por lote de ids com o mesmo status, sem
+      tocar em quem garantiu a vaga ou saiu do processo nesse meio tempo
+
+    Args:
+        customizados (list): InscricaoCriterioAtendido de critérios customizados
+        classificacoes (list): Classificacao a criar/atualizar
+        status (dict): inscricao_id → novo status
+        tamanho_lote (int): Linhas por comando
+    """
+    ids_por_status = {}
+    for inscricao_id, novo_status in status.items():
+        ids_por_status.setdefault(novo_status, []).append(inscricao_id)
+
+    with transaction.atomic():
+        InscricaoCriterioAtendido.objects.bulk_create(
+            customizados,
+            batch_size=tamanho_lote,
+            ignore_conflicts=True
+        )
+        Classificacao.objects.bulk_create(
+            classificacoes,
+            batch_size=tamanho_lote,
+            update_conflicts=True,
+            unique_fields=['inscricao'],
+            update_fields=[
+                'score_total', 'posicao', 'cota', 'data_classificacao', 'pontos_criterios'
+            ]
+        )
+
+        for novo_status, ids in ids_por_status.items():
+            for lote in _em_lotes(ids, tamanho_lote):
+                Inscricao.objects.filter(id__in=lote).exclude(
+                    status__in=STATUS_VAGA_GARANTIDA + STATUS_FORA_DA_CLASSIFICACAO
+                ).exclude(status=novo_status).update(status=novo_status)
+
+
+def persistir_classificacao(evento, resultado, ordem, tamanho_lote=TAMANHO_LOTE, agora=None):
+    """
+    Grava o resultado completo de uma classificação em lote.
+
+    Args:
+        evento (Evento): Evento classificado
+        resultado (ResultadoPontuacao): Pontos e scores calculados
+        ordem (list): Índices da coorte na ordem de classificação
+        tamanho_lote (int): Linhas por comando
+        agora (datetime): Data da classificação gravada (padrão: agora)
+
+    Returns:
+        dict: inscricao_id → (posição, status, cota) atribuídos
+    """
+    coorte = resultado.coorte
+    agora = agora or timezone.now()
+
+    situacoes = situacao_classificacao(evento, resultado, ordem)
+
+    customizados = linhas_customizados(resultado, range(len(coorte)))
+
+    classificacoes = [
+        Classificacao(
+            inscricao_id=inscricao_id,
+            score_total=para_decimal(score),
+            posicao=situacoes[inscricao_id][0],
+            cota_id=situacoes[inscricao_id][2],
+            data_classificacao=agora,
+            pontos_criterios=pontos_compactos(resultado, indice)
+        )
+        for indice, (inscricao_id, score) in enumerate(zip(coorte.inscricao_ids, resultado.scores))
+    ]
+    status = {
+        inscricao_id: situacao[1] for inscricao_id, situacao in situacoes.items()
+    }
+
+    with transaction.atomic():
+        gravar_lotes(customizados, classificacoes, status, tamanho_lote)
+
+        # Quem saiu do processo perde a posição e a vaga
+        Classificacao.objects.filter(
+            inscricao__evento=evento,
+            inscricao__status__in=STATUS_FORA_DA_CLASSIFICACAO
+        ).update(posicao=None, cota=None)
+
+        incrementar_versao_classificacao(evento.id)
+
+    return situacoes
+
+
+def incrementar_versao_classificacao(evento_id):
+    """
+    Incrementa a versão da classificação do evento. Deve ser chamada dentro
+    da transação que grava a classificação: a versão nova só fica visível
+    junto com os dados, e a versão em cache é esquecida depois do commit.
+
+    Args:
+        evento_id (int): Evento reclassificado
+    """
+    Evento.objects.filter(pk=evento_id).update(
+        versao_classificacao=F('versao_classificacao') + 1
+    )
+    transaction.on_commit(lambda: esquecer_versao(evento_id))
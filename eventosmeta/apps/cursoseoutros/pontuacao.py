@@ -0,0 +1,235 @@
+"""
+ARQUIVO: apps/cursoseoutros/pontuacao.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Motor de pontuação em lote (todos os inscritos × todos os critérios)
+DATA/HORA: 2026-10-17 01:10:24
+"""
+
+from decimal import Decimal
+from .coorte import Coorte
+from .desempate import colunas_desempate
+from .pontuadores import (
+    ZERO, dividir_arredondando, fototipos_prioritarios_ids, obter_pontuador
+)
+
+
+# ============================================
+# CRITÉRIOS EM LOTE (uma coluna por critério)
+# ============================================
+# O cálculo de cada tipo de critério fica no seu pontuador (pontuadores.py).
+# Aqui só há o despacho: uma busca no registro por critério, nunca por linha.
+
+def colunas_necessarias(evento_criterios):
+    """
+    União das colunas declaradas pelos pontuadores dos critérios.
+
+    Returns:
+        dict: Nome da coluna → campo a partir de Inscricao
+    """
+    colunas = {}
+    for evento_criterio in evento_criterios:
+        pontuador = obter_pontuador(evento_criterio.criterio.tipo_criterio)
+        if pontuador is not None:
+            colunas.update(pontuador.colunas)
+    return colunas
+
+
+def depende_da_coorte(evento_criterio):
+    """
+    Se o valor de uma inscrição no critério depende das demais inscrições.
+    Ao entrar ou sair alguém, a coluna inteira precisa ser recalculada;
+    os outros critérios só dependem da própria linha.
+    """
+    pontuador = obter_pontuador(evento_criterio.criterio.tipo_criterio)
+    return pontuador is not None and pontuador.dependente_da_coorte
+
+
+def mesma_base(antigo, novo):
+    """
+    Se duas configurações do mesmo critério do evento geram os mesmos pontos
+    base (só peso, ordem ou reserva mudaram), permitindo reaproveitar a coluna.
+
+    Args:
+        antigo (EventoCriterio): Configuração usada no cálculo da coluna
+        novo (EventoCriterio): Configuração atual/simulada
+    """
+    return (
+        novo.criterio_id == antigo.criterio_id
+        and novo.idade_minima == antigo.idade_minima
+        and novo.idade_maxima == antigo.idade_maxima
+        and fototipos_prioritarios_ids(novo) == fototipos_prioritarios_ids(antigo)
+    )
+
+
+def precarregar(coorte, evento_criterios):
+    """
+    Executa a pré-carga dos pontuadores dos tipos presentes nos critérios,
+    uma vez por tipo.
+
+    Returns:
+        dict: tipo_criterio → dados pré-carregados
+    """
+    por_tipo = {}
+    for evento_criterio in evento_criterios:
+        por_tipo.setdefault(evento_criterio.criterio.tipo_criterio, []).append(evento_criterio)
+
+    precarga = {}
+    for tipo, do_tipo in por_tipo.items():
+        pontuador = obter_pontuador(tipo)
+        if pontuador is not None:
+            precarga[tipo] = pontuador.precarregar(coorte, do_tipo)
+
+    return precarga
+
+
+def pontos_criterio_lote(coorte, evento_criterio, referencia, precarga=None):
+    """
+    Calcula a coluna de pontos base (0-100) de um critério para a coorte.
+
+    Args:
+        coorte (Coorte): Inscrições do evento em formato colunar
+        evento_criterio (EventoCriterio): Configuração do critério no evento
+        referencia (date): Data de referência para o cálculo de idades
+        precarga (dict): Resultado de precarregar() para os critérios do
+            evento (padrão: pré-carrega só este critério)
+
+    Returns:
+        list: Pontos base em centésimos (int) alinhados com
+              coorte.inscricao_ids (tipo sem pontuador registrado = 0)
+    """
+    tipo = evento_criterio.criterio.tipo_criterio
+    pontuador = obter_pontuador(tipo)
+    if pontuador is None:
+        return [ZERO] * len(coorte)
+
+    if precarga is None:
+        precarga = precarregar(coorte, [evento_criterio])
+
+    return pontuador.pontuar(coorte, evento_criterio, referencia, precarga.get(tipo))
+
+
+# ============================================
+# MOTOR DE PONTUAÇÃO
+# ============================================
+# Toda a conta é feita em inteiros:
+# - pontos base em centésimos de ponto (80,00 pontos = 8000)
+# - pontos ponderados em milésimos: base × peso / 10 → centésimos × peso
+#   (80,00 × 8 / 10 = 64,000 → 8000 × 8 = 64000)
+# - score em centésimos: soma dos milésimos / 10, arredondada como
+#   round(Decimal, 2) (metade para o par)
+# Como todos os valores são exatos nessas escalas, o resultado convertido
+# para Decimal é idêntico bit a bit à versão em Decimal. A conversão só
+# acontece na gravação (para_decimal).
+
+CASAS_PONTOS_BASE = 2
+CASAS_PONDERADOS = 3
+
+
+def para_decimal(valor, casas=CASAS_PONTOS_BASE):
+    """
+    Converte um inteiro escalado para Decimal.
+    Exemplo: para_decimal(12345) → Decimal('123.45');
+             para_decimal(64125, CASAS_PONDERADOS) → Decimal('64.125')
+    """
+    return Decimal(valor).scaleb(-casas)
+
+
+def ponderar(pontos_base, peso):
+    """
+    Aplica o peso do critério (0-10) a uma coluna de pontos base.
+    Exemplo: pontos_base=80 (8000), peso=8 → 80 × 8 / 10 = 64 pontos (64000)
+
+    Returns:
+        list: Pontos ponderados em milésimos de ponto
+    """
+    return [base * peso for base in pontos_base]
+
+
+def arredondar_score(total):
+    """Soma de pontos ponderados (milésimos) → score em centésimos (2 casas)"""
+    return dividir_arredondando(total, 10)
+
+
+class ResultadoPontuacao:
+    """
+    Resultado da pontuação de um evento (valores inteiros escalados).
+
+    Attributes:
+        coorte (Coorte): Inscrições avaliadas
+        evento_criterios (list): Critérios aplicados, na ordem de aplicação
+        pontos_base (dict): EventoCriterio.id → lista de pontos base
+                            (0-100, em centésimos)
+        pontos (dict): EventoCriterio.id → lista de pontos ponderados
+                       (em milésimos)
+        scores (list): Score total de cada inscrição (em centésimos)
+        referencia (date): Data de referência usada para idades
+    """
+
+    def __init__(self, coorte, evento_criterios, pontos_base, pontos, scores, referencia):
+        self.coorte = coorte
+        self.evento_criterios = evento_criterios
+        self.pontos_base = pontos_base
+        self.pontos = pontos
+        self.scores = scores
+        self.referencia = referencia
+
+    def __len__(self):
+        return len(self.coorte)
+
+    def somar(self, indice):
+        """Score total (centésimos) da inscrição na posição `indice`"""
+        total = 0
+        for evento_criterio in self.evento_criterios:
+            total += self.pontos[evento_criterio.id][indice]
+        return arredondar_score(total)
+
+
+def calcular_pontuacao_evento(evento, referencia=None):
+    """
+    Calcula o score de todas as inscrições de um evento de uma vez.
+
+    Carrega os critérios do evento uma vez, a coorte uma vez (só com as
+    colunas que os critérios usam) e os dados de outras tabelas uma vez por
+    tipo de critério (pré-carga); depois cada critério vira uma coluna de
+    pontos. O resultado é idêntico a chamar
+    ClassificadorService.calcular_score_inscricao para cada inscrição.
+
+    Score = Σ (pontos_base × peso_criterio / 10), calculado em inteiros
+
+    Args:
+        evento (Evento): Evento a ser pontuado
+        referencia (date): Data de referência para idades
+                           (padrão: evento.data_referencia_idades())
+
+    Returns:
+        ResultadoPontuacao: Pontos por critério e scores totais
+    """
+    referencia = referencia or evento.data_referencia_idades()
+
+    evento_criterios = list(
+        evento.evento_criterios.select_related('criterio').prefetch_related(
+            'fototipos_prioritarios'
+        ).filter(criterio__ativo=True).order_by('ordem')
+    )
+    colunas = colunas_necessarias(evento_criterios)
+    colunas.update(colunas_desempate(evento.chaves_desempate()))
+    coorte = Coorte.carregar(evento, colunas=colunas)
+    precarga = precarregar(coorte, evento_criterios)
+
+    pontos_base = {}
+    pontos = {}
+    totais = [0] * len(coorte)
+
+    for evento_criterio in evento_criterios:
+        base = pontos_criterio_lote(coorte, evento_criterio, referencia, precarga)
+        ponderados = ponderar(base, evento_criterio.peso)
+
+        pontos_base[evento_criterio.id] = base
+        pontos[evento_criterio.id] = ponderados
+        totais = [total + ponderado for total, ponderado in zip(totais, ponderados)]
+
+    scores = [arredondar_score(total) for total in totais]
+
+    return ResultadoPontuacao(
+        coorte, evento_criterios, pontos_base, pontos, scores, referencia
+    )
@@ -0,0 +1,324 @@
+"""
+ARQUIVO: apps/cursoseoutros/pontuadores.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Registro de pontuadores de critério (um por TipoCriterio), em lote
+DATA/HORA: 2026-10-17 01:26:25
+"""
+
+from decimal import ROUND_HALF_EVEN
+from .models import InscricaoCriterioAtendido, TipoCriterio
+from .ranking import contar_anteriores
+
+
+# Pontos base em centésimos de ponto (inteiros): 100,00 pontos = 10000.
+# Os pontos base do sistema têm sempre 2 casas decimais, então a conta em
+# inteiros é exata; a conversão para Decimal fica na gravação.
+CEM = 10000
+ZERO = 0
+CINCO = 500
+
+
+def dividir_arredondando(numerador, denominador):
+    """
+    Divisão inteira com arredondamento bancário (metade para o par),
+    o mesmo de round(Decimal, n).
+
+    Args:
+        numerador (int): Dividendo
+        denominador (int): Divisor positivo
+
+    Returns:
+        int: numerador / denominador arredondado
+    """
+    quociente, resto = divmod(numerador, denominador)
+    dobro = 2 * resto
+    if dobro > denominador or (dobro == denominador and quociente % 2):
+        quociente += 1
+    return quociente
+
+
+def decimal_para_centesimos(valor):
+    """Decimal com 2 casas (ex: pontos validados no banco) → centésimos"""
+    return int((valor * 100).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+# ============================================
+# REGISTRO
+# ============================================
+# Cada tipo de critério tem um pontuador registrado aqui. O motor de
+# pontuação (pontuacao.py) só consulta este dicionário: um tipo novo
+# (faixa de renda, bairro, participação anterior...) é uma classe nova
+# com @registrar_pontuador, sem mexer no laço principal.
+
+PONTUADORES = {}
+
+
+def registrar_pontuador(classe):
+    """
+    Decorador de classe que registra o pontuador do seu `tipo`.
+
+    Exemplo:
+        @registrar_pontuador
+        class PontuadorBairro(Pontuador):
+            tipo = 'BAIRRO'
+            colunas = {'bairros': 'interessado__bairro'}
+
+            def pontuar(self, coorte, evento_criterio, referencia, precarga):
+                ...
+    """
+    PONTUADORES[classe.tipo] = classe()
+    return classe
+
+
+def obter_pontuador(tipo_criterio):
+    """Pontuador registrado para o tipo (None se não houver)"""
+    return PONTUADORES.get(tipo_criterio)
+
+
+class Pontuador:
+    """
+    Base dos pontuadores de critério.
+
+    Um pontuador calcula a coluna de pontos base (0-100, em centésimos:
+    0-10000) de um tipo de critério para a coorte inteira de uma vez.
+
+    Attributes:
+        tipo (str): TipoCriterio pontuado
+        colunas (dict): Colunas da coorte que o cálculo usa
+            (nome → campo a partir de Inscricao). A coorte é carregada com a
+            união das colunas dos critérios do evento, numa consulta só.
+        dependente_da_coorte (bool): O valor de uma inscrição depende das
+            demais; ao entrar ou sair alguém, a coluna inteira muda
+    """
+
+    tipo = None
+    colunas = {}
+    dependente_da_coorte = False
+
+    def precarregar(self, coorte, evento_criterios):
+        """
+        Busca, numa consulta só, dados de outras tabelas de que todos os
+        critérios deste tipo no evento vão precisar.
+
+        Args:
+            coorte (Coorte): Inscrições a pontuar
+            evento_criterios (list): Critérios do evento deste tipo
+
+        Returns:
+            Dados entregues a pontuar() em `precarga` (padrão: None)
+        """
+        return None
+
+    def pontuar(self, coorte, evento_criterio, referencia, precarga):
+        """
+        Args:
+            coorte (Coorte): Inscrições em formato colunar
+            evento_criterio (EventoCriterio): Configuração do critério no evento
+            referencia (date): Data de referência para idades
+            precarga: Retorno de precarregar()
+
+        Returns:
+            list: Pontos base em centésimos (int) alinhados com
+                  coorte.inscricao_ids
+        """
+        raise NotImplementedError
+
+
+# ============================================
+# PONTUADORES PADRÃO
+# ============================================
+# As fórmulas são exatamente as de ClassificadorService.calcular_pontos_*
+# (versão por inscrição), em centésimos de ponto. O resultado convertido
+# para Decimal é idêntico ao da versão em Decimal.
+
+COLUNA_NASCIMENTO = {'datas_nascimento': 'interessado__data_nascimento'}
+
+
+@registrar_pontuador
+class PontuadorOrdemInscricao(Pontuador):
+    """
+    Primeiro inscrito = 100 pontos, último = 0 pontos (escala linear).
+    Inscrições anteriores vêm de uma única ordenação da coorte; inscrições
+    no mesmo instante recebem os mesmos pontos.
+    """
+
+    tipo = TipoCriterio.ORDEM
+    dependente_da_coorte = True
+
+    def pontuar(self, coorte, evento_criterio, referencia, precarga):
+        total = len(coorte)
+        if total <= 1:
+            return [CEM] * total
+
+        # 100 - anteriores / (total - 1) × 100, arredondado em 2 casas
+        divisor = total - 1
+
+        return [
+            dividir_arredondando(CEM * (divisor - anteriores), divisor)
+            for anteriores in contar_anteriores(coorte.datas_inscricao)
+        ]
+
+
+@registrar_pontuador
+class PontuadorIdadeCrescente(Pontuador):
+    """Quanto menor a idade, mais pontos"""
+
+    tipo = TipoCriterio.IDADE_CRESCENTE
+    colunas = COLUNA_NASCIMENTO
+
+    def pontuar(self, coorte, evento_criterio, referencia, precarga):
+        return [
+            max(ZERO, CEM - idade * 100)
+            for idade in coorte.idades(referencia)
+        ]
+
+
+@registrar_pontuador
+class PontuadorIdadeDecrescente(Pontuador):
+    """Quanto maior a idade, mais pontos (limitado a 100)"""
+
+    tipo = TipoCriterio.IDADE_DECRESCENTE
+    colunas = COLUNA_NASCIMENTO
+
+    def pontuar(self, coorte, evento_criterio, referencia, precarga):
+        return [
+            min(CEM, idade * 100)
+            for idade in coorte.idades(referencia)
+        ]
+
+
+@registrar_pontuador
+class PontuadorFaixaEtaria(Pontuador):
+    """Dentro da faixa = 100 pontos, fora = perde 5 pontos por ano de distância"""
+
+    tipo = TipoCriterio.FAIXA_ETARIA
+    colunas = COLUNA_NASCIMENTO
+
+    def pontuar(self, coorte, evento_criterio, referencia, precarga):
+        idade_min = evento_criterio.idade_minima or 0
+        idade_max = evento_criterio.idade_maxima or 999
+
+        pontos = []
+        for idade in coorte.idades(referencia):
+            if idade_min <= idade <= idade_max:
+                pontos.append(CEM)
+            else:
+                distancia = min(abs(idade - idade_min), abs(idade - idade_max))
+                pontos.append(max(ZERO, CEM - distancia * CINCO))
+
+        return pontos
+
+
+@registrar_pontuador
+class PontuadorProgramaSocial(Pontuador):
+    """Participa de programa social com NIS preenchido = 100 pontos"""
+
+    tipo = TipoCriterio.NIS
+    colunas = {
+        'programa_social': 'interessado__programa_social',
+        'num_nis': 'interessado__num_nis',
+    }
+
+    def pontuar(self, coorte, evento_criterio, referencia, precarga):
+        return [
+            CEM if (programa and nis) else ZERO
+            for programa, nis in zip(coorte.programa_social, coorte.num_nis)
+        ]
+
+
+@registrar_pontuador
+class PontuadorNecessidadeEspecial(Pontuador):
+    """Declarou necessidade especial e marcou ao menos um tipo = 100 pontos"""
+
+    tipo = TipoCriterio.PCD
+    colunas = {
+        'necessidades_especiais': 'interessado__necessidades_especiais',
+        'fisica': 'interessado__fisica',
+        'visual': 'interessado__visual',
+        'auditiva': 'interessado__auditiva',
+        'intelectual': 'interessado__intelectual',
+        'psicossocial': 'interessado__psicossocial',
+        'multiplas': 'interessado__multiplas',
+    }
+
+    def pontuar(self, coorte, evento_criterio, referencia, precarga):
+        tipos = zip(
+            coorte.fisica, coorte.visual, coorte.auditiva,
+            coorte.intelectual, coorte.psicossocial, coorte.multiplas
+        )
+        return [
+            CEM if (necessidade and any(marcados)) else ZERO
+            for necessidade, marcados in zip(coorte.necessidades_especiais, tipos)
+        ]
+
+
+def fototipos_prioritarios_ids(evento_criterio):
+    """
+    Conjunto de ids dos fototipos prioritários do critério.
+    Usa o prefetch de fototipos_prioritarios quando existir (sem consulta).
+    """
+    return {fototipo.pk for fototipo in evento_criterio.fototipos_prioritarios.all()}
+
+
+@registrar_pontuador
+class PontuadorFototipo(Pontuador):
+    """
+    Cotas raciais: fototipo na lista prioritária = 100 pontos, outros = 0.
+    A lista é carregada uma vez (conjunto) e cada inscrito só testa pertinência.
+    Sem fototipos configurados, mantém a regra antiga: 50 pontos (neutro)
+    para quem informou fototipo.
+    """
+
+    tipo = TipoCriterio.FOTOTIPO
+    colunas = {'fototipo_ids': 'interessado__fototipo_id'}
+
+    def pontuar(self, coorte, evento_criterio, referencia, precarga):
+        prioritarios = fototipos_prioritarios_ids(evento_criterio)
+
+        if not prioritarios:
+            return [
+                CEM // 2 if fototipo_id else ZERO
+                for fototipo_id in coorte.fototipo_ids
+            ]
+
+        return [
+            CEM if fototipo_id in prioritarios else ZERO
+            for fototipo_id in coorte.fototipo_ids
+        ]
+
+
+@registrar_pontuador
+class PontuadorCustomizado(Pontuador):
+    """Pontos validados manualmente pelo operador (sem validação = 0)"""
+
+    tipo = TipoCriterio.CUSTOMIZADO
+
+    def precarregar(self, coorte, evento_criterios):
+        """
+        Pontos validados de todos os critérios customizados do evento,
+        com uma única consulta.
+
+        Returns:
+            dict: (inscricao_id, criterio_id) → pontos_obtidos em centésimos
+        """
+        consulta = InscricaoCriterioAtendido.objects.filter(
+            inscricao__evento=coorte.evento,
+            criterio_id__in={evento_criterio.criterio_id for evento_criterio in evento_criterios},
+            validado=True
+        )
+        if coorte.parcial:
+            consulta = consulta.filter(inscricao_id__in=coorte.inscricao_ids)
+
+        return {
+            (inscricao_id, criterio_id): decimal_para_centesimos(pontos)
+            for inscricao_id, criterio_id, pontos in consulta.values_list(
+                'inscricao_id', 'criterio_id', 'pontos_obtidos'
+            )
+        }
+
+    def pontuar(self, coorte, evento_criterio, referencia, precarga):
+        criterio_id = evento_criterio.criterio_id
+        return [
+            precarga.get((inscricao_id, criterio_id), ZERO)
+            for inscricao_id in coorte.inscricao_ids
+        ]
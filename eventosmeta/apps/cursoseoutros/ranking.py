@@ -0,0 +1,98 @@
+"""
+ARQUIVO: apps/cursoseoutros/ranking.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Funções de ranking em O(n log n) reutilizáveis pelos critérios
+DATA/HORA: 2026-10-17 01:11:08
+"""
+
+from django.db.models import F, Window
+from django.db.models.functions import Rank
+
+
+def contar_anteriores(valores, metodo='min'):
+    """
+    Para cada valor, conta quantos valores vêm antes dele na ordenação.
+
+    Uma única ordenação (O(n log n)) seguida de uma passada linear,
+    no lugar de um COUNT por elemento.
+
+    Empates são tratados de forma determinística:
+    - 'min': valores iguais recebem a mesma contagem (quantos são
+      estritamente menores). É a regra da ordem de inscrição: duas
+      inscrições no mesmo instante recebem os mesmos pontos.
+    - 'ordinal': valores iguais são desempatados pela posição na lista
+      de entrada (ordenação estável), então cada elemento recebe uma
+      contagem diferente.
+
+    Args:
+        valores (list): Valores comparáveis (datas, números, tuplas...)
+        metodo (str): 'min' ou 'ordinal'
+
+    Returns:
+        list: Contagem de anteriores, alinhada com a lista de entrada
+    """
+    if metodo not in ('min', 'ordinal'):
+        raise ValueError(f"Método de desempate inválido: {metodo}")
+
+    ordem = sorted(range(len(valores)), key=valores.__getitem__)
+    anteriores = [0] * len(valores)
+
+    inicio_grupo = 0
+    for posicao, indice in enumerate(ordem):
+        if metodo == 'ordinal':
+            anteriores[indice] = posicao
+            continue
+
+        # Novo grupo de empate começa quando o valor muda
+        if posicao and valores[indice] != valores[ordem[posicao - 1]]:
+            inicio_grupo = posicao
+        anteriores[indice] = inicio_grupo
+
+    return anteriores
+
+
+def anotar_rank(queryset, campo, nome='rank', decrescente=False):
+    """
+    Versão SQL de contar_anteriores(metodo='min'), usando a função de
+    janela RANK(). Útil quando o ranking precisa ser lido junto com outras
+    colunas sem carregar a coorte em memória.
+
+    O rank SQL começa em 1, então "anteriores" = rank - 1.
+
+    Args:
+        queryset (QuerySet): Consulta a ser anotada
+        campo (str): Campo usado na ordenação
+        nome (str): Nome da anotação
+        decrescente (bool): Ordena do maior para o menor
+
+    Returns:
+        QuerySet: Consulta com a anotação de rank
+    """
+    ordenacao = F(campo).desc() if decrescente else F(campo).asc()
+    return queryset.annotate(**{
+        nome: Window(expression=Rank(), order_by=ordenacao)
+    })
+
+
+def ordenar_classificacao(scores, inscricao_ids, desempates=()):
+    """
+    Ordena a coorte para atribuição de posições, em memória.
+
+    Score maior primeiro; empates resolvidos pelas colunas de desempate,
+    na ordem dada (menor valor primeiro) e, por último, pelo id da
+    inscrição para que o resultado seja sempre o mesmo.
+
+    Uma única ordenação estável sobre tuplas montadas uma vez (nada é
+    recalculado a cada comparação).
+
+    Args:
+        scores (list): Score total de cada inscrição
+        inscricao_ids (list): Id de cada inscrição
+        desempates (list): Colunas de desempate alinhadas com os scores
+            (ver desempate.py)
+
+    Returns:
+        list: Índices da coorte na ordem de classificação
+    """
+    chaves = list(zip([-score for score in scores], *desempates, inscricao_ids))
+    return sorted(range(len(chaves)), key=chaves.__getitem__)
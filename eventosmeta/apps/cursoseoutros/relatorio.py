@@ -0,0 +1,419 @@
+"""
+ARQUIVO: apps/cursoseoutros/relatorio.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Relatório da classificação somente leitura, com número fixo de consultas
+         + exportação CSV/XLSX em streaming (memória constante)
+         + instantâneos versionados da classificação no cache
+         + aprovados = quem ocupa vaga (aprovado ou matriculado)
+DATA/HORA: 2026-10-17 01:36:39
+"""
+
+import csv
+from decimal import Decimal
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+from .coorte import STATUS_COM_VAGA
+from .models import (
+    Classificacao, Evento, EventoCriterio, Inscricao, InscricaoCriterioAtendido,
+    StatusInscricao, TipoCriterio
+)
+
+try:
+    import openpyxl
+except ImportError:  # XLSX é opcional: sem openpyxl, só CSV
+    openpyxl = None
+
+
+# ============================================
+# CONSULTAS
+# ============================================
+
+def classificados(evento):
+    """
+    Classificações gravadas do evento, em ordem de posição.
+
+    Inscrição, interessado e critério da cota vêm no mesmo JOIN: percorrer
+    o resultado não gera consultas por linha. Desistentes (sem posição)
+    ficam de fora.
+
+    Args:
+        evento (Evento): Evento já classificado
+
+    Returns:
+        QuerySet: Classificacao com select_related
+    """
+    return Classificacao.objects.filter(
+        inscricao__evento=evento,
+        posicao__isnull=False
+    ).select_related(
+        'inscricao__interessado', 'cota__criterio'
+    ).order_by('posicao')
+
+
+# ============================================
+# INSTANTÂNEOS VERSIONADOS (CACHE)
+# ============================================
+# O resultado de cada classificação gravada vira um instantâneo imutável no
+# cache, com chave derivada de Evento.versao_classificacao (incrementada na
+# transação que grava a classificação). Enquanto a versão não muda, as
+# leituras não consultam o banco; ao mudar, a chave é outra e o instantâneo
+# antigo simplesmente expira. Não há nada a invalidar além da própria versão.
+
+CHAVE_VERSAO = 'classificacao:versao:{evento_id}'
+CHAVE_RESULTADO = 'classificacao:resultado:v2:{evento_id}:{versao}'
+CHAVE_DETALHES = 'classificacao:detalhes:{evento_id}:{versao}'
+
+# A versão é esquecida no commit, mas só no cache do processo que gravou
+# quando o cache é local (LocMem): o tempo curto limita o atraso nos demais.
+TEMPO_CACHE_VERSAO = 60
+TEMPO_CACHE_RESULTADO = 60 * 60 * 24  # 1 dia
+
+
+def versao_atual(evento_id):
+    """
+    Versão da classificação gravada do evento (cache, senão banco).
+
+    Returns:
+        int: Evento.versao_classificacao
+    """
+    chave = CHAVE_VERSAO.format(evento_id=evento_id)
+    versao = cache.get(chave)
+    if versao is None:
+        versao = Evento.objects.values_list('versao_classificacao', flat=True).get(pk=evento_id)
+        cache.set(chave, versao, TEMPO_CACHE_VERSAO)
+    return versao
+
+
+def esquecer_versao(evento_id):
+    """Descarta a versão em cache (chamada após o commit de uma classificação)"""
+    cache.delete(CHAVE_VERSAO.format(evento_id=evento_id))
+
+
+class InstantaneoClassificacao:
+    """
+    Resultado imutável de uma versão da classificação de um evento.
+
+    As linhas são tuplas na ordem de COLUNAS (compactas para o cache).
+
+    Attributes:
+        evento_id (int): Evento
+        versao (int): versao_classificacao do instantâneo
+        gerado_em (datetime): Quando foi montado
+        contagem (dict): total, aprovados e fila_espera de inscrições
+        linhas (tuple): Classificados em ordem de posição
+    """
+
+    COLUNAS = (
+        'posicao', 'inscricao_id', 'nome', 'cpf', 'score_total',
+        'data_inscricao', 'status', 'cota',
+    )
+
+    def __init__(self, evento_id, versao, gerado_em, contagem, linhas):
+        self.evento_id = evento_id
+        self.versao = versao
+        self.gerado_em = gerado_em
+        self.contagem = contagem
+        self.linhas = linhas
+
+    def __len__(self):
+        return len(self.linhas)
+
+    def registros(self):
+        """Linhas como dicionários (chaves = COLUNAS)"""
+        for linha in self.linhas:
+            yield dict(zip(self.COLUNAS, linha))
+
+    def aprovados(self):
+        """Linhas das inscrições com vaga (aprovadas ou matriculadas), em ordem de posição"""
+        indice_status = self.COLUNAS.index('status')
+        return [linha for linha in self.linhas if linha[indice_status] in STATUS_COM_VAGA]
+
+
+def montar_instantaneo(evento_id, versao):
+    """
+    Monta o instantâneo a partir do banco (contagem + classificados: duas
+    consultas). A versão é lida antes, então os dados nunca são mais
+    antigos que ela.
+    """
+    contagem = Inscricao.objects.filter(evento_id=evento_id).aggregate(
+        total=Count('id'),
+        aprovados=Count('id', filter=Q(status__in=STATUS_COM_VAGA)),
+        fila_espera=Count('id', filter=Q(status=StatusInscricao.FILA_ESPERA)),
+    )
+
+    linhas = tuple(
+        Classificacao.objects.filter(
+            inscricao__evento_id=evento_id,
+            posicao__isnull=False
+        ).order_by('posicao').values_list(
+            'posicao',
+            'inscricao_id',
+            'inscricao__interessado__nome',
+            'inscricao__interessado__cpf',
+            'score_total',
+            'inscricao__data_inscricao',
+            'inscricao__status',
+            'cota__criterio__descricao_criterio',
+        )
+    )
+
+    return InstantaneoClassificacao(evento_id, versao, timezone.now(), contagem, linhas)
+
+
+def obter_instantaneo_classificacao(evento_id):
+    """
+    Instantâneo da classificação atual do evento. Sem consultas ao banco
+    enquanto a versão e o instantâneo estiverem no cache.
+
+    Args:
+        evento_id (int): Evento
+
+    Returns:
+        InstantaneoClassificacao
+    """
+    versao = versao_atual(evento_id)
+    chave = CHAVE_RESULTADO.format(evento_id=evento_id, versao=versao)
+
+    instantaneo = cache.get(chave)
+    if instantaneo is None:
+        instantaneo = montar_instantaneo(evento_id, versao)
+        cache.set(chave, instantaneo, TEMPO_CACHE_RESULTADO)
+
+    return instantaneo
+
+
+def obter_detalhes_classificacao(evento_id, versao):
+    """
+    Detalhamento do score dos classificados na versão (pontos de cada
+    critério), do cache (senão três consultas: critérios, pontos gravados
+    em Classificacao.pontos_criterios e validações dos customizados).
+    Separado do instantâneo: só o relatório da equipe precisa.
+
+    Returns:
+        dict: inscricao_id → tupla de (critério, pontos, validado), na
+              ordem dos critérios do evento
+    """
+    chave = CHAVE_DETALHES.format(evento_id=evento_id, versao=versao)
+
+    detalhes = cache.get(chave)
+    if detalhes is None:
+        criterios = list(EventoCriterio.objects.filter(
+            evento_id=evento_id, criterio__ativo=True
+        ).order_by('ordem').values_list(
+            'id', 'criterio_id', 'criterio__descricao_criterio', 'criterio__tipo_criterio'
+        ))
+        customizados = {
+            criterio_id for _, criterio_id, _, tipo in criterios
+            if tipo == TipoCriterio.CUSTOMIZADO
+        }
+
+        validados = set()
+        if customizados:
+            validados = set(InscricaoCriterioAtendido.objects.filter(
+                inscricao__evento_id=evento_id,
+                criterio_id__in=customizados,
+                validado=True
+            ).values_list('inscricao_id', 'criterio_id'))
+
+        detalhes = {
+            inscricao_id: tuple(
+                (
+                    nome,
+                    Decimal(pontos.get(str(evento_criterio_id), 0)).scaleb(-3),
+                    criterio_id not in customizados or (inscricao_id, criterio_id) in validados,
+                )
+                for evento_criterio_id, criterio_id, nome, _ in criterios
+            )
+            for inscricao_id, pontos in Classificacao.objects.filter(
+                inscricao__evento_id=evento_id,
+                posicao__isnull=False
+            ).values_list('inscricao_id', 'pontos_criterios')
+        }
+        cache.set(chave, detalhes, TEMPO_CACHE_RESULTADO)
+
+    return detalhes
+
+
+# ============================================
+# RELATÓRIO
+# ============================================
+
+def montar_relatorio(evento):
+    """
+    Relatório da classificação gravada de um evento. Não classifica nem
+    grava nada: reflete a última classificação (ver
+    ClassificadorService.classificar_evento).
+
+    Contagens, classificados e critérios atendidos vêm do instantâneo da
+    versão atual (cache). Só o que não depende da classificação é lido do
+    banco a cada vez: status do evento, vagas ocupadas e critérios.
+
+    Args:
+        evento (Evento): Evento (com status carregado ou não)
+
+    Returns:
+        dict: Relatório com informações detalhadas
+    """
+    instantaneo = obter_instantaneo_classificacao(evento.id)
+    detalhes = obter_detalhes_classificacao(evento.id, instantaneo.versao)
+
+    relatorio = {
+        'evento': {
+            'id': evento.id,
+            'nome': evento.descricao,
+            'status': evento.status.status,
+            'modalidade': evento.get_modalidade_display(),
+        },
+        'vagas': {
+            'total': evento.vagas,
+            'minimas': evento.vagas_minimas,
+            'disponiveis': evento.vagas_disponiveis(),
+        },
+        'inscricoes': dict(instantaneo.contagem),
+        'criterios': [],
+        'classificados': []
+    }
+
+    # Informações dos critérios aplicados
+    for evento_criterio in evento.evento_criterios.select_related('criterio').all():
+        relatorio['criterios'].append({
+            'nome': evento_criterio.criterio.descricao_criterio,
+            'tipo': evento_criterio.criterio.get_tipo_criterio_display(),
+            'peso': evento_criterio.peso,
+            'ordem': evento_criterio.ordem,
+            'tipo_reserva': evento_criterio.get_tipo_reserva_display(),
+            'vagas_reservadas': evento_criterio.vagas_reservadas,
+        })
+
+    # Lista detalhada de classificados
+    for linha in instantaneo.registros():
+        aprovado = linha['status'] in STATUS_COM_VAGA
+
+        relatorio['classificados'].append({
+            'posicao': linha['posicao'],
+            'nome': linha['nome'],
+            'cpf': linha['cpf'],
+            'score_total': float(linha['score_total']),
+            'data_inscricao': linha['data_inscricao'].strftime('%d/%m/%Y %H:%M'),
+            'situacao': 'APROVADO' if aprovado else 'FILA DE ESPERA',
+            'cota': linha['cota'] or ('Ampla concorrência' if aprovado else ''),
+            'criterios_atendidos': [
+                {
+                    'criterio': criterio,
+                    'pontos': float(pontos),
+                    'validado': validado,
+                }
+                for criterio, pontos, validado in detalhes.get(linha['inscricao_id'], ())
+            ],
+        })
+
+    return relatorio
+
+
+# ============================================
+# EXPORTAÇÃO (STREAMING)
+# ============================================
+# As linhas são lidas do banco em blocos (.iterator: cursor no servidor
+# quando o banco permite) e escritas uma a uma. Nada guarda o evento
+# inteiro em memória, e a primeira linha sai antes de a consulta terminar.
+
+CABECALHO_EXPORTACAO = (
+    'Posição', 'Nome', 'CPF', 'Score', 'Data Inscrição', 'Situação', 'Cota',
+)
+
+TAMANHO_BLOCO_EXPORTACAO = 2000
+
+
+def linhas_exportacao(evento, tamanho_bloco=TAMANHO_BLOCO_EXPORTACAO):
+    """
+    Gera as linhas da exportação, na ordem de CABECALHO_EXPORTACAO.
+
+    Lê tuplas (values_list) em vez de instâncias de model: sem custo de
+    montar objetos por linha.
+
+    Args:
+        evento (Evento): Evento já classificado
+        tamanho_bloco (int): Linhas buscadas do banco por vez
+
+    Yields:
+        tuple: Uma linha por classificado
+    """
+    consulta = classificados(evento).values_list(
+        'posicao',
+        'inscricao__interessado__nome',
+        'inscricao__interessado__cpf',
+        'score_total',
+        'inscricao__data_inscricao',
+        'inscricao__status',
+        'cota__criterio__descricao_criterio',
+    )
+
+    for posicao, nome, cpf, score, data_inscricao, status, cota in consulta.iterator(
+        chunk_size=tamanho_bloco
+    ):
+        aprovado = status in STATUS_COM_VAGA
+        yield (
+            posicao,
+            nome,
+            cpf,
+            float(score),
+            data_inscricao.strftime('%d/%m/%Y %H:%M'),
+            'APROVADO' if aprovado else 'FILA DE ESPERA',
+            cota or ('Ampla concorrência' if aprovado else ''),
+        )
+
+
+class _Eco:
+    """Arquivo falso para o csv.writer: devolve a linha em vez de guardar"""
+
+    def write(self, valor):
+        return valor
+
+
+def gerar_csv(evento, tamanho_bloco=TAMANHO_BLOCO_EXPORTACAO):
+    """
+    CSV da classificação, linha a linha (para StreamingHttpResponse).
+
+    Separador ';' e BOM UTF-8 para o Excel em português abrir direto.
+
+    Yields:
+        str: BOM + cabeçalho, depois uma linha por classificado
+    """
+    escritor = csv.writer(_Eco(), delimiter=';')
+
+    yield '\ufeff' + escritor.writerow(CABECALHO_EXPORTACAO)
+    for linha in linhas_exportacao(evento, tamanho_bloco):
+        yield escritor.writerow(linha)
+
+
+def xlsx_disponivel():
+    """Se a exportação XLSX pode ser usada (openpyxl instalado)"""
+    return openpyxl is not None
+
+
+def gravar_xlsx(evento, destino, tamanho_bloco=TAMANHO_BLOCO_EXPORTACAO):
+    """
+    Grava a classificação em XLSX no modo write-only do openpyxl: cada
+    linha é escrita e descartada, a memória não cresce com o evento.
+
+    O XLSX é um ZIP e só fica válido no fim, então vai para um arquivo
+    (temporário) e não direto para a resposta.
+
+    Args:
+        evento (Evento): Evento já classificado
+        destino: Caminho ou arquivo binário aberto
+        tamanho_bloco (int): Linhas buscadas do banco por vez
+
+    Raises:
+        RuntimeError: openpyxl não instalado
+    """
+    if openpyxl is None:
+        raise RuntimeError('Exportação XLSX requer o pacote openpyxl.')
+
+    planilha = openpyxl.Workbook(write_only=True)
+    aba = planilha.create_sheet('Classificação')
+    aba.append(CABECALHO_EXPORTACAO)
+    for linha in linhas_exportacao(evento, tamanho_bloco):
+        aba.append(linha)
+    planilha.save(destino)
@@ -2,17 +2,25 @@
 ARQUIVO: apps/cursoseoutros/services.py
 AÇÃO: CRIAR arquivo completo
 MUDANÇA: Serviço de classificação de candidatos com algoritmo de pontuação
+         + classificação esquece o descritor de inscrição em cache do evento
+         + calcular_score_inscricao só lê (não cria linhas de validação)
 DATA/HORA: 2025-10-29 15:15:00
 """
 
 from datetime import date
 from decimal import Decimal
-from django.db.models import Count, Q
+from django.db import transaction
 from django.utils import timezone
-from .models import (
-    Evento, Inscricao, Classificacao, InscricaoCriterioAtendido,
-    EventoCriterio, TipoCriterio
-)
+from .models import Evento, Inscricao, InscricaoCriterioAtendido
+from .coorte import Coorte
+from .desempate import ordenar_resultado
+from .incremental import TabelaScores
+from .inscricoes import esquecer_descritores
+from .persistencia import persistir_classificacao
+from .pontuacao import calcular_pontuacao_evento, para_decimal, pontos_criterio_lote
+from .pontuadores import fototipos_prioritarios_ids, obter_pontuador
+from .relatorio import CABECALHO_EXPORTACAO, linhas_exportacao, montar_relatorio
+from .travas import TravaEvento
 
 
 class ClassificadorService:
@@ -28,12 +36,13 @@ class ClassificadorService:
     """
     
     @staticmethod
-    def calcular_idade(data_nascimento):
+    def calcular_idade(data_nascimento, referencia=None):
         """
         Calcula idade a partir da data de nascimento.
         
         Args:
             data_nascimento (date): Data de nascimento
+            referencia (date): Data em que a idade é calculada (padrão: hoje)
             
         Returns:
             int: Idade em anos completos
@@ -41,7 +50,7 @@ class ClassificadorService:
         if not data_nascimento:
             return 0
         
-        hoje = date.today()
+        hoje = referencia or date.today()
         idade = hoje.year - data_nascimento.year
         
         # Ajusta se ainda não fez aniversário este ano
@@ -51,14 +60,19 @@ class ClassificadorService:
         return idade
     
     @staticmethod
-    def calcular_pontos_ordem_inscricao(inscricao, total_inscricoes):
+    def calcular_pontos_ordem_inscricao(inscricao, total_inscricoes, inscricoes_anteriores=None):
         """
         Calcula pontos por ordem de inscrição.
         Primeiro inscrito = 100 pontos, último = 0 pontos (escala linear).
         
+        Para o evento inteiro use pontuadores.PontuadorOrdemInscricao, que
+        obtém as contagens de uma única ordenação (ranking.contar_anteriores).
+        
         Args:
             inscricao (Inscricao): Inscrição sendo avaliada
             total_inscricoes (int): Total de inscrições no evento
+            inscricoes_anteriores (int): Contagem já conhecida (ex: anotada
+                com ranking.anotar_rank); se None, é consultada no banco
             
         Returns:
             Decimal: Pontos obtidos (0-100)
@@ -67,10 +81,11 @@ class ClassificadorService:
             return Decimal('100.00')
         
         # Conta quantos foram inscritos antes
-        inscricoes_anteriores = Inscricao.objects.filter(
-            evento=inscricao.evento,
-            data_inscricao__lt=inscricao.data_inscricao
-        ).count()
+        if inscricoes_anteriores is None:
+            inscricoes_anteriores = Inscricao.objects.filter(
+                evento=inscricao.evento,
+                data_inscricao__lt=inscricao.data_inscricao
+            ).count()
         
         # Calcula pontos (100 para primeiro, 0 para último)
         pontos = Decimal('100.00') - (
@@ -92,7 +107,8 @@ class ClassificadorService:
             Decimal: Pontos obtidos (0-100)
         """
         idade = ClassificadorService.calcular_idade(
-            inscricao.interessado.data_nascimento
+            inscricao.interessado.data_nascimento,
+            inscricao.evento.data_referencia_idades()
         )
         
         # Quanto menor a idade, mais pontos
@@ -112,7 +128,8 @@ class ClassificadorService:
             Decimal: Pontos obtidos (0-100)
         """
         idade = ClassificadorService.calcular_idade(
-            inscricao.interessado.data_nascimento
+            inscricao.interessado.data_nascimento,
+            inscricao.evento.data_referencia_idades()
         )
         
         # Quanto maior a idade, mais pontos (limitado a 100)
@@ -133,7 +150,8 @@ class ClassificadorService:
             Decimal: Pontos obtidos (0-100)
         """
         idade = ClassificadorService.calcular_idade(
-            inscricao.interessado.data_nascimento
+            inscricao.interessado.data_nascimento,
+            inscricao.evento.data_referencia_idades()
         )
         
         idade_min = evento_criterio.idade_minima or 0
@@ -210,22 +228,23 @@ class ClassificadorService:
         """
         interessado = inscricao.interessado
         
-        if not interessado.fototipo:
+        if not interessado.fototipo_id:
             return Decimal('0.00')
         
-        # Busca fototipos prioritários configurados
-        # Nota: Este relacionamento precisa ser implementado no model EventoCriterio
-        # Por enquanto, retorna 50 pontos (neutro) se não houver configuração
+        # Fototipos prioritários configurados (prefetch quando disponível)
+        prioritarios = fototipos_prioritarios_ids(evento_criterio)
+        
+        # Sem configuração: 50 pontos (neutro), como antes da relação existir
+        if not prioritarios:
+            return Decimal('50.00')
         
-        # TODO: Implementar relacionamento ManyToMany entre EventoCriterio e Fototipo
-        # fototipos_prioritarios = evento_criterio.fototipos_prioritarios.all()
-        # if interessado.fototipo in fototipos_prioritarios:
-        #     return Decimal('100.00')
+        if interessado.fototipo_id in prioritarios:
+            return Decimal('100.00')
         
-        return Decimal('50.00')  # Temporário até implementar relacionamento
+        return Decimal('0.00')
     
     @staticmethod
-    def calcular_pontos_customizado(inscricao, criterio):
+    def calcular_pontos_customizado(inscricao, criterio, validados=None):
         """
         Calcula pontos para critério customizado.
         Deve ser validado manualmente pelo operador via InscricaoCriterioAtendido.
@@ -233,10 +252,15 @@ class ClassificadorService:
         Args:
             inscricao (Inscricao): Inscrição sendo avaliada
             criterio (Criterio): Critério customizado
+            validados (dict): (inscricao_id, criterio_id) → pontos (Decimal)
+                já carregados; se omitido, consulta a validação desta inscrição
             
         Returns:
             Decimal: Pontos obtidos (0-100 ou valor validado manualmente)
         """
+        if validados is not None:
+            return validados.get((inscricao.id, criterio.id), Decimal('0.00'))
+        
         # Busca se há validação manual
         try:
             validacao = InscricaoCriterioAtendido.objects.get(
@@ -254,46 +278,37 @@ class ClassificadorService:
         """
         Calcula pontos para um critério específico.
         
+        O cálculo é feito pelo pontuador registrado para o tipo do critério
+        (ver pontuadores.py), o mesmo usado na classificação em lote:
+        - critérios que só dependem da própria inscrição usam uma coorte
+          de uma linha montada a partir do objeto (sem consulta extra)
+        - critérios que dependem das demais inscrições (ORDEM) usam a
+          coorte do evento
+        
         Args:
             inscricao (Inscricao): Inscrição sendo avaliada
             evento_criterio (EventoCriterio): Configuração do critério no evento
             
         Returns:
-            Decimal: Pontos obtidos (0-100)
+            Decimal: Pontos obtidos (0-100); 0 se o tipo não tiver pontuador
+                     ou se a inscrição estiver fora da classificação
         """
-        criterio = evento_criterio.criterio
-        tipo = criterio.tipo_criterio
-        
-        # Calcula pontos base (0-100) conforme tipo do critério
-        if tipo == TipoCriterio.ORDEM:
-            total_inscricoes = inscricao.evento.inscricoes.count()
-            pontos_base = cls.calcular_pontos_ordem_inscricao(inscricao, total_inscricoes)
-        
-        elif tipo == TipoCriterio.IDADE_CRESCENTE:
-            pontos_base = cls.calcular_pontos_idade_crescente(inscricao)
-        
-        elif tipo == TipoCriterio.IDADE_DECRESCENTE:
-            pontos_base = cls.calcular_pontos_idade_decrescente(inscricao)
-        
-        elif tipo == TipoCriterio.FAIXA_ETARIA:
-            pontos_base = cls.calcular_pontos_faixa_etaria(inscricao, evento_criterio)
-        
-        elif tipo == TipoCriterio.NIS:
-            pontos_base = cls.calcular_pontos_programa_social(inscricao)
-        
-        elif tipo == TipoCriterio.PCD:
-            pontos_base = cls.calcular_pontos_necessidade_especial(inscricao)
-        
-        elif tipo == TipoCriterio.FOTOTIPO:
-            pontos_base = cls.calcular_pontos_fototipo(inscricao, evento_criterio)
-        
-        elif tipo == TipoCriterio.CUSTOMIZADO:
-            pontos_base = cls.calcular_pontos_customizado(inscricao, criterio)
+        pontuador = obter_pontuador(evento_criterio.criterio.tipo_criterio)
+        if pontuador is None:
+            return Decimal('0.00')
         
+        evento = inscricao.evento
+        if pontuador.dependente_da_coorte:
+            coorte = Coorte.carregar(evento, colunas=pontuador.colunas)
+            if inscricao.id not in coorte.inscricao_ids:
+                return Decimal('0.00')
+            indice = coorte.indice(inscricao.id)
         else:
-            pontos_base = Decimal('0.00')
+            coorte = Coorte.de_inscricoes(evento, [inscricao], pontuador.colunas)
+            indice = 0
         
-        return pontos_base
+        pontos = pontos_criterio_lote(coorte, evento_criterio, evento.data_referencia_idades())
+        return para_decimal(pontos[indice])
     
     @classmethod
     def calcular_score_inscricao(cls, inscricao):
@@ -302,6 +317,9 @@ class ClassificadorService:
         
         Score = Σ (pontos_base × peso_criterio / 10)
         
+        Só lê: as linhas de validação dos critérios customizados são
+        criadas na gravação da classificação (persistencia.py).
+        
         Args:
             inscricao (Inscricao): Inscrição a ser avaliada
             
@@ -312,9 +330,9 @@ class ClassificadorService:
         score_total = Decimal('0.00')
         
         # Busca critérios do evento ordenados
-        evento_criterios = evento.evento_criterios.select_related('criterio').filter(
-            criterio__ativo=True
-        ).order_by('ordem')
+        evento_criterios = evento.evento_criterios.select_related('criterio').prefetch_related(
+            'fototipos_prioritarios'
+        ).filter(criterio__ativo=True).order_by('ordem')
         
         for evento_criterio in evento_criterios:
             # Calcula pontos base do critério (0-100)
@@ -325,174 +343,120 @@ class ClassificadorService:
             pontos_ponderados = (pontos_base * Decimal(evento_criterio.peso)) / Decimal('10.00')
             
             score_total += pontos_ponderados
-            
-            # Registra/atualiza critério atendido
-            InscricaoCriterioAtendido.objects.update_or_create(
-                inscricao=inscricao,
-                criterio=evento_criterio.criterio,
-                defaults={
-                    'pontos_obtidos': pontos_ponderados,
-                    # Critérios não customizados são automaticamente validados
-                    'validado': evento_criterio.criterio.tipo_criterio != TipoCriterio.CUSTOMIZADO
-                }
-            )
         
         return round(score_total, 2)
     
     @classmethod
-    def classificar_evento(cls, evento):
+    def classificar_evento(cls, evento, progresso=None, espera=None, reaproveitar=False):
         """
         Classifica todas as inscrições de um evento.
         
         Processo:
-        1. Calcula score de cada inscrição
-        2. Ordena por score (maior primeiro)
-        3. Desempate por data de inscrição (mais antigo primeiro)
+        1. Calcula score de todas as inscrições em lote (ver pontuacao.py)
+        2. Ordena por score (maior primeiro), em memória
+        3. Desempate pelas chaves do evento (padrão: data de inscrição,
+           mais antiga primeiro; ver desempate.py)
         4. Atribui posição sequencial
-        5. Atualiza status (APROVADO ou FILA_ESPERA)
+        5. Distribui as vagas entre ampla concorrência e cotas (ver cotas.py)
+           e atualiza status (APROVADO ou FILA_ESPERA)
+        6. Grava tudo em lote numa transação (ver persistencia.py)
+        
+        Tudo roda com a trava do evento (ver travas.py): duas classificações
+        do mesmo evento nunca rodam em paralelo. Se outra execução estiver
+        classificando, espera até `espera` segundos.
         
         Args:
             evento (Evento): Evento a ser classificado
+            progresso (callable): Chamado a cada etapa com (percentual,
+                mensagem); pode levantar exceção para interromper antes
+                da gravação (ex: tarefa cancelada)
+            espera (float): Segundos esperando outra classificação do mesmo
+                evento (padrão: settings.CLASSIFICACAO_ESPERA_TRAVA)
+            reaproveitar (bool): Se teve de esperar e a outra execução gravou
+                uma classificação nesse meio tempo, devolve essa em vez de
+                classificar de novo
             
         Returns:
             QuerySet: Inscrições classificadas ordenadas
+            
+        Raises:
+            ClassificacaoEmAndamento: Espera esgotada
         """
-        # Busca todas as inscrições do evento
-        inscricoes = evento.inscricoes.select_related('interessado').all()
-        
-        # Calcula score de cada inscrição
-        for inscricao in inscricoes:
-            score = cls.calcular_score_inscricao(inscricao)
+        progresso = progresso or (lambda percentual, mensagem: None)
+        versao_antes = Evento.objects.filter(pk=evento.pk).values_list(
+            'versao_classificacao', flat=True
+        ).first()
+        
+        with TravaEvento(evento.pk, espera=espera) as trava:
+            if reaproveitar and trava.esperou:
+                versao_agora = Evento.objects.filter(pk=evento.pk).values_list(
+                    'versao_classificacao', flat=True
+                ).first()
+                if versao_agora != versao_antes:
+                    return cls._inscricoes_classificadas(evento)
             
-            # Cria ou atualiza classificação
-            Classificacao.objects.update_or_create(
-                inscricao=inscricao,
-                defaults={
-                    'score_total': score,
-                    'data_classificacao': timezone.now()
-                }
-            )
-        
-        # Ordena por score (maior primeiro), desempate por data (mais antigo primeiro)
-        inscricoes_classificadas = inscricoes.order_by(
-            '-classificacao__score_total',
-            'data_inscricao'
-        )
-        
-        # Atribui posição e atualiza status
-        for posicao, inscricao in enumerate(inscricoes_classificadas, start=1):
-            classificacao = inscricao.classificacao
-            classificacao.posicao = posicao
-            classificacao.save()
+            # Inscrições a partir daqui são marcadas para a reclassificação
+            # incremental (DescritorEvento.classificado), no início e no fim
+            esquecer_descritores([evento.pk])
+            
+            # Calcula score de todas as inscrições em lote
+            progresso(0, 'Calculando pontuação')
+            resultado = calcular_pontuacao_evento(evento)
             
-            # Atualiza status da inscrição
-            if posicao <= evento.vagas:
-                inscricao.status = 'APROVADO'
-            else:
-                inscricao.status = 'FILA_ESPERA'
+            # Ordena em memória por score (maior primeiro) e chaves de desempate do evento
+            progresso(40, 'Ordenando')
+            ordem = ordenar_resultado(resultado, evento.chaves_desempate())
             
-            inscricao.save()
+            # Distribui as vagas e grava pontos, posições, cotas e status em lote
+            progresso(50, 'Gravando classificação')
+            trava.renovar()
+            agora = timezone.now()
+            situacoes = persistir_classificacao(evento, resultado, ordem, agora=agora)
+            
+            # Guarda a tabela de scores para as reclassificações incrementais
+            TabelaScores.montar(resultado, situacoes, agora).salvar()
+            transaction.on_commit(lambda: esquecer_descritores([evento.pk]))
         
-        return inscricoes_classificadas
+        return cls._inscricoes_classificadas(evento)
+    
+    @staticmethod
+    def _inscricoes_classificadas(evento):
+        """Inscrições do evento na ordem da classificação gravada"""
+        return evento.inscricoes.select_related(
+            'interessado', 'classificacao', 'classificacao__cota__criterio'
+        ).order_by('classificacao__posicao')
     
     @classmethod
     def gerar_relatorio_classificacao(cls, evento):
         """
         Gera relatório completo da classificação de um evento.
         
+        Somente leitura: usa a classificação já gravada, com um número fixo
+        de consultas (ver relatorio.py). Para atualizar a classificação antes,
+        chame classificar_evento() explicitamente.
+        
         Args:
-            evento (Evento): Evento a ser classificado
+            evento (Evento): Evento já classificado
             
         Returns:
             dict: Relatório com informações detalhadas
         """
-        # Executa classificação
-        inscricoes_classificadas = cls.classificar_evento(evento)
-        
-        # Monta relatório
-        relatorio = {
-            'evento': {
-                'id': evento.id,
-                'nome': evento.descricao,
-                'status': evento.status.status,
-                'modalidade': evento.get_modalidade_display(),
-            },
-            'vagas': {
-                'total': evento.vagas,
-                'minimas': evento.vagas_minimas,
-                'disponiveis': evento.vagas_disponiveis(),
-            },
-            'inscricoes': {
-                'total': inscricoes_classificadas.count(),
-                'aprovados': inscricoes_classificadas.filter(
-                    classificacao__posicao__lte=evento.vagas
-                ).count(),
-                'fila_espera': inscricoes_classificadas.filter(
-                    classificacao__posicao__gt=evento.vagas
-                ).count(),
-            },
-            'criterios': [],
-            'classificados': []
-        }
-        
-        # Informações dos critérios aplicados
-        for evento_criterio in evento.evento_criterios.select_related('criterio').all():
-            relatorio['criterios'].append({
-                'nome': evento_criterio.criterio.descricao_criterio,
-                'tipo': evento_criterio.criterio.get_tipo_criterio_display(),
-                'peso': evento_criterio.peso,
-                'ordem': evento_criterio.ordem,
-                'tipo_reserva': evento_criterio.get_tipo_reserva_display(),
-                'vagas_reservadas': evento_criterio.vagas_reservadas,
-            })
-        
-        # Lista detalhada de classificados
-        for inscricao in inscricoes_classificadas:
-            classificacao = inscricao.classificacao
-            
-            # Detalhamento dos critérios atendidos
-            criterios_atendidos = []
-            for criterio_atendido in inscricao.criterios_atendidos.select_related('criterio').all():
-                criterios_atendidos.append({
-                    'criterio': criterio_atendido.criterio.descricao_criterio,
-                    'pontos': float(criterio_atendido.pontos_obtidos),
-                    'validado': criterio_atendido.validado,
-                })
-            
-            relatorio['classificados'].append({
-                'posicao': classificacao.posicao,
-                'nome': inscricao.interessado.nome,
-                'cpf': inscricao.interessado.cpf,
-                'score_total': float(classificacao.score_total),
-                'data_inscricao': inscricao.data_inscricao.strftime('%d/%m/%Y %H:%M'),
-                'situacao': 'APROVADO' if classificacao.posicao <= evento.vagas else 'FILA DE ESPERA',
-                'criterios_atendidos': criterios_atendidos,
-            })
-        
-        return relatorio
+        return montar_relatorio(evento)
     
     @classmethod
     def exportar_classificacao_csv(cls, evento):
         """
         Gera dados de classificação no formato para exportação CSV.
         
+        As linhas são lidas do banco em blocos e entregues uma a uma (não
+        monta o relatório inteiro). Para a resposta HTTP use
+        relatorio.gerar_csv(), que já gera o texto do CSV.
+        
         Args:
-            evento (Evento): Evento a ser exportado
+            evento (Evento): Evento já classificado
             
-        Returns:
-            list: Lista de dicionários com dados para CSV
+        Yields:
+            dict: Uma linha por classificado, chaves = CABECALHO_EXPORTACAO
         """
-        relatorio = cls.gerar_relatorio_classificacao(evento)
-        
-        dados_csv = []
-        for classificado in relatorio['classificados']:
-            dados_csv.append({
-                'Posição': classificado['posicao'],
-                'Nome': classificado['nome'],
-                'CPF': classificado['cpf'],
-                'Score': classificado['score_total'],
-                'Data Inscrição': classificado['data_inscricao'],
-                'Situação': classificado['situacao'],
-            })
-        
-        return dados_csv
\ No newline at end of file
+        for linha in linhas_exportacao(evento):
+            yield dict(zip(CABECALHO_EXPORTACAO, linha))
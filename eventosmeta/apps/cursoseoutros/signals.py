@@ -0,0 +1,190 @@
+"""
+ARQUIVO: apps/cursoseoutros/signals.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Marca mudanças que afetam a classificação para reclassificação incremental
+         + esquece o descritor de inscrição em cache do evento alterado
+         + libera a vaga da matrícula confirmada excluída
+         + status de inscrição alterado invalida o instantâneo da classificação
+         + inscrição nova em evento não classificado não é marcada
+         + nome/CPF alterado invalida o instantâneo da classificação
+DATA/HORA: 2026-10-17 01:16:24
+"""
+
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from apps.interessados.models import Interessado
+from .coorte import STATUS_FORA_DA_CLASSIFICACAO
+from .incremental import agendar, marcar
+from .inscricoes import esquecer_descritores, marcar_inscricao_nova
+from .models import (
+    Evento, EventoCriterio, Inscricao, InscricaoCriterioAtendido, Matricula, Status,
+    StatusMatricula, TipoCriterio, Turma
+)
+from .persistencia import incrementar_versao_classificacao
+
+
+def _modo_incremental():
+    """Liga/desliga a reclassificação incremental (settings.CLASSIFICACAO_INCREMENTAL)"""
+    return getattr(settings, 'CLASSIFICACAO_INCREMENTAL', False)
+
+
+@receiver(post_save, sender=Inscricao)
+def inscricao_salva(sender, instance, created, raw=False, **kwargs):
+    """
+    Inscrição nova entra na classificação; desistente/não compareceu sai.
+
+    Status alterado fora da classificação (ex: matriculado pelo admin)
+    incrementa a versão da classificação, senão o instantâneo em cache
+    (relatorio.py) continuaria mostrando o status antigo.
+    """
+    if raw:
+        return
+
+    status_gravado = getattr(instance, '_status_gravado', None)
+    if status_gravado is not None and status_gravado != instance.status:
+        incrementar_versao_classificacao(instance.evento_id)
+
+    if not _modo_incremental():
+        return
+
+    if created:
+        # Caminho da inscrição pública: sem consultas se o evento não foi classificado
+        if (
+            instance.status not in STATUS_FORA_DA_CLASSIFICACAO
+            and marcar_inscricao_nova(instance.id, instance.evento_id)
+        ):
+            agendar()
+        return
+
+    reclassificador = marcar(instance.evento_id)
+    if instance.status in STATUS_FORA_DA_CLASSIFICACAO:
+        reclassificador.inscricao_removida(instance.id)
+    else:
+        reclassificador.inscricao_adicionada(instance.id)
+    agendar()
+
+
+# Dados do interessado gravados no instantâneo da classificação (relatorio.py)
+CAMPOS_INSTANTANEO_INTERESSADO = ('nome', 'cpf')
+
+
+@receiver(pre_save, sender=Interessado)
+def interessado_antes_de_salvar(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Guarda nome/CPF gravados para interessado_salvo comparar"""
+    instance._dados_gravados = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not set(update_fields) & set(CAMPOS_INSTANTANEO_INTERESSADO):
+        return  # ex: last_login no login
+
+    instance._dados_gravados = Interessado.objects.filter(
+        pk=instance.pk
+    ).values_list(*CAMPOS_INSTANTANEO_INTERESSADO).first()
+
+
+@receiver(post_save, sender=Interessado)
+def interessado_salvo(sender, instance, created, raw=False, **kwargs):
+    """
+    Nome ou CPF alterado incrementa a versão da classificação dos eventos
+    em que o interessado se inscreveu: o instantâneo em cache (relatorio.py)
+    guarda esses dados em cada linha.
+    """
+    gravados = getattr(instance, '_dados_gravados', None)
+    if raw or created or gravados is None:
+        return
+
+    atuais = tuple(getattr(instance, campo) for campo in CAMPOS_INSTANTANEO_INTERESSADO)
+    if atuais == gravados:
+        return
+
+    for evento_id in instance.inscricoes.values_list('evento_id', flat=True):
+        incrementar_versao_classificacao(evento_id)
+
+
+@receiver(post_delete, sender=Inscricao)
+def inscricao_excluida(sender, instance, **kwargs):
+    if not _modo_incremental():
+        return
+
+    marcar(instance.evento_id).inscricao_removida(instance.id)
+    agendar()
+
+
+@receiver(post_save, sender=InscricaoCriterioAtendido)
+@receiver(post_delete, sender=InscricaoCriterioAtendido)
+def criterio_atendido_alterado(sender, instance, raw=False, **kwargs):
+    """Validação (ou revogação) manual de critério customizado"""
+    if raw or not _modo_incremental():
+        return
+
+    if instance.criterio.tipo_criterio != TipoCriterio.CUSTOMIZADO:
+        return
+
+    evento_id = Inscricao.objects.filter(
+        pk=instance.inscricao_id
+    ).values_list('evento_id', flat=True).first()
+    if evento_id is None:
+        return
+
+    marcar(evento_id).criterio_validado(instance.inscricao_id, instance.criterio_id)
+    agendar()
+
+
+@receiver(post_save, sender=EventoCriterio)
+@receiver(post_delete, sender=EventoCriterio)
+def evento_criterio_alterado(sender, instance, raw=False, **kwargs):
+    """Peso ou configuração de um critério do evento mudou"""
+    if raw or not _modo_incremental():
+        return
+
+    marcar(instance.evento_id).criterio_alterado(instance.id)
+    agendar()
+
+
+@receiver(m2m_changed, sender=EventoCriterio.fototipos_prioritarios.through)
+def fototipos_prioritarios_alterados(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Lista de fototipos prioritários de um critério do evento mudou.
+    O clear é marcado antes de acontecer, enquanto as ligações ainda existem
+    (a reclassificação só roda depois do commit).
+    """
+    if action not in ('post_add', 'post_remove', 'pre_clear') or not _modo_incremental():
+        return
+
+    if not reverse:
+        evento_criterios = [(instance.id, instance.evento_id)]
+    elif action == 'pre_clear':
+        # instance é o Fototipo
+        evento_criterios = instance.evento_criterios.values_list('id', 'evento_id')
+    else:
+        evento_criterios = EventoCriterio.objects.filter(
+            pk__in=pk_set
+        ).values_list('id', 'evento_id')
+
+    for evento_criterio_id, evento_id in evento_criterios:
+        marcar(evento_id).criterio_alterado(evento_criterio_id)
+    agendar()
+
+
+@receiver(post_save, sender=Evento)
+@receiver(post_delete, sender=Evento)
+def evento_alterado(sender, instance, **kwargs):
+    """Status ou período de inscrições pode ter mudado: esquece o descritor"""
+    esquecer_descritores([instance.id])
+
+
+@receiver(post_save, sender=Status)
+def status_alterado(sender, instance, **kwargs):
+    """Status passou a permitir (ou não) inscrições: esquece os descritores dos eventos"""
+    esquecer_descritores(instance.eventos.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Matricula)
+def matricula_excluida(sender, instance, **kwargs):
+    """
+    Matrícula confirmada excluída (inclusive em cascata) libera a vaga.
+    Roda dentro da transação da exclusão.
+    """
+    if instance.status == StatusMatricula.CONFIRMADA:
+        Turma.liberar_vaga(instance.turma_id)
@@ -0,0 +1,230 @@
+"""
+ARQUIVO: apps/cursoseoutros/simulacao.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Simulação da classificação (e se...?) em memória, sem gravar nada
+DATA/HORA: 2026-10-17 01:35:47
+"""
+
+import copy
+from django.core.cache import cache
+from .coorte import STATUS_COM_VAGA
+from .desempate import colunas_desempate, ordenar_resultado
+from .incremental import TabelaScores
+from .models import Classificacao
+from .persistencia import situacao_classificacao
+from .pontuacao import (
+    ResultadoPontuacao, arredondar_score, calcular_pontuacao_evento,
+    colunas_necessarias, mesma_base, ponderar, pontos_criterio_lote
+)
+
+
+CHAVE_INSTANTANEO = 'classificacao:simulacao:{evento_id}'
+TEMPO_CACHE_INSTANTANEO = 60 * 5  # 5 minutos
+
+# Campos de EventoCriterio que podem ser alterados numa simulação.
+# 'ativo' = False tira o critério da simulação.
+CAMPOS_SIMULAVEIS = (
+    'peso', 'ordem', 'idade_minima', 'idade_maxima',
+    'tipo_reserva', 'vagas_reservadas', 'ativo',
+)
+
+
+class ResultadoSimulacao:
+    """
+    Classificação simulada comparada com a classificação atual.
+
+    Attributes:
+        evento (Evento): Evento simulado (com as vagas simuladas)
+        resultado (ResultadoPontuacao): Pontos e scores simulados
+        situacoes (dict): inscricao_id → (posição, status, cota) simulados
+        atuais (dict): inscricao_id → (posição, status, cota) atuais
+        entram (list): Inscrições que passam a ficar dentro das vagas
+                       (pela posição simulada)
+        saem (list): Inscrições que deixam de ficar dentro das vagas
+                     (pela posição atual)
+    """
+
+    def __init__(self, evento, resultado, situacoes, atuais):
+        self.evento = evento
+        self.resultado = resultado
+        self.situacoes = situacoes
+        self.atuais = atuais
+
+        aprovados = self._aprovados(situacoes)
+        aprovados_atuais = self._aprovados(atuais)
+
+        self.entram = sorted(
+            aprovados - aprovados_atuais,
+            key=lambda inscricao_id: situacoes[inscricao_id][0]
+        )
+        self.saem = sorted(
+            aprovados_atuais - aprovados,
+            key=lambda inscricao_id: atuais[inscricao_id][0]
+        )
+
+    @staticmethod
+    def _aprovados(situacoes):
+        return {
+            inscricao_id for inscricao_id, situacao in situacoes.items()
+            if situacao[1] in STATUS_COM_VAGA
+        }
+
+    def score(self, inscricao_id):
+        """Score simulado (centésimos) da inscrição"""
+        return self.resultado.scores[self.resultado.coorte.indice(inscricao_id)]
+
+    def variacao(self, inscricao_id):
+        """
+        Posições ganhas (positivo) ou perdidas (negativo) na simulação.
+        None se a inscrição não tinha posição ou não está na simulação.
+        """
+        atual = self.atuais.get(inscricao_id)
+        simulada = self.situacoes.get(inscricao_id)
+        if atual is None or simulada is None or atual[0] is None:
+            return None
+        return atual[0] - simulada[0]
+
+
+def obter_instantaneo(evento):
+    """
+    Coorte e colunas de pontos do evento, sem recalcular se possível.
+
+    Usa a tabela da reclassificação incremental (já com a classificação
+    gravada) ou um instantâneo próprio da simulação guardado no cache por
+    alguns minutos.
+
+    Returns:
+        tuple: (ResultadoPontuacao, situações atuais ou None)
+    """
+    tabela = TabelaScores.obter(evento)
+    if tabela is not None:
+        atuais = {
+            inscricao_id: gravado[1:]
+            for inscricao_id, gravado in tabela.gravados.items()
+        }
+        return tabela.resultado, atuais
+
+    chave = CHAVE_INSTANTANEO.format(evento_id=evento.id)
+    resultado = cache.get(chave)
+    if resultado is None or resultado.referencia != evento.data_referencia_idades():
+        resultado = calcular_pontuacao_evento(evento)
+        cache.set(chave, resultado, TEMPO_CACHE_INSTANTANEO)
+
+    atuais = {
+        inscricao_id: (posicao, status, cota_id)
+        for inscricao_id, posicao, status, cota_id in Classificacao.objects.filter(
+            inscricao__evento=evento,
+            posicao__isnull=False
+        ).values_list('inscricao_id', 'posicao', 'inscricao__status', 'cota_id')
+    }
+
+    return resultado, atuais or None
+
+
+def simular_classificacao(evento, alteracoes=None, vagas=None):
+    """
+    Calcula a classificação com critérios alterados, sem gravar nada.
+
+    Parte da configuração atual dos critérios do evento, aplica as
+    alterações e reaproveita as colunas de pontos base do instantâneo
+    sempre que a alteração não muda o cálculo (peso, ordem, reserva).
+    Só as colunas com faixa etária alterada são recalculadas, em memória.
+
+    Args:
+        evento (Evento): Evento a simular
+        alteracoes (dict): EventoCriterio.id → {campo: valor}, com campos
+            de CAMPOS_SIMULAVEIS. Ex: {12: {'peso': 8}, 13: {'ativo': False}}
+        vagas (int): Total de vagas simulado (padrão: o do evento)
+
+    Returns:
+        ResultadoSimulacao: Classificação simulada e diferença para a atual
+            (se o evento nunca foi classificado, a comparação é com a
+            classificação sem alterações)
+
+    Raises:
+        ValueError: Campo não simulável nas alterações
+    """
+    alteracoes = alteracoes or {}
+    for mudancas in alteracoes.values():
+        invalidos = set(mudancas) - set(CAMPOS_SIMULAVEIS)
+        if invalidos:
+            raise ValueError(f'Campos não simuláveis: {", ".join(sorted(invalidos))}')
+
+    evento_criterios = list(
+        evento.evento_criterios.select_related('criterio').prefetch_related(
+            'fototipos_prioritarios'
+        ).filter(criterio__ativo=True)
+    )
+
+    instantaneo, atuais = obter_instantaneo(evento)
+
+    # Critério trocado por um que usa colunas não carregadas: recalcula tudo
+    necessarias = set(colunas_necessarias(evento_criterios))
+    necessarias |= set(colunas_desempate(evento.chaves_desempate()))
+    if not necessarias <= set(instantaneo.coorte.campos):
+        instantaneo = calcular_pontuacao_evento(evento)
+        cache.set(CHAVE_INSTANTANEO.format(evento_id=evento.id), instantaneo, TEMPO_CACHE_INSTANTANEO)
+
+    simulado = copy.copy(evento)
+    if vagas is not None:
+        simulado.vagas = vagas
+
+    resultado, situacoes = _classificar_em_memoria(
+        simulado, instantaneo, evento_criterios, alteracoes
+    )
+
+    if atuais is None:
+        _, atuais = _classificar_em_memoria(evento, instantaneo, evento_criterios, {})
+
+    return ResultadoSimulacao(simulado, resultado, situacoes, atuais)
+
+
+def _classificar_em_memoria(evento, instantaneo, evento_criterios, alteracoes):
+    """
+    Pontua, ordena e distribui as vagas a partir do instantâneo.
+
+    Returns:
+        tuple: (ResultadoPontuacao, situações por inscrição)
+    """
+    coorte = instantaneo.coorte
+    colunas = {
+        evento_criterio.id: (evento_criterio, instantaneo.pontos_base[evento_criterio.id])
+        for evento_criterio in instantaneo.evento_criterios
+    }
+
+    aplicados = []
+    pontos_base = {}
+    pontos = {}
+    totais = [0] * len(coorte)
+
+    for evento_criterio in evento_criterios:
+        mudancas = alteracoes.get(evento_criterio.id, {})
+        if mudancas.get('ativo', True) is False:
+            continue
+
+        evento_criterio = copy.copy(evento_criterio)
+        for campo, valor in mudancas.items():
+            if campo != 'ativo':
+                setattr(evento_criterio, campo, valor)
+
+        em_cache = colunas.get(evento_criterio.id)
+        if em_cache is not None and mesma_base(em_cache[0], evento_criterio):
+            base = em_cache[1]
+        else:
+            base = pontos_criterio_lote(coorte, evento_criterio, instantaneo.referencia)
+
+        ponderados = ponderar(base, evento_criterio.peso)
+        aplicados.append(evento_criterio)
+        pontos_base[evento_criterio.id] = base
+        pontos[evento_criterio.id] = ponderados
+        totais = [total + ponderado for total, ponderado in zip(totais, ponderados)]
+
+    aplicados.sort(key=lambda evento_criterio: evento_criterio.ordem)
+    resultado = ResultadoPontuacao(
+        coorte, aplicados, pontos_base, pontos,
+        [arredondar_score(total) for total in totais],
+        instantaneo.referencia
+    )
+
+    ordem = ordenar_resultado(resultado, evento.chaves_desempate())
+    return resultado, situacao_classificacao(evento, resultado, ordem)
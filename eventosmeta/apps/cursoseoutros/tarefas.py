@@ -0,0 +1,305 @@
+"""
+ARQUIVO: apps/cursoseoutros/tarefas.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Fila de tarefas em segundo plano no banco (classificação, exportação)
+         + uma classificação pendente por evento, executada depois da atual
+         + sinal de vida durante a execução (liberar_travadas não pega tarefa viva)
+DATA/HORA: 2026-10-17 01:52:35
+"""
+
+import os
+import socket
+import tempfile
+import threading
+import traceback
+from datetime import timedelta
+from django.core.files import File
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from .models import StatusTarefa, Tarefa, TipoTarefa
+from .relatorio import gerar_csv, gravar_xlsx
+from .services import ClassificadorService
+
+
+# Linhas exportadas entre duas atualizações de progresso
+INTERVALO_PROGRESSO_EXPORTACAO = 5000
+
+# Segundos entre dois sinais de vida de uma tarefa em execução
+INTERVALO_SINAL_DE_VIDA = 30
+
+
+class TarefaCancelada(Exception):
+    """Cancelamento pedido enquanto a tarefa executava"""
+
+
+# ============================================
+# FILA
+# ============================================
+
+def enfileirar_tarefa(evento, tipo, usuario=None):
+    """
+    Coloca uma tarefa na fila.
+
+    Classificação: uma só pendente por evento, garantida pela constraint
+    uma_classificacao_pendente_por_evento. Se já houver uma, ela é
+    devolvida em vez de criar outra. Com uma em execução, a nova espera
+    ela terminar (reservar_proxima) e classifica de novo com o que mudou
+    nesse meio tempo.
+
+    Args:
+        evento (Evento): Evento da tarefa
+        tipo (str): TipoTarefa
+        usuario (Usuario): Quem pediu
+
+    Returns:
+        tuple: (Tarefa, criada)
+    """
+    if tipo == TipoTarefa.CLASSIFICAR:
+        existente = Tarefa.objects.filter(
+            evento=evento, tipo=tipo, status=StatusTarefa.PENDENTE
+        ).first()
+        if existente is not None:
+            return existente, False
+
+    try:
+        with transaction.atomic():
+            return Tarefa.objects.create(evento=evento, tipo=tipo, solicitado_por=usuario), True
+    except IntegrityError:
+        # Outra requisição enfileirou a mesma classificação ao mesmo tempo
+        return Tarefa.objects.get(evento=evento, tipo=tipo, status=StatusTarefa.PENDENTE), False
+
+
+def identificar_executor():
+    """Nome do processo executor (máquina:pid)"""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def reservar_proxima(executor):
+    """
+    Reserva a tarefa pendente mais antiga para este executor.
+
+    A reserva é um UPDATE condicional (status ainda PENDENTE): se dois
+    executores escolherem a mesma tarefa, só um consegue. Funciona em
+    qualquer banco, sem SELECT FOR UPDATE.
+
+    Classificação de evento que já está sendo classificado fica na fila
+    até a outra terminar.
+
+    Args:
+        executor (str): Ver identificar_executor()
+
+    Returns:
+        Tarefa ou None (fila vazia)
+    """
+    classificando = Tarefa.objects.filter(
+        evento_id=OuterRef('evento_id'),
+        tipo=TipoTarefa.CLASSIFICAR,
+        status=StatusTarefa.EXECUTANDO
+    )
+
+    while True:
+        tarefa_id = Tarefa.objects.filter(
+            status=StatusTarefa.PENDENTE
+        ).exclude(
+            Q(tipo=TipoTarefa.CLASSIFICAR) & Exists(classificando)
+        ).order_by('criado_em', 'pk').values_list('pk', flat=True).first()
+        if tarefa_id is None:
+            return None
+
+        agora = timezone.now()
+        reservada = Tarefa.objects.filter(
+            pk=tarefa_id, status=StatusTarefa.PENDENTE
+        ).update(
+            status=StatusTarefa.EXECUTANDO,
+            iniciado_em=agora,
+            sinal_de_vida_em=agora,
+            executor=executor,
+            progresso=0,
+        )
+        if reservada:
+            return Tarefa.objects.select_related('evento').get(pk=tarefa_id)
+
+
+def cancelar_tarefa(tarefa):
+    """
+    Cancela uma tarefa: pendente é cancelada na hora; em execução recebe
+    o pedido e para na próxima etapa (a gravação da classificação, já
+    iniciada, vai até o fim).
+
+    Returns:
+        bool: Se a tarefa estava ativa
+    """
+    canceladas = Tarefa.objects.filter(
+        pk=tarefa.pk, status=StatusTarefa.PENDENTE
+    ).update(
+        status=StatusTarefa.CANCELADA,
+        mensagem='Cancelada antes de iniciar',
+        concluido_em=timezone.now(),
+    )
+    if canceladas:
+        return True
+
+    return bool(Tarefa.objects.filter(
+        pk=tarefa.pk, status=StatusTarefa.EXECUTANDO
+    ).update(cancelamento_solicitado=True))
+
+
+def liberar_travadas(minutos):
+    """
+    Marca como erro as tarefas em execução sem sinal de vida há mais de
+    `minutos` (executor que parou no meio: queda, deploy, falta de
+    memória). Tarefa demorada com o executor vivo não é liberada: o
+    executor renova o sinal enquanto ela roda (ver SinalDeVida).
+
+    Returns:
+        int: Tarefas liberadas
+    """
+    limite = timezone.now() - timedelta(minutes=minutos)
+    return Tarefa.objects.filter(
+        Q(sinal_de_vida_em__lt=limite)
+        | Q(sinal_de_vida_em__isnull=True, iniciado_em__lt=limite),
+        status=StatusTarefa.EXECUTANDO
+    ).update(
+        status=StatusTarefa.ERRO,
+        erro=f'Sem sinal de vida do executor há {minutos} minutos (executor interrompido?)',
+        concluido_em=timezone.now(),
+    )
+
+
+# ============================================
+# EXECUÇÃO
+# ============================================
+
+class SinalDeVida:
+    """
+    Mantém a tarefa viva enquanto executa (context manager): uma thread
+    grava sinal_de_vida_em a cada `intervalo` segundos, inclusive durante
+    uma etapa longa sem progresso (ex: gerar a planilha).
+
+    Args:
+        tarefa (Tarefa): Tarefa em execução
+        intervalo (float): Segundos entre dois sinais
+    """
+
+    def __init__(self, tarefa, intervalo=INTERVALO_SINAL_DE_VIDA):
+        self.tarefa = tarefa
+        self.intervalo = intervalo
+        self._parar = threading.Event()
+        self._thread = threading.Thread(
+            target=self._renovar, name=f'sinal-de-vida-{tarefa.pk}', daemon=True
+        )
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, tipo, valor, rastro):
+        self._parar.set()
+        self._thread.join()
+        return False
+
+    def _renovar(self):
+        try:
+            while not self._parar.wait(self.intervalo):
+                Tarefa.objects.filter(
+                    pk=self.tarefa.pk, status=StatusTarefa.EXECUTANDO
+                ).update(sinal_de_vida_em=timezone.now())
+        finally:
+            # Conexão própria da thread
+            connection.close()
+
+
+class Acompanhamento:
+    """
+    Callback de progresso das tarefas: grava percentual e mensagem e
+    levanta TarefaCancelada se o cancelamento foi pedido.
+    """
+
+    def __init__(self, tarefa):
+        self.tarefa = tarefa
+
+    def __call__(self, percentual, mensagem):
+        Tarefa.objects.filter(pk=self.tarefa.pk).update(
+            progresso=percentual, mensagem=mensagem[:200]
+        )
+        if Tarefa.objects.filter(pk=self.tarefa.pk, cancelamento_solicitado=True).exists():
+            raise TarefaCancelada()
+
+
+def _classificar(tarefa, acompanhar):
+    ClassificadorService.classificar_evento(tarefa.evento, progresso=acompanhar)
+    return 'Classificação gravada'
+
+
+def _exportar_csv(tarefa, acompanhar):
+    evento = tarefa.evento
+    total = evento.inscricoes.filter(classificacao__posicao__isnull=False).count()
+
+    acompanhar(0, f'Exportando {total} linha(s)')
+    with tempfile.TemporaryFile() as arquivo:
+        # A primeira linha gerada é o cabeçalho
+        for numero, linha in enumerate(gerar_csv(evento)):
+            arquivo.write(linha.encode('utf-8'))
+            if numero and numero % INTERVALO_PROGRESSO_EXPORTACAO == 0:
+                acompanhar(min(99, numero * 100 // total), f'{numero} de {total} linha(s)')
+
+        arquivo.seek(0)
+        tarefa.arquivo.save(f'classificacao_evento_{evento.pk}.csv', File(arquivo), save=False)
+
+    return f'{total} linha(s) exportada(s)'
+
+
+def _exportar_xlsx(tarefa, acompanhar):
+    evento = tarefa.evento
+
+    acompanhar(0, 'Gerando planilha')
+    with tempfile.TemporaryFile() as arquivo:
+        gravar_xlsx(evento, arquivo)
+        arquivo.seek(0)
+        tarefa.arquivo.save(f'classificacao_evento_{evento.pk}.xlsx', File(arquivo), save=False)
+
+    return 'Planilha gerada'
+
+
+EXECUTORES = {
+    TipoTarefa.CLASSIFICAR: _classificar,
+    TipoTarefa.EXPORTAR_CSV: _exportar_csv,
+    TipoTarefa.EXPORTAR_XLSX: _exportar_xlsx,
+}
+
+
+def executar_tarefa(tarefa):
+    """
+    Executa uma tarefa já reservada e grava o desfecho (concluída, erro
+    ou cancelada). Nunca levanta exceção: o erro fica na própria tarefa.
+
+    Args:
+        tarefa (Tarefa): Tarefa com status EXECUTANDO
+
+    Returns:
+        str: StatusTarefa final
+    """
+    try:
+        with SinalDeVida(tarefa):
+            mensagem = EXECUTORES[tarefa.tipo](tarefa, Acompanhamento(tarefa))
+    except TarefaCancelada:
+        desfecho = {
+            'status': StatusTarefa.CANCELADA,
+            'mensagem': 'Cancelada durante a execução',
+        }
+    except Exception:
+        desfecho = {
+            'status': StatusTarefa.ERRO,
+            'erro': traceback.format_exc(),
+        }
+    else:
+        desfecho = {
+            'status': StatusTarefa.CONCLUIDA,
+            'progresso': 100,
+            'mensagem': mensagem,
+            'arquivo': tarefa.arquivo.name or '',
+        }
+
+    Tarefa.objects.filter(pk=tarefa.pk).update(concluido_em=timezone.now(), **desfecho)
+    return desfecho['status']
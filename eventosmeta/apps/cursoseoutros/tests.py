@@ -1,3 +1,1653 @@
-from django.test import TestCase
+"""
+ARQUIVO: apps/cursoseoutros/tests.py
+AÇÃO: SUBSTITUIR o arquivo apps/cursoseoutros/tests.py
+MUDANÇA: Testes dos contadores de vagas da turma e do evento
+         + coorte, pontos por critério, reclassificação incremental,
+           instantâneo, fila de tarefas e classificar_eventos
+         + inscrição com um único INSERT
+         + promoção da fila de espera
+         + processamento do modo fila
+         + pontuação em lote igual ao cálculo por inscrição
+         + contagem de anteriores (ranking)
+         + gravação da classificação em lote
+         + reclassificação incremental igual à completa
+         + reserva de vagas por critério
+         + fototipos prioritários
+         + pré-carga dos pontos customizados
+         + registro de pontuadores
+         + pontos em inteiros (arredondamento bancário)
+         + simulação sem gravação
+         + relatório com número fixo de consultas
+         + exportação CSV/XLSX em streaming
+         + instantâneo sem consultas até a próxima versão
+         + data de referência das idades
+         + benchmark
+         + execução e cancelamento de tarefas
+         + trava do evento
+         + desempate por várias chaves
+         + pontos por critério gravados e migração 0010
+DATA/HORA: 2026-10-17 02:31:09
+"""
 
-# Create your tests here.
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, timedelta
+from importlib import import_module
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
+from django.apps import apps as django_apps
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from apps.interessados.models import Fototipo, Interessado
+from .incremental import TabelaScores
+from .management.commands import classificar_eventos
+from .benchmark import CENARIOS, comparar_resultados, executar_benchmark, gerar_evento_sintetico
+from .cotas import alocar_vagas, calcular_vagas_reservadas
+from .desempate import ordenar_resultado
+from .inscricoes import (
+    obter_descritor_evento, processar_recebidas, receber_inscricao, registrar_inscricao,
+    reservar_recebidas
+)
+from .models import (
+    Classificacao, Criterio, Evento, EventoCriterio, Inscricao, InscricaoCriterioAtendido,
+    InscricaoRecebida, Matricula, MotivoVagaLiberada, PromocaoFilaEspera, ReferenciaIdade,
+    Status, StatusInscricao, StatusMatricula, StatusRecebimento, StatusTarefa, Tarefa,
+    TipoCriterio, TipoReserva, TipoTarefa, TravaClassificacao, Turma, VagasEsgotadas,
+    validar_desempate
+)
+from .persistencia import persistir_classificacao
+from .pontuacao import CASAS_PONDERADOS, arredondar_score, calcular_pontuacao_evento, para_decimal
+from .pontuadores import (
+    CEM, PONTUADORES, Pontuador, decimal_para_centesimos, dividir_arredondando,
+    obter_pontuador, registrar_pontuador
+)
+from .ranking import anotar_rank, contar_anteriores
+from .relatorio import gerar_csv, gravar_xlsx, obter_instantaneo_classificacao, xlsx_disponivel
+from .services import ClassificadorService
+from .simulacao import simular_classificacao
+from .tarefas import (
+    cancelar_tarefa, enfileirar_tarefa, executar_tarefa, liberar_travadas, reservar_proxima
+)
+from .travas import ClassificacaoEmAndamento, TravaEvento
+
+
+def criar_evento(vagas, descricao='Curso de Reciclagem'):
+    status, _ = Status.objects.get_or_create(
+        status='Inscrições Abertas', defaults={'permite_inscricao': True}
+    )
+    return Evento.objects.create(descricao=descricao, status=status, vagas=vagas)
+
+
+def criar_interessados(quantidade):
+    return [
+        Interessado.objects.create(cpf=f'{numero:011d}', nome=f'Interessado {numero}')
+        for numero in range(1, quantidade + 1)
+    ]
+
+
+def adicionar_criterio(evento, tipo, peso=10, ordem=1, **campos):
+    criterio = Criterio.objects.create(descricao_criterio=f'Critério {tipo}', tipo_criterio=tipo)
+    return EventoCriterio.objects.create(
+        evento=evento, criterio=criterio, peso=peso, ordem=ordem, **campos
+    )
+
+
+def inscrever(evento, interessados, inicio=None):
+    """Uma inscrição por interessado, um minuto depois da anterior"""
+    inicio = inicio or timezone.now() - timedelta(days=1)
+    return [
+        Inscricao.objects.create(
+            evento=evento, interessado=interessado,
+            data_inscricao=inicio + timedelta(minutes=minutos)
+        )
+        for minutos, interessado in enumerate(interessados)
+    ]
+
+
+# ============================================
+# PONTUAÇÃO EM LOTE
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class PontuacaoEventoTests(TestCase):
+    """Pontuação do evento inteiro de uma vez (pontuacao.calcular_pontuacao_evento)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=3)
+        adicionar_criterio(self.evento, TipoCriterio.ORDEM, peso=10, ordem=1)
+        adicionar_criterio(self.evento, TipoCriterio.IDADE_CRESCENTE, peso=7, ordem=2)
+        adicionar_criterio(
+            self.evento, TipoCriterio.FAIXA_ETARIA, peso=3, ordem=3,
+            idade_minima=18, idade_maxima=29
+        )
+        adicionar_criterio(self.evento, TipoCriterio.NIS, peso=5, ordem=4)
+        adicionar_criterio(self.evento, TipoCriterio.PCD, peso=4, ordem=5)
+        adicionar_criterio(self.evento, TipoCriterio.FOTOTIPO, peso=6, ordem=6)
+        self.customizado = adicionar_criterio(
+            self.evento, TipoCriterio.CUSTOMIZADO, peso=9, ordem=7
+        )
+
+        interessados = criar_interessados(5)
+        fototipo = Fototipo.objects.create(nome='Tipo III')
+        hoje = timezone.localdate()
+        dados = [
+            {
+                'data_nascimento': hoje.replace(year=hoje.year - 17),
+                'programa_social': True, 'num_nis': '12345678901',
+            },
+            {'data_nascimento': hoje.replace(year=hoje.year - 25), 'fototipo': fototipo},
+            {
+                'data_nascimento': hoje.replace(year=hoje.year - 43),
+                'necessidades_especiais': True, 'visual': True,
+            },
+            {'programa_social': True, 'necessidades_especiais': True},
+            {'data_nascimento': hoje.replace(year=hoje.year - 61), 'fototipo': fototipo},
+        ]
+        for interessado, campos in zip(interessados, dados):
+            Interessado.objects.filter(pk=interessado.pk).update(**campos)
+
+        self.inscricoes = inscrever(self.evento, interessados)
+        InscricaoCriterioAtendido.objects.create(
+            inscricao=self.inscricoes[2], criterio=self.customizado.criterio,
+            validado=True, pontos_obtidos=Decimal('33.33')
+        )
+
+    def test_mesmo_score_que_o_calculo_por_inscricao(self):
+        resultado = calcular_pontuacao_evento(self.evento)
+
+        self.assertEqual(
+            resultado.coorte.inscricao_ids, [inscricao.pk for inscricao in self.inscricoes]
+        )
+        self.assertEqual(
+            [para_decimal(score) for score in resultado.scores],
+            [
+                ClassificadorService.calcular_score_inscricao(inscricao)
+                for inscricao in Inscricao.objects.filter(evento=self.evento).order_by('pk')
+            ]
+        )
+
+    def test_consultas_nao_crescem_com_as_inscricoes(self):
+        with CaptureQueriesContext(connection) as poucas:
+            calcular_pontuacao_evento(self.evento)
+
+        mais = [
+            Interessado.objects.create(cpf=f'{numero:011d}', nome=f'Interessado {numero}')
+            for numero in range(6, 26)
+        ]
+        inscrever(self.evento, mais, inicio=timezone.now())
+
+        with self.assertNumQueries(len(poucas.captured_queries)):
+            calcular_pontuacao_evento(self.evento)
+
+
+# ============================================
+# ORDEM DE INSCRIÇÃO
+# ============================================
+
+class RankingTests(TestCase):
+    """Contagem de anteriores por ordenação (ranking.py)"""
+
+    def test_empates_min_recebem_a_mesma_contagem(self):
+        self.assertEqual(contar_anteriores([30, 10, 20, 10, 30]), [3, 0, 2, 0, 3])
+
+    def test_empates_ordinal_seguem_a_ordem_de_entrada(self):
+        self.assertEqual(contar_anteriores([30, 10, 20, 10, 30], 'ordinal'), [3, 0, 2, 1, 4])
+
+    def test_metodo_invalido(self):
+        with self.assertRaises(ValueError):
+            contar_anteriores([1, 2], 'denso')
+
+    def test_rank_sql_igual_ao_da_memoria(self):
+        cache.clear()
+        evento = criar_evento(vagas=2)
+        inicio = timezone.now() - timedelta(days=1)
+        inscricoes = inscrever(evento, criar_interessados(4), inicio=inicio)
+        Inscricao.objects.filter(pk=inscricoes[2].pk).update(data_inscricao=inicio)
+
+        anotadas = anotar_rank(Inscricao.objects.filter(evento=evento), 'data_inscricao')
+        ranks = dict(anotadas.values_list('pk', 'rank'))
+        datas = [
+            Inscricao.objects.get(pk=inscricao.pk).data_inscricao for inscricao in inscricoes
+        ]
+
+        self.assertEqual(
+            [ranks[inscricao.pk] - 1 for inscricao in inscricoes],
+            contar_anteriores(datas)
+        )
+        self.assertEqual(
+            ClassificadorService.calcular_pontos_ordem_inscricao(
+                inscricoes[2], 4, ranks[inscricoes[2].pk] - 1
+            ),
+            Decimal('100.00')
+        )
+
+
+# ============================================
+# GRAVAÇÃO EM LOTE
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class PersistirClassificacaoTests(TestCase):
+    """Classificação gravada com comandos em lote (persistencia.py)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=2)
+        adicionar_criterio(self.evento, TipoCriterio.ORDEM, peso=5)
+        self.customizado = adicionar_criterio(self.evento, TipoCriterio.CUSTOMIZADO, ordem=2)
+        self.inscricoes = inscrever(self.evento, criar_interessados(3))
+
+    def gravar(self):
+        resultado = calcular_pontuacao_evento(self.evento)
+        ordem = ordenar_resultado(resultado, self.evento.chaves_desempate())
+        return persistir_classificacao(self.evento, resultado, ordem)
+
+    def test_posicoes_e_status(self):
+        ClassificadorService.classificar_evento(self.evento)
+
+        self.assertEqual(
+            list(Inscricao.objects.order_by('classificacao__posicao').values_list(
+                'pk', 'classificacao__posicao', 'status'
+            )),
+            [
+                (self.inscricoes[0].pk, 1, StatusInscricao.APROVADO),
+                (self.inscricoes[1].pk, 2, StatusInscricao.APROVADO),
+                (self.inscricoes[2].pk, 3, StatusInscricao.FILA_ESPERA),
+            ]
+        )
+        self.assertEqual(
+            InscricaoCriterioAtendido.objects.filter(criterio=self.customizado.criterio).count(), 3
+        )
+
+    def test_reclassificar_atualiza_sem_duplicar_nem_perder_validacao(self):
+        ClassificadorService.classificar_evento(self.evento)
+        InscricaoCriterioAtendido.objects.filter(inscricao=self.inscricoes[2]).update(
+            validado=True, pontos_obtidos=Decimal('100.00')
+        )
+
+        ClassificadorService.classificar_evento(self.evento)
+
+        self.assertEqual(Classificacao.objects.count(), 3)
+        self.assertEqual(InscricaoCriterioAtendido.objects.count(), 3)
+        self.assertEqual(
+            Classificacao.objects.get(inscricao=self.inscricoes[2]).posicao, 1
+        )
+        self.assertEqual(
+            Inscricao.objects.get(pk=self.inscricoes[2].pk).status, StatusInscricao.APROVADO
+        )
+
+    def test_consultas_nao_crescem_com_as_inscricoes(self):
+        with CaptureQueriesContext(connection) as poucas:
+            self.gravar()
+
+        mais = [
+            Interessado.objects.create(cpf=f'{numero:011d}', nome=f'Interessado {numero}')
+            for numero in range(4, 24)
+        ]
+        inscrever(self.evento, mais, inicio=timezone.now())
+
+        with self.assertNumQueries(len(poucas.captured_queries)):
+            self.gravar()
+
+
+# ============================================
+# RESERVA DE VAGAS
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class AlocarVagasTests(TestCase):
+    """Distribuição das vagas entre ampla concorrência e reservas (cotas.py)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=4)
+        adicionar_criterio(self.evento, TipoCriterio.ORDEM, peso=10)
+        self.nis = adicionar_criterio(
+            self.evento, TipoCriterio.NIS, peso=1, ordem=2,
+            tipo_reserva=TipoReserva.PERCENTUAL, vagas_reservadas=25
+        )
+        self.interessados = criar_interessados(6)
+        self.inscricoes = inscrever(self.evento, self.interessados)
+
+    def alocar(self):
+        resultado = calcular_pontuacao_evento(self.evento)
+        return alocar_vagas(self.evento, resultado, ordenar_resultado(resultado, ()))
+
+    def test_reserva_vai_para_o_melhor_que_atende_ao_criterio(self):
+        Interessado.objects.filter(pk=self.interessados[5].pk).update(
+            programa_social=True, num_nis='12345678901'
+        )
+
+        alocacao = self.alocar()
+
+        self.assertEqual(alocacao.cotas, {
+            self.inscricoes[0].pk: None,
+            self.inscricoes[1].pk: None,
+            self.inscricoes[2].pk: None,
+            self.inscricoes[5].pk: self.nis.pk,
+        })
+        self.assertEqual(alocacao.preenchidas, {self.nis.pk: 1})
+        self.assertEqual(alocacao.liberadas, 0)
+
+    def test_reserva_sem_candidatos_volta_para_a_ampla_concorrencia(self):
+        alocacao = self.alocar()
+
+        self.assertEqual(
+            set(alocacao.cotas), {inscricao.pk for inscricao in self.inscricoes[:4]}
+        )
+        self.assertEqual(set(alocacao.cotas.values()), {None})
+        self.assertEqual(alocacao.liberadas, 1)
+
+    def test_percentual_arredonda_para_cima(self):
+        self.evento.vagas = 10
+        self.nis.vagas_reservadas = 15
+
+        self.assertEqual(calcular_vagas_reservadas(self.evento, self.nis), 2)
+
+    def test_matriculado_mantem_a_vaga_da_reserva(self):
+        Interessado.objects.filter(pk=self.interessados[4].pk).update(
+            programa_social=True, num_nis='12345678901'
+        )
+        ClassificadorService.classificar_evento(self.evento)
+        Inscricao.objects.filter(pk=self.inscricoes[4].pk).update(
+            status=StatusInscricao.MATRICULADO
+        )
+        Interessado.objects.filter(pk=self.interessados[5].pk).update(
+            programa_social=True, num_nis='10987654321'
+        )
+
+        ClassificadorService.classificar_evento(self.evento)
+
+        self.assertEqual(Classificacao.objects.get(inscricao=self.inscricoes[4]).cota_id, self.nis.pk)
+        self.assertEqual(
+            Inscricao.objects.get(pk=self.inscricoes[5].pk).status, StatusInscricao.FILA_ESPERA
+        )
+
+
+# ============================================
+# FOTOTIPOS PRIORITÁRIOS
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class FototiposPrioritariosTests(TestCase):
+    """Pontos do critério FOTOTIPO (EventoCriterio.fototipos_prioritarios)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=2)
+        self.criterio = adicionar_criterio(self.evento, TipoCriterio.FOTOTIPO)
+        self.tipos = [Fototipo.objects.create(nome=f'Tipo {numero}') for numero in range(1, 4)]
+
+        interessados = criar_interessados(4)
+        for interessado, fototipo in zip(interessados, self.tipos):
+            Interessado.objects.filter(pk=interessado.pk).update(fototipo=fototipo)
+        self.inscricoes = inscrever(self.evento, interessados)
+
+    def pontos(self):
+        return calcular_pontuacao_evento(self.evento).pontos_base[self.criterio.pk]
+
+    def test_prioritario_100_demais_0(self):
+        self.criterio.fototipos_prioritarios.set(self.tipos[1:])
+
+        self.assertEqual(self.pontos(), [0, 10000, 10000, 0])
+        self.assertEqual(
+            [
+                ClassificadorService.calcular_pontos_criterio(inscricao, self.criterio)
+                for inscricao in Inscricao.objects.filter(evento=self.evento).order_by('pk')
+            ],
+            [Decimal('0.00'), Decimal('100.00'), Decimal('100.00'), Decimal('0.00')]
+        )
+
+    def test_sem_configuracao_50_para_quem_informou(self):
+        self.assertEqual(self.pontos(), [5000, 5000, 5000, 0])
+
+    @override_settings(CLASSIFICACAO_INCREMENTAL=True)
+    def test_mudar_a_lista_reclassifica(self):
+        ClassificadorService.classificar_evento(self.evento)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.criterio.fototipos_prioritarios.add(self.tipos[2])
+
+        self.assertEqual(
+            list(Classificacao.objects.order_by('posicao').values_list('inscricao_id', 'score_total')),
+            [
+                (self.inscricoes[2].pk, Decimal('100.00')),
+                (self.inscricoes[0].pk, Decimal('0.00')),
+                (self.inscricoes[1].pk, Decimal('0.00')),
+                (self.inscricoes[3].pk, Decimal('0.00')),
+            ]
+        )
+
+
+# ============================================
+# PONTOS CUSTOMIZADOS
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class PontosCustomizadosTests(TestCase):
+    """Validações dos critérios customizados carregadas numa consulta (PontuadorCustomizado)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=2)
+        self.criterios = [
+            adicionar_criterio(self.evento, TipoCriterio.CUSTOMIZADO, ordem=ordem)
+            for ordem in (1, 2)
+        ]
+        self.inscricoes = inscrever(self.evento, criar_interessados(3))
+
+    def validar(self, inscricao, evento_criterio, pontos, validado=True):
+        InscricaoCriterioAtendido.objects.create(
+            inscricao=inscricao, criterio=evento_criterio.criterio,
+            validado=validado, pontos_obtidos=pontos
+        )
+
+    def test_so_validacoes_confirmadas_contam(self):
+        self.validar(self.inscricoes[0], self.criterios[0], Decimal('70.50'))
+        self.validar(self.inscricoes[1], self.criterios[1], Decimal('40.00'))
+        self.validar(self.inscricoes[2], self.criterios[0], Decimal('90.00'), validado=False)
+
+        resultado = calcular_pontuacao_evento(self.evento)
+
+        self.assertEqual(resultado.pontos_base[self.criterios[0].pk], [7050, 0, 0])
+        self.assertEqual(resultado.pontos_base[self.criterios[1].pk], [0, 4000, 0])
+
+    def test_uma_consulta_para_todos_os_criterios_customizados(self):
+        with CaptureQueriesContext(connection) as dois:
+            calcular_pontuacao_evento(self.evento)
+
+        adicionar_criterio(self.evento, TipoCriterio.CUSTOMIZADO, ordem=3)
+
+        with self.assertNumQueries(len(dois.captured_queries)):
+            calcular_pontuacao_evento(self.evento)
+
+    def test_validacoes_ja_carregadas_sem_consulta(self):
+        criterio = self.criterios[0].criterio
+        validados = {(self.inscricoes[0].pk, criterio.pk): Decimal('12.34')}
+
+        with self.assertNumQueries(0):
+            pontos = [
+                ClassificadorService.calcular_pontos_customizado(inscricao, criterio, validados)
+                for inscricao in self.inscricoes[:2]
+            ]
+
+        self.assertEqual(pontos, [Decimal('12.34'), Decimal('0.00')])
+
+
+# ============================================
+# REGISTRO DE PONTUADORES
+# ============================================
+
+class PontuadorCpfPar(Pontuador):
+    """Pontuador de teste: CPF terminado em número par = 100 pontos"""
+
+    tipo = 'CPF_PAR'
+    colunas = {'cpfs': 'interessado__cpf'}
+
+    def pontuar(self, coorte, evento_criterio, referencia, precarga):
+        return [CEM if int(cpf[-1]) % 2 == 0 else 0 for cpf in coorte.cpfs]
+
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class RegistroPontuadoresTests(TestCase):
+    """Despacho dos critérios pelo registro de pontuadores (pontuadores.py)"""
+
+    def setUp(self):
+        cache.clear()
+        registro = mock.patch.dict(PONTUADORES)
+        registro.start()
+        self.addCleanup(registro.stop)
+
+        self.evento = criar_evento(vagas=2)
+        self.criterio = adicionar_criterio(self.evento, PontuadorCpfPar.tipo)
+        self.inscricoes = inscrever(self.evento, criar_interessados(3))
+
+    def test_todos_os_tipos_padrao_registrados(self):
+        self.assertEqual(
+            {tipo for tipo in TipoCriterio.values if obter_pontuador(tipo) is None}, set()
+        )
+
+    def test_tipo_novo_sem_mudar_o_motor(self):
+        registrar_pontuador(PontuadorCpfPar)
+
+        resultado = calcular_pontuacao_evento(self.evento)
+
+        self.assertEqual(resultado.pontos_base[self.criterio.pk], [0, 10000, 0])
+        self.assertEqual(
+            ClassificadorService.calcular_pontos_criterio(self.inscricoes[1], self.criterio),
+            Decimal('100.00')
+        )
+
+    def test_tipo_sem_pontuador_vale_zero(self):
+        resultado = calcular_pontuacao_evento(self.evento)
+
+        self.assertEqual(resultado.pontos_base[self.criterio.pk], [0, 0, 0])
+        self.assertEqual(
+            ClassificadorService.calcular_pontos_criterio(self.inscricoes[1], self.criterio),
+            Decimal('0.00')
+        )
+
+
+# ============================================
+# PONTOS EM INTEIROS
+# ============================================
+
+class PontosInteirosTests(TestCase):
+    """Conta em inteiros escalados com arredondamento bancário (pontuacao.py)"""
+
+    def test_divisao_arredonda_metade_para_o_par(self):
+        for numerador in range(-40, 41):
+            esperado = int(round(Decimal(numerador) / 10))
+            self.assertEqual(dividir_arredondando(numerador, 10), esperado, numerador)
+
+    def test_conversoes(self):
+        self.assertEqual(para_decimal(12345), Decimal('123.45'))
+        self.assertEqual(para_decimal(64125, CASAS_PONDERADOS), Decimal('64.125'))
+        self.assertEqual(decimal_para_centesimos(Decimal('33.33')), 3333)
+        self.assertEqual(arredondar_score(64125), 6412)
+        self.assertEqual(arredondar_score(64135), 6414)
+
+    @override_settings(CLASSIFICACAO_INCREMENTAL=False)
+    def test_score_com_meio_centesimo_igual_ao_decimal(self):
+        cache.clear()
+        evento = criar_evento(vagas=2)
+        adicionar_criterio(evento, TipoCriterio.ORDEM, peso=5)
+        inscricoes = inscrever(evento, criar_interessados(4))
+
+        scores = [para_decimal(score) for score in calcular_pontuacao_evento(evento).scores]
+
+        # 66,67 × 5 / 10 = 33,335 → 33,34 e 33,33 × 5 / 10 = 16,665 → 16,66
+        self.assertEqual(
+            scores, [Decimal('50.00'), Decimal('33.34'), Decimal('16.66'), Decimal('0.00')]
+        )
+        self.assertEqual(
+            scores,
+            [ClassificadorService.calcular_score_inscricao(inscricao) for inscricao in inscricoes]
+        )
+
+
+# ============================================
+# SIMULAÇÃO
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class SimulacaoTests(TestCase):
+    """Classificação "e se...?" em memória (simulacao.simular_classificacao)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=2)
+        adicionar_criterio(self.evento, TipoCriterio.ORDEM)
+        self.customizado = adicionar_criterio(self.evento, TipoCriterio.CUSTOMIZADO, peso=0, ordem=2)
+        self.inscricoes = inscrever(self.evento, criar_interessados(4))
+        InscricaoCriterioAtendido.objects.create(
+            inscricao=self.inscricoes[3], criterio=self.customizado.criterio,
+            validado=True, pontos_obtidos=Decimal('100.00')
+        )
+        ClassificadorService.classificar_evento(self.evento)
+
+    def simular(self, **parametros):
+        with CaptureQueriesContext(connection) as consultas:
+            simulacao = simular_classificacao(self.evento, **parametros)
+
+        escritas = [
+            consulta['sql'] for consulta in consultas.captured_queries
+            if not consulta['sql'].lstrip().upper().startswith('SELECT')
+        ]
+        self.assertEqual(escritas, [])
+        return simulacao
+
+    def test_peso_alterado_mostra_quem_entra_e_quem_sai(self):
+        simulacao = self.simular(alteracoes={self.customizado.pk: {'peso': 10}})
+
+        self.assertEqual(simulacao.entram, [self.inscricoes[3].pk])
+        self.assertEqual(simulacao.saem, [self.inscricoes[1].pk])
+        self.assertEqual(simulacao.variacao(self.inscricoes[3].pk), 2)
+        self.assertEqual(
+            Inscricao.objects.get(pk=self.inscricoes[3].pk).status, StatusInscricao.FILA_ESPERA
+        )
+
+    def test_matriculado_continua_com_a_vaga(self):
+        Inscricao.objects.filter(pk=self.inscricoes[1].pk).update(
+            status=StatusInscricao.MATRICULADO
+        )
+        cache.clear()
+
+        simulacao = self.simular(alteracoes={self.customizado.pk: {'peso': 10}})
+
+        self.assertEqual(simulacao.situacoes[self.inscricoes[1].pk][1], StatusInscricao.MATRICULADO)
+        self.assertEqual(simulacao.entram, [])
+        self.assertEqual(simulacao.saem, [])
+
+    def test_mais_vagas(self):
+        simulacao = self.simular(vagas=3)
+
+        self.assertEqual(simulacao.entram, [self.inscricoes[2].pk])
+        self.assertEqual(Evento.objects.get(pk=self.evento.pk).vagas, 2)
+
+    def test_campo_nao_simulavel(self):
+        with self.assertRaises(ValueError):
+            simular_classificacao(self.evento, {self.customizado.pk: {'criterio': None}})
+
+
+# ============================================
+# RELATÓRIO
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class RelatorioTests(TestCase):
+    """Relatório somente leitura com número fixo de consultas (relatorio.montar_relatorio)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=2)
+        self.customizado = adicionar_criterio(self.evento, TipoCriterio.CUSTOMIZADO)
+        self.interessados = criar_interessados(20)
+        inscrever(self.evento, self.interessados[:3])
+
+    def relatorio(self):
+        cache.clear()
+        return ClassificadorService.gerar_relatorio_classificacao(
+            Evento.objects.get(pk=self.evento.pk)
+        )
+
+    def test_nao_classifica(self):
+        relatorio = self.relatorio()
+
+        self.assertEqual(relatorio['classificados'], [])
+        self.assertFalse(Classificacao.objects.exists())
+        self.assertFalse(InscricaoCriterioAtendido.objects.exists())
+
+    def test_consultas_nao_crescem_com_os_classificados(self):
+        ClassificadorService.classificar_evento(self.evento)
+        with CaptureQueriesContext(connection) as poucos:
+            self.assertEqual(len(self.relatorio()['classificados']), 3)
+
+        inscrever(self.evento, self.interessados[3:], inicio=timezone.now())
+        ClassificadorService.classificar_evento(self.evento)
+
+        with self.assertNumQueries(len(poucos.captured_queries)):
+            relatorio = self.relatorio()
+
+        self.assertEqual(len(relatorio['classificados']), 20)
+        self.assertEqual(
+            [linha['situacao'] for linha in relatorio['classificados'][1:3]],
+            ['APROVADO', 'FILA DE ESPERA']
+        )
+
+
+# ============================================
+# EXPORTAÇÃO
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class ExportacaoTests(TestCase):
+    """CSV e XLSX gerados linha a linha (relatorio.gerar_csv / gravar_xlsx)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=1)
+        adicionar_criterio(self.evento, TipoCriterio.ORDEM)
+        inscrever(self.evento, criar_interessados(3))
+        ClassificadorService.classificar_evento(self.evento)
+
+    def test_cabecalho_sai_antes_da_consulta(self):
+        linhas = gerar_csv(self.evento)
+
+        with self.assertNumQueries(0):
+            cabecalho = next(linhas)
+
+        self.assertEqual(cabecalho, '\ufeffPosição;Nome;CPF;Score;Data Inscrição;Situação;Cota\r\n')
+        self.assertEqual(len(list(linhas)), 3)
+
+    def test_linhas_iguais_com_qualquer_tamanho_de_bloco(self):
+        linhas = list(gerar_csv(self.evento))
+
+        self.assertEqual(list(gerar_csv(self.evento, tamanho_bloco=2)), linhas)
+        self.assertTrue(linhas[1].startswith('1;Interessado 1;00000000001;100.0;'))
+        self.assertTrue(linhas[1].endswith(';APROVADO;Ampla concorrência\r\n'))
+        self.assertTrue(linhas[2].endswith(';FILA DE ESPERA;\r\n'))
+
+    @skipUnless(xlsx_disponivel(), 'openpyxl não instalado')
+    def test_xlsx(self):
+        import openpyxl
+
+        destino = BytesIO()
+        gravar_xlsx(self.evento, destino)
+        destino.seek(0)
+
+        aba = openpyxl.load_workbook(destino).active
+        self.assertEqual(aba.max_row, 4)
+        self.assertEqual(aba.cell(row=2, column=2).value, 'Interessado 1')
+
+    def test_xlsx_sem_openpyxl(self):
+        with mock.patch('apps.cursoseoutros.relatorio.openpyxl', None):
+            with self.assertRaises(RuntimeError):
+                gravar_xlsx(self.evento, BytesIO())
+
+
+# ============================================
+# REFERÊNCIA DAS IDADES
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class ReferenciaIdadeTests(TestCase):
+    """Idades calculadas uma vez por data de referência (Evento.data_referencia_idades)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=1)
+        self.faixa = adicionar_criterio(
+            self.evento, TipoCriterio.FAIXA_ETARIA, idade_minima=18, idade_maxima=20
+        )
+        self.nascimentos = [date(2000, 3, 15), date(2000, 2, 29), date(1995, 1, 1)]
+        interessados = criar_interessados(3)
+        for interessado, nascimento in zip(interessados, self.nascimentos):
+            Interessado.objects.filter(pk=interessado.pk).update(data_nascimento=nascimento)
+        self.inscricoes = inscrever(self.evento, interessados)
+
+    def test_data_escolhida_no_evento(self):
+        self.evento.fim_inscricoes = date(2020, 3, 1)
+        self.evento.inicio_aulas = date(2020, 4, 1)
+        self.evento.data_referencia_idade = date(2020, 5, 1)
+
+        for referencia, esperada in (
+            (ReferenciaIdade.FIM_INSCRICOES, date(2020, 3, 1)),
+            (ReferenciaIdade.INICIO_AULAS, date(2020, 4, 1)),
+            (ReferenciaIdade.DATA_FIXA, date(2020, 5, 1)),
+            (ReferenciaIdade.CLASSIFICACAO, date.today()),
+        ):
+            self.evento.referencia_idade = referencia
+            self.assertEqual(self.evento.data_referencia_idades(), esperada)
+
+        self.evento.referencia_idade = ReferenciaIdade.DATA_FIXA
+        self.evento.data_referencia_idade = None
+        self.assertEqual(self.evento.data_referencia_idades(), date.today())
+
+    def test_idades_iguais_ao_calculo_por_data(self):
+        coorte = calcular_pontuacao_evento(self.evento).coorte
+
+        referencias = (date(2020, 2, 28), date(2020, 3, 14), date(2020, 3, 15), date(2021, 3, 1))
+        for referencia in referencias:
+            self.assertEqual(
+                coorte.idades(referencia),
+                [
+                    ClassificadorService.calcular_idade(nascimento, referencia)
+                    for nascimento in self.nascimentos
+                ]
+            )
+
+    def test_faixa_etaria_na_data_fixa(self):
+        Evento.objects.filter(pk=self.evento.pk).update(
+            referencia_idade=ReferenciaIdade.DATA_FIXA, data_referencia_idade=date(2018, 3, 14)
+        )
+        evento = Evento.objects.get(pk=self.evento.pk)
+
+        resultado = calcular_pontuacao_evento(evento)
+
+        # Idades 17, 18 e 23 em 14/03/2018
+        self.assertEqual(resultado.referencia, date(2018, 3, 14))
+        self.assertEqual(resultado.pontos_base[self.faixa.pk], [9500, 10000, 8500])
+        self.assertEqual(
+            ClassificadorService.calcular_pontos_criterio(
+                Inscricao.objects.get(pk=self.inscricoes[0].pk), self.faixa
+            ),
+            Decimal('95.00')
+        )
+
+
+# ============================================
+# BENCHMARK
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class BenchmarkTests(TestCase):
+    """Evento sintético e comparação com resultados anteriores (benchmark.py)"""
+
+    def setUp(self):
+        cache.clear()
+
+    def dados(self, evento):
+        return list(evento.inscricoes.order_by('data_inscricao').values_list(
+            'data_inscricao', 'interessado__data_nascimento', 'interessado__programa_social',
+            'interessado__fototipo__nome'
+        ))
+
+    def test_mesma_semente_mesmos_dados(self):
+        primeiro = gerar_evento_sintetico(30, semente=7, prefixo_cpf=1)
+        segundo = gerar_evento_sintetico(30, semente=7, prefixo_cpf=2)
+
+        self.assertEqual(primeiro.inscricoes.count(), 30)
+        self.assertEqual(self.dados(primeiro), self.dados(segundo))
+        self.assertNotEqual(
+            self.dados(primeiro), self.dados(gerar_evento_sintetico(30, semente=8, prefixo_cpf=3))
+        )
+
+    def test_cenarios_medidos(self):
+        resultados = executar_benchmark(20, semente=1, repeticoes=1)
+
+        self.assertEqual([resultado['cenario'] for resultado in resultados], list(CENARIOS))
+        self.assertTrue(all(resultado['consultas'] > 0 for resultado in resultados))
+
+    def test_regressao_de_consultas_e_tempo(self):
+        base = [{
+            'tamanho': 100, 'cenario': 'relatorio',
+            'segundos_min': 1.0, 'pico_memoria_mb': 10.0, 'consultas': 5,
+        }]
+        dentro = [dict(base[0], segundos_min=1.05)]
+        fora = [dict(base[0], segundos_min=1.2, consultas=6)]
+
+        self.assertEqual(comparar_resultados(dentro, base, tolerancia=0.1), [])
+        self.assertEqual(len(comparar_resultados(fora, base, tolerancia=0.1)), 2)
+
+
+# ============================================
+# TRAVA DO EVENTO
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class TravaEventoTests(TestCase):
+    """Uma classificação por evento de cada vez (travas.TravaEvento)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=1)
+
+    def travar_em_outro_processo(self, expira_em):
+        TravaClassificacao.objects.create(
+            evento=self.evento, dono='outro:1:abc',
+            adquirida_em=timezone.now() - timedelta(minutes=20), expira_em=expira_em
+        )
+
+    def test_evento_travado_por_outro_dono(self):
+        self.travar_em_outro_processo(timezone.now() + timedelta(minutes=5))
+
+        with self.assertRaises(ClassificacaoEmAndamento):
+            with TravaEvento(self.evento.pk, espera=0):
+                pass
+        with self.assertRaises(ClassificacaoEmAndamento):
+            ClassificadorService.classificar_evento(self.evento, espera=0)
+
+        self.assertEqual(TravaClassificacao.objects.get().dono, 'outro:1:abc')
+
+    def test_reentrante_na_mesma_thread(self):
+        with TravaEvento(self.evento.pk, espera=0) as externa:
+            with TravaEvento(self.evento.pk, espera=0) as interna:
+                self.assertTrue(interna.aninhada)
+                self.assertEqual(interna.dono, externa.dono)
+            self.assertTrue(TravaClassificacao.objects.filter(evento=self.evento).exists())
+
+        self.assertFalse(TravaClassificacao.objects.exists())
+
+    def test_trava_vencida_e_assumida(self):
+        self.travar_em_outro_processo(timezone.now() - timedelta(seconds=1))
+
+        with TravaEvento(self.evento.pk, espera=0) as trava:
+            self.assertEqual(TravaClassificacao.objects.get().dono, trava.dono)
+
+        self.assertFalse(TravaClassificacao.objects.exists())
+
+    def test_renovar_depois_de_perder_a_trava(self):
+        with TravaEvento(self.evento.pk, espera=0) as trava:
+            trava.renovar()
+            TravaClassificacao.objects.update(dono='outro:1:abc')
+
+            with self.assertRaises(ClassificacaoEmAndamento):
+                trava.renovar()
+
+        # A trava do novo dono não é apagada na saída
+        self.assertEqual(TravaClassificacao.objects.get().dono, 'outro:1:abc')
+
+
+# ============================================
+# DESEMPATE
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class DesempateTests(TestCase):
+    """Empates de score resolvidos pelas chaves do evento (desempate.py)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=2)
+        adicionar_criterio(self.evento, TipoCriterio.NIS, peso=5, ordem=1)
+        adicionar_criterio(self.evento, TipoCriterio.PCD, peso=5, ordem=2)
+
+        interessados = criar_interessados(4)
+        dados = [
+            {'programa_social': True, 'num_nis': '1', 'data_nascimento': date(1990, 1, 1)},
+            {'necessidades_especiais': True, 'fisica': True, 'data_nascimento': date(1980, 1, 1)},
+            {'programa_social': True, 'num_nis': '2', 'data_nascimento': date(1980, 1, 1)},
+            {'programa_social': True, 'num_nis': '3'},
+        ]
+        for interessado, campos in zip(interessados, dados):
+            Interessado.objects.filter(pk=interessado.pk).update(**campos)
+
+        # Ordem de inscrição invertida em relação aos ids
+        self.inscricoes = inscrever(self.evento, interessados)
+        inicio = timezone.now() - timedelta(days=1)
+        for minutos, inscricao in enumerate(self.inscricoes):
+            Inscricao.objects.filter(pk=inscricao.pk).update(
+                data_inscricao=inicio - timedelta(minutes=minutos)
+            )
+
+    def ordem(self, desempate):
+        self.evento.desempate = desempate
+        resultado = calcular_pontuacao_evento(self.evento)
+        ids = resultado.coorte.inscricao_ids
+        letras = {inscricao.pk: letra for letra, inscricao in zip('ABCD', self.inscricoes)}
+        return ''.join(
+            letras[ids[indice]]
+            for indice in ordenar_resultado(resultado, self.evento.chaves_desempate())
+        )
+
+    def test_chaves_em_ordem(self):
+        # Todos com 50 pontos; B não pontua no critério prioritário (NIS)
+        # e D não informou o nascimento
+        self.assertEqual(self.ordem('MAIS_VELHO'), 'BCAD')
+        self.assertEqual(self.ordem('CRITERIO_PRIORITARIO,MAIS_VELHO'), 'CADB')
+        self.assertEqual(self.ordem('MAIS_NOVO,CRITERIO_PRIORITARIO'), 'ACBD')
+        self.assertEqual(self.ordem('CRITERIO_PRIORITARIO,DATA_INSCRICAO'), 'DCAB')
+        self.assertEqual(self.ordem('DATA_INSCRICAO'), 'DCBA')
+
+    def test_sem_chaves_desempata_pelo_id(self):
+        self.assertEqual(self.ordem(''), 'ABCD')
+
+    def test_classificacao_grava_a_ordem_desempatada(self):
+        Evento.objects.filter(pk=self.evento.pk).update(desempate='CRITERIO_PRIORITARIO,MAIS_VELHO')
+
+        ClassificadorService.classificar_evento(Evento.objects.get(pk=self.evento.pk))
+
+        self.assertEqual(
+            list(Classificacao.objects.order_by('posicao').values_list('inscricao_id', flat=True)),
+            [self.inscricoes[indice].pk for indice in (2, 0, 3, 1)]
+        )
+
+    def test_validacao_das_chaves(self):
+        for invalido in ('IDADE', 'MAIS_VELHO,MAIS_VELHO', 'MAIS_VELHO,MAIS_NOVO'):
+            with self.assertRaises(ValidationError):
+                validar_desempate(invalido)
+
+        validar_desempate('CRITERIO_PRIORITARIO, MAIS_NOVO, DATA_INSCRICAO')
+
+
+# ============================================
+# COORTE
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class CoorteTests(TestCase):
+    """Quem entra na coorte pontuada (coorte.Coorte.carregar)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=2)
+        self.ordem = adicionar_criterio(self.evento, TipoCriterio.ORDEM)
+        self.inscricoes = inscrever(self.evento, criar_interessados(4))
+
+    def test_desistente_fica_fora_da_ordem_de_inscricao(self):
+        # Comportamento novo: a linha de base contava desistentes no total
+        # e nas inscrições anteriores (100 / 33,33 / 0 para os demais)
+        Inscricao.objects.filter(pk=self.inscricoes[1].pk).update(
+            status=StatusInscricao.DESISTENTE
+        )
+
+        resultado = calcular_pontuacao_evento(self.evento)
+
+        self.assertEqual(
+            resultado.coorte.inscricao_ids,
+            [self.inscricoes[0].pk, self.inscricoes[2].pk, self.inscricoes[3].pk]
+        )
+        self.assertEqual(resultado.pontos_base[self.ordem.id], [10000, 5000, 0])
+        self.assertEqual(
+            ClassificadorService.calcular_score_inscricao(self.inscricoes[2]), Decimal('50.00')
+        )
+
+
+# ============================================
+# DETALHAMENTO DOS PONTOS
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class PontosCriteriosTests(TestCase):
+    """Pontos por critério em Classificacao.pontos_criterios e validações customizadas"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=2)
+        self.customizado = adicionar_criterio(self.evento, TipoCriterio.CUSTOMIZADO, peso=5)
+        self.inscricoes = inscrever(self.evento, criar_interessados(2))
+
+    def test_calculo_de_uma_inscricao_nao_grava(self):
+        InscricaoCriterioAtendido.objects.create(
+            inscricao=self.inscricoes[0], criterio=self.customizado.criterio,
+            validado=True, pontos_obtidos=Decimal('80.00')
+        )
+
+        scores = [
+            ClassificadorService.calcular_score_inscricao(inscricao)
+            for inscricao in self.inscricoes
+        ]
+
+        self.assertEqual(scores, [Decimal('40.00'), Decimal('0.00')])
+        # Sem linha de validação criada para a segunda inscrição
+        self.assertEqual(InscricaoCriterioAtendido.objects.count(), 1)
+
+    def test_pontos_por_criterio_gravados(self):
+        ordem = adicionar_criterio(self.evento, TipoCriterio.ORDEM, ordem=2)
+        InscricaoCriterioAtendido.objects.create(
+            inscricao=self.inscricoes[1], criterio=self.customizado.criterio,
+            validado=True, pontos_obtidos=Decimal('80.00')
+        )
+
+        ClassificadorService.classificar_evento(self.evento)
+
+        primeira, segunda = [
+            Classificacao.objects.get(inscricao=inscricao) for inscricao in self.inscricoes
+        ]
+        self.assertEqual(primeira.pontos_criterios, {str(ordem.pk): 100000})
+        self.assertEqual(segunda.pontos_por_criterio(), {self.customizado.pk: Decimal('40.000')})
+        self.assertEqual(sum(segunda.pontos_por_criterio().values()), segunda.score_total)
+        # Só os critérios customizados têm linha
+        self.assertEqual(
+            set(InscricaoCriterioAtendido.objects.values_list('criterio_id', flat=True)),
+            {self.customizado.criterio_id}
+        )
+
+    def test_migracao_compacta_e_expande_as_linhas(self):
+        migracao = import_module('apps.cursoseoutros.migrations.0010_compactar_criterios_atendidos')
+        ordem = adicionar_criterio(self.evento, TipoCriterio.ORDEM, ordem=2)
+        for inscricao, pontos in zip(self.inscricoes, (Decimal('64.13'), Decimal('0.00'))):
+            Classificacao.objects.create(inscricao=inscricao, score_total=pontos)
+            InscricaoCriterioAtendido.objects.create(
+                inscricao=inscricao, criterio=ordem.criterio, validado=True, pontos_obtidos=pontos
+            )
+        InscricaoCriterioAtendido.objects.create(
+            inscricao=self.inscricoes[0], criterio=self.customizado.criterio,
+            validado=True, pontos_obtidos=Decimal('80.00')
+        )
+
+        migracao.compactar(django_apps, None)
+
+        self.assertEqual(
+            Classificacao.objects.get(inscricao=self.inscricoes[0]).pontos_criterios,
+            {str(ordem.pk): 64130, str(self.customizado.pk): 40000}
+        )
+        self.assertEqual(
+            Classificacao.objects.get(inscricao=self.inscricoes[1]).pontos_criterios, {}
+        )
+        self.assertEqual(InscricaoCriterioAtendido.objects.count(), 1)
+
+        migracao.expandir(django_apps, None)
+
+        self.assertEqual(
+            InscricaoCriterioAtendido.objects.get(criterio=ordem.criterio).pontos_obtidos,
+            Decimal('64.13')
+        )
+
+
+# ============================================
+# RECLASSIFICAÇÃO INCREMENTAL
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=True)
+class ReclassificacaoIncrementalTests(TestCase):
+    """Mudanças depois do commit atualizam a classificação (incremental.py)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=2)
+        adicionar_criterio(self.evento, TipoCriterio.ORDEM)
+        self.interessados = criar_interessados(4)
+        inscrever(self.evento, self.interessados[:3])
+        ClassificadorService.classificar_evento(self.evento)
+
+    def gravado(self):
+        return list(Classificacao.objects.order_by('inscricao_id').values_list(
+            'inscricao_id', 'posicao', 'score_total', 'inscricao__status'
+        ))
+
+    def assertIgualAClassificacaoCompleta(self):
+        incremental = self.gravado()
+        ClassificadorService.classificar_evento(self.evento)
+        self.assertEqual(incremental, self.gravado())
+
+    def test_inscricao_nova_igual_a_classificacao_completa(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            inscricao, _ = registrar_inscricao(self.evento.pk, self.interessados[3])
+
+        self.assertEqual(Classificacao.objects.get(inscricao=inscricao).posicao, 4)
+        self.assertIgualAClassificacaoCompleta()
+
+    def test_inscricao_excluida_igual_a_classificacao_completa(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Inscricao.objects.get(evento=self.evento, interessado=self.interessados[0]).delete()
+
+        self.assertEqual(Classificacao.objects.count(), 2)
+        self.assertIgualAClassificacaoCompleta()
+
+    def travar_em_outro_processo(self):
+        agora = timezone.now()
+        TravaClassificacao.objects.create(
+            evento=self.evento, dono='outro:1:abc',
+            adquirida_em=agora, expira_em=agora + timedelta(minutes=5)
+        )
+
+    def test_evento_em_classificacao_enfileira_sem_esperar(self):
+        self.travar_em_outro_processo()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            registrar_inscricao(self.evento.pk, self.interessados[3])
+
+        self.assertTrue(Tarefa.objects.filter(
+            evento=self.evento, tipo=TipoTarefa.CLASSIFICAR, status=StatusTarefa.PENDENTE
+        ).exists())
+        self.assertIsNone(TabelaScores.obter(self.evento))
+
+    def test_classificacao_em_execucao_nao_impede_outra_na_fila(self):
+        executando, _ = enfileirar_tarefa(self.evento, TipoTarefa.CLASSIFICAR)
+        self.assertEqual(reservar_proxima('executor-1').pk, executando.pk)
+
+        pendente, criada = enfileirar_tarefa(self.evento, TipoTarefa.CLASSIFICAR)
+
+        self.assertTrue(criada)
+        self.assertIsNone(reservar_proxima('executor-2'))
+        Tarefa.objects.filter(pk=executando.pk).update(status=StatusTarefa.CONCLUIDA)
+        self.assertEqual(reservar_proxima('executor-2').pk, pendente.pk)
+
+
+# ============================================
+# INSTANTÂNEO DA CLASSIFICAÇÃO
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class InstantaneoClassificacaoTests(TestCase):
+    """Instantâneo versionado no cache (relatorio.obter_instantaneo_classificacao)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=1)
+        adicionar_criterio(self.evento, TipoCriterio.ORDEM)
+        self.interessados = criar_interessados(2)
+        inscrever(self.evento, self.interessados)
+        ClassificadorService.classificar_evento(self.evento)
+
+    def nomes(self):
+        return [registro['nome'] for registro in obter_instantaneo_classificacao(self.evento.pk).registros()]
+
+    def test_leitura_repetida_sem_consultas(self):
+        obter_instantaneo_classificacao(self.evento.pk)
+
+        with self.assertNumQueries(0):
+            instantaneo = obter_instantaneo_classificacao(self.evento.pk)
+
+        self.assertEqual(instantaneo.contagem, {'total': 2, 'aprovados': 1, 'fila_espera': 1})
+
+    def test_reclassificacao_gera_nova_versao(self):
+        versao = obter_instantaneo_classificacao(self.evento.pk).versao
+        Evento.objects.filter(pk=self.evento.pk).update(vagas=2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ClassificadorService.classificar_evento(Evento.objects.get(pk=self.evento.pk))
+
+        instantaneo = obter_instantaneo_classificacao(self.evento.pk)
+        self.assertEqual(instantaneo.versao, versao + 1)
+        self.assertEqual(len(instantaneo.aprovados()), 2)
+
+    def test_nome_alterado_gera_nova_versao(self):
+        self.assertEqual(self.nomes(), ['Interessado 1', 'Interessado 2'])
+
+        interessado = self.interessados[0]
+        interessado.nome = 'Nome Corrigido'
+        with self.captureOnCommitCallbacks(execute=True):
+            interessado.save()
+
+        self.assertEqual(self.nomes(), ['Nome Corrigido', 'Interessado 2'])
+
+    def test_login_nao_gera_nova_versao(self):
+        versao = obter_instantaneo_classificacao(self.evento.pk).versao
+
+        interessado = self.interessados[0]
+        interessado.last_login = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            interessado.save(update_fields=['last_login'])
+
+        self.assertEqual(obter_instantaneo_classificacao(self.evento.pk).versao, versao)
+
+
+# ============================================
+# FILA DE TAREFAS
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class FilaTarefasTests(TestCase):
+    """Reserva e liberação de tarefas em segundo plano (tarefas.py)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=1)
+
+    def executando(self, iniciada_ha, sinal_ha):
+        tarefa, _ = enfileirar_tarefa(self.evento, TipoTarefa.EXPORTAR_CSV)
+        reservar_proxima('executor-1')
+        agora = timezone.now()
+        Tarefa.objects.filter(pk=tarefa.pk).update(
+            iniciado_em=agora - iniciada_ha,
+            sinal_de_vida_em=agora - sinal_ha if sinal_ha is not None else None
+        )
+        return tarefa
+
+    def test_classificacao_pendente_e_reaproveitada(self):
+        primeira, criada = enfileirar_tarefa(self.evento, TipoTarefa.CLASSIFICAR)
+        self.assertTrue(criada)
+
+        self.assertEqual(enfileirar_tarefa(self.evento, TipoTarefa.CLASSIFICAR), (primeira, False))
+        self.assertTrue(enfileirar_tarefa(self.evento, TipoTarefa.EXPORTAR_CSV)[1])
+        self.assertTrue(enfileirar_tarefa(self.evento, TipoTarefa.EXPORTAR_CSV)[1])
+
+    def test_reserva_na_ordem_da_fila(self):
+        primeira, _ = enfileirar_tarefa(self.evento, TipoTarefa.EXPORTAR_CSV)
+        segunda, _ = enfileirar_tarefa(self.evento, TipoTarefa.EXPORTAR_XLSX)
+
+        self.assertEqual(reservar_proxima('executor-1').pk, primeira.pk)
+        reservada = reservar_proxima('executor-2')
+        self.assertEqual((reservada.pk, reservada.executor), (segunda.pk, 'executor-2'))
+        self.assertIsNone(reservar_proxima('executor-3'))
+
+    def test_executar_classificacao(self):
+        adicionar_criterio(self.evento, TipoCriterio.ORDEM)
+        inscrever(self.evento, criar_interessados(2))
+        enfileirar_tarefa(self.evento, TipoTarefa.CLASSIFICAR)
+
+        tarefa = reservar_proxima('executor-1')
+
+        self.assertEqual(executar_tarefa(tarefa), StatusTarefa.CONCLUIDA)
+        self.assertEqual(Tarefa.objects.get(pk=tarefa.pk).progresso, 100)
+        self.assertEqual(Classificacao.objects.filter(inscricao__evento=self.evento).count(), 2)
+
+    def test_cancelar(self):
+        pendente, _ = enfileirar_tarefa(self.evento, TipoTarefa.EXPORTAR_CSV)
+        self.assertTrue(cancelar_tarefa(pendente))
+        self.assertEqual(Tarefa.objects.get(pk=pendente.pk).status, StatusTarefa.CANCELADA)
+        self.assertFalse(cancelar_tarefa(pendente))
+
+        enfileirar_tarefa(self.evento, TipoTarefa.CLASSIFICAR)
+        executando = reservar_proxima('executor-1')
+        self.assertTrue(cancelar_tarefa(executando))
+
+        self.assertEqual(executar_tarefa(executando), StatusTarefa.CANCELADA)
+        self.assertFalse(Classificacao.objects.exists())
+
+    def test_tarefa_demorada_com_sinal_de_vida_nao_e_liberada(self):
+        tarefa = self.executando(timedelta(hours=3), timedelta(seconds=20))
+
+        self.assertEqual(liberar_travadas(10), 0)
+        self.assertEqual(Tarefa.objects.get(pk=tarefa.pk).status, StatusTarefa.EXECUTANDO)
+
+    def test_tarefa_sem_sinal_de_vida_e_liberada(self):
+        sem_sinal = self.executando(timedelta(hours=3), timedelta(minutes=11))
+        antiga = self.executando(timedelta(hours=3), None)
+
+        self.assertEqual(liberar_travadas(10), 2)
+        self.assertEqual(
+            set(Tarefa.objects.filter(status=StatusTarefa.ERRO).values_list('pk', flat=True)),
+            {sem_sinal.pk, antiga.pk}
+        )
+
+
+# ============================================
+# COMANDO classificar_eventos
+# ============================================
+
+class PoolFalso:
+    """
+    ProcessPoolExecutor no próprio processo. Um evento em `derrubam` mata
+    o processo: todo o pool quebra (BrokenProcessPool), como no de verdade.
+    """
+
+    derrubam = set()
+
+    def __init__(self, max_workers, initializer=None):
+        self.enviados = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        return False
+
+    def submit(self, funcao, evento_id):
+        futuro = Future()
+        self.enviados.append((futuro, funcao, evento_id))
+        if any(enviado in self.derrubam for _, _, enviado in self.enviados):
+            for enviado_futuro, _, _ in self.enviados:
+                if not enviado_futuro.done():
+                    enviado_futuro.set_exception(BrokenProcessPool())
+        else:
+            futuro.set_result(funcao(evento_id))
+        return futuro
+
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False)
+class ClassificarEventosTests(TestCase):
+    """Pool de processos interrompido não derruba o lote inteiro"""
+
+    def setUp(self):
+        cache.clear()
+        interessados = criar_interessados(2)
+        self.eventos = []
+        for numero in range(3):
+            evento = criar_evento(vagas=1, descricao=f'Evento {numero}')
+            adicionar_criterio(evento, TipoCriterio.ORDEM)
+            inscrever(evento, interessados)
+            self.eventos.append(evento)
+
+        for alvo, substituto in (('ProcessPoolExecutor', PoolFalso), ('connections', mock.Mock())):
+            patcher = mock.patch.object(classificar_eventos, alvo, substituto)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def classificar(self, derrubam=()):
+        PoolFalso.derrubam = {self.eventos[indice].pk for indice in derrubam}
+        call_command(
+            'classificar_eventos', *[evento.pk for evento in self.eventos],
+            workers=3, stdout=StringIO(), stderr=StringIO()
+        )
+
+    def classificados(self):
+        return [
+            Classificacao.objects.filter(inscricao__evento=evento).exists()
+            for evento in self.eventos
+        ]
+
+    def test_pool_quebrado_refaz_os_eventos_um_a_um(self):
+        with self.assertRaisesMessage(CommandError, f'Eventos com erro: {self.eventos[1].pk}'):
+            self.classificar(derrubam=[1])
+
+        self.assertEqual(self.classificados(), [True, False, True])
+
+    def test_sem_falhas(self):
+        self.classificar()
+        self.assertEqual(self.classificados(), [True, True, True])
+
+
+# ============================================
+# VAGAS DA TURMA
+# ============================================
+
+class VagasTurmaTests(TestCase):
+    """Contadores de vagas ocupadas da turma e do evento (Matricula.save)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=2)
+        self.turma = Turma.objects.create(descricao_turma='Turma A', evento=self.evento, vagas=1)
+        self.turma_livre = Turma.objects.create(descricao_turma='Turma B', evento=self.evento)
+        self.alunos = criar_interessados(3)
+
+    def contadores(self, turma):
+        turma.refresh_from_db()
+        self.evento.refresh_from_db()
+        return turma.vagas_ocupadas, self.evento.vagas_ocupadas
+
+    def test_matricula_confirmada_ocupa_vaga(self):
+        Matricula.objects.create(
+            turma=self.turma, interessado=self.alunos[0], status=StatusMatricula.CONFIRMADA
+        )
+        self.assertEqual(self.contadores(self.turma), (1, 1))
+
+    def test_matricula_pendente_nao_ocupa_vaga(self):
+        Matricula.objects.create(turma=self.turma, interessado=self.alunos[0])
+        self.assertEqual(self.contadores(self.turma), (0, 0))
+
+    def test_turma_lotada_recusa_matricula(self):
+        Matricula.objects.create(
+            turma=self.turma, interessado=self.alunos[0], status=StatusMatricula.CONFIRMADA
+        )
+        with self.assertRaises(VagasEsgotadas):
+            Matricula.objects.create(
+                turma=self.turma, interessado=self.alunos[1], status=StatusMatricula.CONFIRMADA
+            )
+        self.assertEqual(self.contadores(self.turma), (1, 1))
+        self.assertEqual(Matricula.objects.count(), 1)
+
+    def test_evento_lotado_desfaz_vaga_da_turma(self):
+        for aluno in self.alunos[:2]:
+            Matricula.objects.create(
+                turma=self.turma_livre, interessado=aluno, status=StatusMatricula.CONFIRMADA
+            )
+        with self.assertRaises(VagasEsgotadas):
+            Matricula.objects.create(
+                turma=self.turma_livre, interessado=self.alunos[2], status=StatusMatricula.CONFIRMADA
+            )
+        self.assertEqual(self.contadores(self.turma_livre), (2, 2))
+
+    def test_cancelamento_libera_vaga(self):
+        matricula = Matricula.objects.create(
+            turma=self.turma, interessado=self.alunos[0], status=StatusMatricula.CONFIRMADA
+        )
+        matricula.status = StatusMatricula.CANCELADA
+        matricula.save()
+        self.assertEqual(self.contadores(self.turma), (0, 0))
+
+        # Salvar de novo não libera outra vez
+        matricula.save()
+        self.assertEqual(self.contadores(self.turma), (0, 0))
+
+    def test_exclusao_libera_vaga(self):
+        matricula = Matricula.objects.create(
+            turma=self.turma, interessado=self.alunos[0], status=StatusMatricula.CONFIRMADA
+        )
+        matricula.delete()
+        self.assertEqual(self.contadores(self.turma), (0, 0))
+
+    def test_troca_de_turma_move_a_vaga(self):
+        matricula = Matricula.objects.create(
+            turma=self.turma_livre, interessado=self.alunos[0], status=StatusMatricula.CONFIRMADA
+        )
+        matricula.turma = self.turma
+        matricula.save()
+        self.assertEqual(self.contadores(self.turma), (1, 1))
+        self.assertEqual(self.contadores(self.turma_livre), (0, 1))
+
+    def test_troca_de_turma_com_evento_lotado(self):
+        evento = criar_evento(vagas=1, descricao='Evento lotado')
+        origem = Turma.objects.create(descricao_turma='Turma C', evento=evento)
+        destino = Turma.objects.create(descricao_turma='Turma D', evento=evento)
+        matricula = Matricula.objects.create(
+            turma=origem, interessado=self.alunos[0], status=StatusMatricula.CONFIRMADA
+        )
+
+        self.assertEqual(Matricula.objects.get(pk=matricula.pk).erro_vagas(
+            destino, StatusMatricula.CONFIRMADA
+        ), '')
+        matricula.turma = destino
+        matricula.save()
+
+        origem.refresh_from_db()
+        destino.refresh_from_db()
+        evento.refresh_from_db()
+        self.assertEqual(
+            (origem.vagas_ocupadas, destino.vagas_ocupadas, evento.vagas_ocupadas), (0, 1, 1)
+        )
+
+
+# ============================================
+# PROMOÇÃO DA FILA DE ESPERA
+# ============================================
+
+@override_settings(CLASSIFICACAO_INCREMENTAL=False, CLASSIFICACAO_PROMOCAO_AUTOMATICA=True)
+class PromocaoFilaEsperaTests(TestCase):
+    """Vaga liberada vai para o primeiro da fila de espera (fila_espera.py)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=2)
+        criterio = Criterio.objects.create(
+            descricao_criterio='Ordem de inscrição', tipo_criterio=TipoCriterio.ORDEM
+        )
+        EventoCriterio.objects.create(evento=self.evento, criterio=criterio, peso=1, ordem=1)
+
+        inicio = timezone.now() - timedelta(days=1)
+        self.inscricoes = [
+            Inscricao.objects.create(
+                evento=self.evento, interessado=interessado,
+                data_inscricao=inicio + timedelta(minutes=minutos)
+            )
+            for minutos, interessado in enumerate(criar_interessados(4))
+        ]
+        ClassificadorService.classificar_evento(self.evento)
+        self.turma = Turma.objects.create(descricao_turma='Turma A', evento=self.evento)
+
+    def status(self):
+        return [
+            Inscricao.objects.get(pk=inscricao.pk).status for inscricao in self.inscricoes
+        ]
+
+    def test_classificacao_inicial(self):
+        self.assertEqual(self.status(), [
+            StatusInscricao.APROVADO, StatusInscricao.APROVADO,
+            StatusInscricao.FILA_ESPERA, StatusInscricao.FILA_ESPERA,
+        ])
+
+    def test_cancelamento_promove_o_primeiro_da_fila(self):
+        matricula = Matricula.objects.create(
+            turma=self.turma, interessado=self.inscricoes[0].interessado,
+            status=StatusMatricula.CONFIRMADA
+        )
+        matricula.status = StatusMatricula.CANCELADA
+        matricula.save()
+
+        self.assertEqual(self.status(), [
+            StatusInscricao.DESISTENTE, StatusInscricao.APROVADO,
+            StatusInscricao.APROVADO, StatusInscricao.FILA_ESPERA,
+        ])
+        promocao = PromocaoFilaEspera.objects.get()
+        self.assertEqual(promocao.motivo, MotivoVagaLiberada.MATRICULA_CANCELADA)
+        self.assertEqual(promocao.inscricao_liberada_id, self.inscricoes[0].pk)
+        self.assertEqual(promocao.inscricao_promovida_id, self.inscricoes[2].pk)
+
+    def test_desistencia_promove_o_primeiro_da_fila(self):
+        inscricao = self.inscricoes[1]
+        inscricao.status = StatusInscricao.DESISTENTE
+        inscricao.save()
+
+        self.assertEqual(
+            PromocaoFilaEspera.objects.get().inscricao_promovida_id, self.inscricoes[2].pk
+        )
+
+    def test_desistencia_de_matriculado_cancela_a_matricula(self):
+        inscricao = self.inscricoes[0]
+        matricula = Matricula.objects.create(
+            turma=self.turma, interessado=inscricao.interessado, status=StatusMatricula.CONFIRMADA
+        )
+        inscricao.status = StatusInscricao.MATRICULADO
+        inscricao.save()
+
+        inscricao.status = StatusInscricao.DESISTENTE
+        inscricao.save()
+
+        matricula.refresh_from_db()
+        self.turma.refresh_from_db()
+        self.evento.refresh_from_db()
+        self.assertEqual(matricula.status, StatusMatricula.CANCELADA)
+        self.assertEqual((self.turma.vagas_ocupadas, self.evento.vagas_ocupadas), (0, 0))
+        self.assertEqual(
+            PromocaoFilaEspera.objects.get().inscricao_promovida_id, self.inscricoes[2].pk
+        )
+
+    def test_reclassificacao_mantem_matriculado(self):
+        Inscricao.objects.filter(pk=self.inscricoes[3].pk).update(status=StatusInscricao.MATRICULADO)
+        ClassificadorService.classificar_evento(self.evento)
+
+        self.assertEqual(self.status(), [
+            StatusInscricao.APROVADO, StatusInscricao.FILA_ESPERA,
+            StatusInscricao.FILA_ESPERA, StatusInscricao.MATRICULADO,
+        ])
+
+
+# ============================================
+# INSCRIÇÃO
+# ============================================
+
+class RegistrarInscricaoTests(TestCase):
+    """Inscrição com um único INSERT (inscricoes.registrar_inscricao)"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=10)
+        self.interessado, = criar_interessados(1)
+
+    def test_inscricao_e_um_unico_insert(self):
+        # Descritor do evento já no cache: só o INSERT (e o savepoint dele)
+        obter_descritor_evento(self.evento.pk)
+
+        with self.assertNumQueries(3):
+            _, criada = registrar_inscricao(self.evento.pk, self.interessado)
+
+        self.assertTrue(criada)
+
+    def test_inscricao_repetida_vira_ja_inscrito(self):
+        inscricao, criada = registrar_inscricao(self.evento.pk, self.interessado)
+        self.assertTrue(criada)
+        self.assertEqual(inscricao.status, StatusInscricao.INSCRITO)
+
+        self.assertEqual(registrar_inscricao(self.evento.pk, self.interessado), (None, False))
+        self.assertEqual(Inscricao.objects.filter(evento=self.evento).count(), 1)
+
+
+# ============================================
+# MODO FILA
+# ============================================
+
+class ProcessarRecebidasTests(TestCase):
+    """Modo fila: envios gravados na hora e inscrições criadas em lote"""
+
+    def setUp(self):
+        cache.clear()
+        self.evento = criar_evento(vagas=10)
+        self.interessados = criar_interessados(2)
+
+    def test_lote_sem_duplicidade(self):
+        primeiro = receber_inscricao(self.evento.pk, self.interessados[0])
+        receber_inscricao(self.evento.pk, self.interessados[1])
+        receber_inscricao(self.evento.pk, self.interessados[0])
+        receber_inscricao(self.evento.pk, self.interessados[0])
+
+        contagem = processar_recebidas(reservar_recebidas('teste'))
+
+        self.assertEqual(contagem, {
+            StatusRecebimento.INSCRITA: 2, StatusRecebimento.JA_INSCRITO: 2,
+        })
+        inscricao = Inscricao.objects.get(evento=self.evento, interessado=self.interessados[0])
+        self.assertEqual(inscricao.data_inscricao, primeiro.recebida_em)
+        self.assertEqual(
+            set(InscricaoRecebida.objects.filter(
+                interessado=self.interessados[0]
+            ).values_list('inscricao_id', flat=True)),
+            {inscricao.pk}
+        )
+
+    def test_ja_inscrito_antes_do_lote(self):
+        inscricao, _ = registrar_inscricao(self.evento.pk, self.interessados[0])
+        recebida = receber_inscricao(self.evento.pk, self.interessados[0])
+
+        processar_recebidas(reservar_recebidas('teste'))
+
+        recebida.refresh_from_db()
+        self.assertEqual(recebida.status, StatusRecebimento.JA_INSCRITO)
+        self.assertEqual(recebida.inscricao_id, inscricao.pk)
+
+    def test_reserva_nao_repete_envio(self):
+        receber_inscricao(self.evento.pk, self.interessados[0])
+
+        self.assertEqual(len(reservar_recebidas('executor-1')), 1)
+        self.assertEqual(reservar_recebidas('executor-2'), [])
@@ -0,0 +1,171 @@
+"""
+ARQUIVO: apps/cursoseoutros/travas.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Trava por evento para nunca rodar duas classificações em paralelo
+DATA/HORA: 2026-10-17 01:55:07
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, OperationalError, transaction
+from django.utils import timezone
+from .models import TravaClassificacao
+
+
+# Segundos entre duas tentativas de obter a trava
+INTERVALO_TENTATIVAS = 0.2
+
+_mantidas = threading.local()
+
+
+class ClassificacaoEmAndamento(Exception):
+    """Outra execução está classificando o evento (espera esgotada)"""
+
+
+def espera_padrao():
+    """Segundos de espera pela trava (settings.CLASSIFICACAO_ESPERA_TRAVA)"""
+    return getattr(settings, 'CLASSIFICACAO_ESPERA_TRAVA', 30)
+
+
+def duracao_padrao():
+    """Validade da trava em segundos (settings.CLASSIFICACAO_DURACAO_TRAVA)"""
+    return getattr(settings, 'CLASSIFICACAO_DURACAO_TRAVA', 15 * 60)
+
+
+def _travas_da_thread():
+    """evento_id → trava obtida pela thread atual"""
+    travas = getattr(_mantidas, 'eventos', None)
+    if travas is None:
+        travas = _mantidas.eventos = {}
+    return travas
+
+
+class TravaEvento:
+    """
+    Trava de classificação de um evento (context manager).
+
+    A trava é uma linha de TravaClassificacao: obtê-la é um INSERT (a chave
+    primária é o evento, então só uma execução consegue) e liberá-la é um
+    DELETE. Funciona em qualquer banco, inclusive no SQLite, que não tem
+    SELECT FOR UPDATE, e vale entre processos (admin, processar_tarefas,
+    classificar_eventos).
+
+    A trava vence depois de `duracao` segundos: se o dono morrer no meio
+    (queda, deploy), outra execução assume com um UPDATE condicional.
+    Quem está classificando renova a validade a cada etapa (renovar()).
+
+    Dentro da mesma thread a trava é reentrante: quem já tem a trava pode
+    chamar outra rotina que também a pede sem travar a si mesmo.
+
+    Deve ser obtida fora de transação: dentro de uma, a linha só fica
+    visível para os outros processos depois do commit.
+
+    Uso:
+        with TravaEvento(evento.pk) as trava:
+            if trava.esperou: ...
+            trava.renovar()
+
+    Args:
+        evento_id (int): Evento a travar
+        espera (float): Segundos esperando a trava antes de desistir com
+            ClassificacaoEmAndamento (padrão: settings; 0 = não espera)
+        duracao (int): Validade da trava em segundos (padrão: settings)
+    """
+
+    def __init__(self, evento_id, espera=None, duracao=None):
+        self.evento_id = evento_id
+        self.espera = espera_padrao() if espera is None else espera
+        self.duracao = duracao or duracao_padrao()
+        self.dono = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:12]}'
+        self.esperou = False
+        self.aninhada = False
+
+    # ------------------------------------------
+    # Context manager
+    # ------------------------------------------
+
+    def __enter__(self):
+        travas = _travas_da_thread()
+        externa = travas.get(self.evento_id)
+        if externa is not None:
+            # Já travado por esta thread: usa a trava de fora
+            self.dono = externa.dono
+            self.duracao = externa.duracao
+            self.aninhada = True
+            return self
+
+        limite = time.monotonic() + self.espera
+        while not self._tentar():
+            self.esperou = True
+            if time.monotonic() >= limite:
+                raise ClassificacaoEmAndamento(
+                    f'O evento #{self.evento_id} já está sendo classificado '
+                    f'(espera de {self.espera:g}s esgotada)'
+                )
+            time.sleep(INTERVALO_TENTATIVAS)
+
+        travas[self.evento_id] = self
+        return self
+
+    def __exit__(self, tipo, valor, rastro):
+        if self.aninhada:
+            return False
+
+        _travas_da_thread().pop(self.evento_id, None)
+        TravaClassificacao.objects.filter(
+            evento_id=self.evento_id, dono=self.dono
+        ).delete()
+        return False
+
+    # ------------------------------------------
+    # Operações
+    # ------------------------------------------
+
+    def _tentar(self):
+        """Uma tentativa de obter a trava"""
+        agora = timezone.now()
+        expira_em = agora + timedelta(seconds=self.duracao)
+
+        try:
+            with transaction.atomic():
+                TravaClassificacao.objects.create(
+                    evento_id=self.evento_id,
+                    dono=self.dono,
+                    adquirida_em=agora,
+                    expira_em=expira_em
+                )
+            return True
+        except IntegrityError:
+            pass
+        except OperationalError:
+            # SQLite: outra execução está gravando ("database is locked")
+            return False
+
+        # Trava vencida (dono interrompido): assume só se ainda estiver vencida
+        return bool(TravaClassificacao.objects.filter(
+            evento_id=self.evento_id,
+            expira_em__lt=agora
+        ).update(dono=self.dono, adquirida_em=agora, expira_em=expira_em))
+
+    def renovar(self):
+        """
+        Estende a validade da trava. Chamada antes de cada etapa demorada e,
+        principalmente, antes de gravar.
+
+        Raises:
+            ClassificacaoEmAndamento: A trava venceu e outra execução assumiu
+        """
+        renovada = TravaClassificacao.objects.filter(
+            evento_id=self.evento_id, dono=self.dono
+        ).update(expira_em=timezone.now() + timedelta(seconds=self.duracao))
+
+        if not renovada:
+            raise ClassificacaoEmAndamento(
+                f'A trava do evento #{self.evento_id} venceu e foi assumida '
+                f'por outra execução'
+            )
@@ -2,6 +2,7 @@
 ARQUIVO: apps/interessados/apps.py
 AÇÃO: SUBSTITUIR o arquivo apps/interessados/apps.py
 MUDANÇA: Configuração correta do app
+         + registra as verificações de sistema (cache dos limites)
 """
 
 from django.apps import AppConfig
@@ -10,4 +11,8 @@ from django.apps import AppConfig
 class InteressadosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.interessados'
-    verbose_name = 'Interessados'
\ No newline at end of file
+    verbose_name = 'Interessados'
+
+    def ready(self):
+        # Registra as verificações de sistema (cache compartilhado)
+        from . import checks  # noqa: F401
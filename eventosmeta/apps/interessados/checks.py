@@ -0,0 +1,44 @@
+"""
+ARQUIVO: apps/interessados/checks.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Verificação de sistema: limite de tentativas exige cache compartilhado
+DATA/HORA: 2026-10-17 02:29:58
+"""
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+# Caches que cada processo tem o seu (nada é visto pelos outros workers)
+CACHES_POR_PROCESSO = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches)
+def verificar_cache_limites(app_configs, **kwargs):
+    """
+    Os baldes de limites.py ficam em settings.LIMITES_CACHE. Com um cache
+    por processo cada worker do gunicorn tem a sua própria cota de
+    tentativas (N workers = N vezes o limite). Em desenvolvimento (DEBUG)
+    o runserver é um processo só.
+    """
+    if settings.DEBUG:
+        return []
+
+    alias = getattr(settings, 'LIMITES_CACHE', 'default')
+    backend = settings.CACHES.get(alias, {}).get('BACKEND', '')
+    if backend not in CACHES_POR_PROCESSO:
+        return []
+
+    return [Warning(
+        f'LIMITES_CACHE ("{alias}") é um cache por processo '
+        f'({backend.rsplit(".", 1)[-1]}): cada worker aplica o limite de '
+        'tentativas de login e cadastro separadamente.',
+        hint=(
+            'Aponte LIMITES_CACHE para um cache compartilhado com incr() '
+            'atômico (Redis/Memcached) em CACHES.'
+        ),
+        id='interessados.W001',
+    )]
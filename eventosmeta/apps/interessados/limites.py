@@ -0,0 +1,205 @@
+"""
+ARQUIVO: apps/interessados/limites.py
+AÇÃO: CRIAR arquivo completo
+MUDANÇA: Limite de tentativas de login e cadastro por CPF e por IP
+DATA/HORA: 2026-10-17 02:17:38
+"""
+
+import logging
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+logger = logging.getLogger(__name__)
+
+# capacidade = tentativas seguidas permitidas (rajada)
+# por_minuto = ritmo em que as tentativas voltam a ser liberadas
+LIMITES_PADRAO = {
+    'login_cpf': {'capacidade': 5, 'por_minuto': 5},
+    'login_ip': {'capacidade': 20, 'por_minuto': 30},
+    'cadastro_cpf': {'capacidade': 3, 'por_minuto': 3},
+    'cadastro_ip': {'capacidade': 10, 'por_minuto': 10},
+}
+
+CHAVE_BALDE = 'limite:{nome}:{chave}'
+CHAVE_REJEICOES = 'limite:rejeicoes:{nome}'
+
+# Usado quando o cache compartilhado não responde (cada processo com o seu)
+_cache_local = LocMemCache('interessados-limites', {})
+
+
+def limites_configurados():
+    """Limites em vigor: LIMITES_PADRAO atualizado por settings.LIMITES_INTERESSADOS"""
+    limites = {nome: dict(limite) for nome, limite in LIMITES_PADRAO.items()}
+    for nome, limite in getattr(settings, 'LIMITES_INTERESSADOS', {}).items():
+        limites.setdefault(nome, {}).update(limite)
+    return limites
+
+
+def _cache_compartilhado():
+    """Cache dos limites (settings.LIMITES_CACHE), o mesmo para todos os workers"""
+    return caches[getattr(settings, 'LIMITES_CACHE', 'default')]
+
+
+# ============================================
+# BALDE DE TOKENS
+# ============================================
+
+class BaldeTokens:
+    """
+    Balde de tokens guardado no cache, um por chave (CPF, IP).
+
+    Guarda um único número por chave: o instante teórico em que o balde
+    volta a ficar cheio (GCRA, equivalente ao balde de tokens). Cada
+    tentativa soma um intervalo com cache.incr(), que é atômico no
+    Redis/Memcached, então vários workers do gunicorn contam juntos sem
+    trava e sem ler-e-regravar. A tentativa recusada devolve o intervalo.
+
+    Só o recomeço depois de um período sem uso (balde cheio) é um set()
+    sem atomicidade: tentativas simultâneas nesse instante podem contar
+    uma vez só, o que no máximo libera uma tentativa a mais por worker.
+
+    Args:
+        nome (str): Nome do limite (chave de limites_configurados())
+        capacidade (int): Tentativas seguidas permitidas
+        por_minuto (float): Tentativas liberadas por minuto
+    """
+
+    def __init__(self, nome, capacidade, por_minuto):
+        self.nome = nome
+        self.intervalo = int(60000 / por_minuto)  # ms por token
+        self.tolerancia = (capacidade - 1) * self.intervalo
+        self.validade = (self.tolerancia + self.intervalo) // 1000 + 1  # segundos
+
+    @classmethod
+    def configurado(cls, nome):
+        """Balde com o limite `nome` das configurações"""
+        limite = limites_configurados()[nome]
+        return cls(nome, limite['capacidade'], limite['por_minuto'])
+
+    def consumir(self, chave):
+        """
+        Consome um token da chave.
+
+        Args:
+            chave (str): CPF, IP, etc.
+
+        Returns:
+            float: 0 se a tentativa foi aceita; senão, segundos até a próxima
+        """
+        chave = CHAVE_BALDE.format(nome=self.nome, chave=chave)
+        agora = int(time.time() * 1000)
+
+        try:
+            return self._consumir(_cache_compartilhado(), chave, agora)
+        except Exception:
+            logger.warning(
+                'Cache de limites indisponível: usando a memória local do processo',
+                exc_info=True
+            )
+            return self._consumir(_cache_local, chave, agora)
+
+    def _consumir(self, cache, chave, agora):
+        if cache.add(chave, agora + self.intervalo, self.validade):
+            return 0
+
+        try:
+            cheio_em = cache.incr(chave, self.intervalo)
+        except ValueError:
+            # Expirou entre o add e o incr
+            cache.set(chave, agora + self.intervalo, self.validade)
+            return 0
+
+        anterior = cheio_em - self.intervalo
+        if anterior < agora:
+            # Balde já estava cheio: recomeça a partir de agora
+            cache.set(chave, agora + self.intervalo, self.validade)
+            return 0
+
+        if anterior - agora > self.tolerancia:
+            cache.decr(chave, self.intervalo)
+            return (anterior - agora - self.tolerancia) / 1000
+
+        cache.touch(chave, self.validade)
+        return 0
+
+
+# ============================================
+# REJEIÇÕES
+# ============================================
+
+def registrar_rejeicao(nome):
+    """Soma uma tentativa recusada no contador do limite (compartilhado)"""
+    chave = CHAVE_REJEICOES.format(nome=nome)
+    try:
+        cache = _cache_compartilhado()
+        cache.add(chave, 0, None)
+        cache.incr(chave)
+    except Exception:
+        _cache_local.add(chave, 0, None)
+        _cache_local.incr(chave)
+
+
+def contar_rejeicoes():
+    """
+    Tentativas recusadas por limite desde que o cache foi iniciado.
+
+    Returns:
+        dict: Nome do limite → quantidade
+    """
+    chaves = {nome: CHAVE_REJEICOES.format(nome=nome) for nome in limites_configurados()}
+    try:
+        valores = _cache_compartilhado().get_many(chaves.values())
+    except Exception:
+        valores = _cache_local.get_many(chaves.values())
+    return {nome: valores.get(chave, 0) for nome, chave in chaves.items()}
+
+
+# ============================================
+# USO NAS VIEWS
+# ============================================
+
+def ip_cliente(request):
+    """
+    IP de quem fez a requisição. Atrás de proxy reverso, informe em
+    settings.LIMITES_PROXIES quantos proxies confiáveis acrescentam ao
+    X-Forwarded-For (senão o cabeçalho, que o cliente pode forjar, é ignorado).
+    """
+    proxies = getattr(settings, 'LIMITES_PROXIES', 0)
+    if proxies:
+        encaminhado = [
+            parte.strip() for parte in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')
+            if parte.strip()
+        ]
+        if len(encaminhado) >= proxies:
+            return encaminhado[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def verificar_limites(request, acao, cpf=''):
+    """
+    Consome uma tentativa nos limites da ação por IP e por CPF, antes de
+    qualquer trabalho pesado (hash da senha).
+
+    Args:
+        request: HttpRequest
+        acao (str): 'login' ou 'cadastro' (limites <acao>_ip e <acao>_cpf)
+        cpf (str): CPF informado no formulário (só os dígitos contam)
+
+    Returns:
+        float: 0 se liberado; senão, segundos até poder tentar de novo
+    """
+    cpf = ''.join(caractere for caractere in (cpf or '') if caractere.isdigit())[:11]
+
+    for nome, chave in ((f'{acao}_ip', ip_cliente(request)), (f'{acao}_cpf', cpf)):
+        if not chave:
+            continue
+        espera = BaldeTokens.configurado(nome).consumir(chave)
+        if espera:
+            registrar_rejeicao(nome)
+            logger.info('Limite %s atingido para %s', nome, chave)
+            return espera
+
+    return 0
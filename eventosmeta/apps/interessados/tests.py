@@ -1,3 +1,140 @@
-from django.test import TestCase
+"""
+ARQUIVO: apps/interessados/tests.py
+AÇÃO: SUBSTITUIR o arquivo apps/interessados/tests.py
+MUDANÇA: Testes do limite de tentativas de login e cadastro (limites.py)
+DATA/HORA: 2026-10-17 02:31:09
+"""
 
-# Create your tests here.
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from . import limites
+from .limites import BaldeTokens, contar_rejeicoes
+
+
+class Relogio:
+    """Substitui time.time() em limites.py para controlar a reposição"""
+
+    def __init__(self, inicio=1_000_000.0):
+        self.agora = inicio
+
+    def __call__(self):
+        return self.agora
+
+    def avancar(self, segundos):
+        self.agora += segundos
+
+
+# ============================================
+# BALDE DE TOKENS
+# ============================================
+
+class BaldeTokensTests(TestCase):
+    """Aceite e recusa do balde (GCRA sobre cache.incr)"""
+
+    def setUp(self):
+        cache.clear()
+        self.relogio = Relogio()
+        patcher = mock.patch.object(limites.time, 'time', self.relogio)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # 3 seguidas, uma nova a cada 1 segundo
+        self.balde = BaldeTokens('teste', capacidade=3, por_minuto=60)
+
+    def test_aceita_a_capacidade_e_recusa_a_seguinte(self):
+        self.assertEqual([self.balde.consumir('chave') for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(self.balde.consumir('chave'), 1.0)
+
+    def test_recusa_nao_consome_token(self):
+        for _ in range(5):
+            self.balde.consumir('chave')
+
+        self.relogio.avancar(1)
+        self.assertEqual(self.balde.consumir('chave'), 0)
+
+    def test_reposicao_no_ritmo_configurado(self):
+        for _ in range(3):
+            self.balde.consumir('chave')
+
+        self.relogio.avancar(0.5)
+        self.assertAlmostEqual(self.balde.consumir('chave'), 0.5)
+        self.relogio.avancar(0.5)
+        self.assertEqual(self.balde.consumir('chave'), 0)
+        self.assertGreater(self.balde.consumir('chave'), 0)
+
+    def test_balde_cheio_depois_de_parado(self):
+        for _ in range(3):
+            self.balde.consumir('chave')
+
+        self.relogio.avancar(60)
+        self.assertEqual([self.balde.consumir('chave') for _ in range(3)], [0, 0, 0])
+        self.assertGreater(self.balde.consumir('chave'), 0)
+
+    def test_chaves_independentes(self):
+        for _ in range(3):
+            self.balde.consumir('chave')
+
+        self.assertGreater(self.balde.consumir('chave'), 0)
+        self.assertEqual(self.balde.consumir('outra'), 0)
+
+    def test_cache_indisponivel_usa_memoria_local(self):
+        quebrado = mock.Mock()
+        quebrado.add.side_effect = ConnectionError('cache fora do ar')
+        limites._cache_local.clear()
+
+        with mock.patch.object(limites, '_cache_compartilhado', return_value=quebrado), \
+                self.assertLogs(limites.logger, 'WARNING'):
+            self.assertEqual([self.balde.consumir('chave') for _ in range(3)], [0, 0, 0])
+            self.assertGreater(self.balde.consumir('chave'), 0)
+
+
+# ============================================
+# VIEWS
+# ============================================
+
+@override_settings(LIMITES_INTERESSADOS={
+    'login_cpf': {'capacidade': 2, 'por_minuto': 1},
+    'login_ip': {'capacidade': 3, 'por_minuto': 1},
+    'cadastro_cpf': {'capacidade': 2, 'por_minuto': 1},
+    'cadastro_ip': {'capacidade': 3, 'por_minuto': 1},
+})
+class LimiteViewsTests(TestCase):
+    """Login e cadastro respondem 429 antes de gerar/conferir o hash da senha"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_login_limitado_por_cpf(self):
+        dados = {'cpf': '123.456.789-01', 'senha': 'errada'}
+        respostas = [self.client.post(reverse('interessados:login'), dados) for _ in range(3)]
+
+        self.assertEqual([resposta.status_code for resposta in respostas], [200, 200, 429])
+        self.assertEqual(contar_rejeicoes()['login_cpf'], 1)
+
+    def test_login_limitado_por_ip(self):
+        respostas = [
+            self.client.post(reverse('interessados:login'), {'cpf': f'{numero:011d}', 'senha': 'x'})
+            for numero in range(4)
+        ]
+
+        self.assertEqual(respostas[-1].status_code, 429)
+        self.assertEqual(contar_rejeicoes()['login_ip'], 1)
+
+    def test_recusa_nao_chega_a_autenticar(self):
+        dados = {'cpf': '12345678901', 'senha': 'errada'}
+        for _ in range(2):
+            self.client.post(reverse('interessados:login'), dados)
+
+        with mock.patch('apps.interessados.views.InteressadoBackend.authenticate') as autenticar:
+            resposta = self.client.post(reverse('interessados:login'), dados)
+
+        self.assertEqual(resposta.status_code, 429)
+        autenticar.assert_not_called()
+
+    def test_cadastro_limitado_por_cpf(self):
+        dados = {'cpf': '12345678901'}
+        respostas = [self.client.post(reverse('interessados:cadastro'), dados) for _ in range(3)]
+
+        self.assertEqual(respostas[-1].status_code, 429)
+        self.assertEqual(contar_rejeicoes()['cadastro_cpf'], 1)
@@ -2,6 +2,7 @@
 ARQUIVO: apps/interessados/views.py
 AÇÃO: SUBSTITUIR completamente o arquivo apps/interessados/views.py
 MUDANÇA: Views de cadastro, login, logout e dashboard
+         + limite de tentativas de cadastro e login por CPF e por IP
 """
 
 from django.shortcuts import render, redirect
@@ -10,6 +11,16 @@ from django.contrib.auth import login as auth_login, logout as auth_logout
 from .forms import CadastroInteressadoForm, LoginInteressadoForm
 from .models import Interessado
 from .authentication import InteressadoBackend
+from .limites import verificar_limites
+
+
+def _tentativas_esgotadas(request, template, form, espera):
+    """Resposta 429 quando o limite de tentativas foi atingido"""
+    messages.error(
+        request,
+        f'Muitas tentativas em pouco tempo. Tente novamente em {int(espera) + 1} segundo(s).'
+    )
+    return render(request, template, {'form': form}, status=429)
 
 
 def cadastro_interessado(request):
@@ -23,6 +34,12 @@ def cadastro_interessado(request):
     
     if request.method == 'POST':
         form = CadastroInteressadoForm(request.POST)
+
+        # Antes de validar e gerar o hash da senha (PBKDF2)
+        espera = verificar_limites(request, 'cadastro', request.POST.get('cpf'))
+        if espera:
+            return _tentativas_esgotadas(request, 'interessados/cadastro.html', form, espera)
+
         if form.is_valid():
             interessado = form.save()
             messages.success(request, f'Cadastro realizado com sucesso! Bem-vindo(a), {interessado.nome}!')
@@ -58,6 +75,12 @@ def login_interessado(request):
     
     if request.method == 'POST':
         form = LoginInteressadoForm(request.POST)
+
+        # Antes de conferir a senha (PBKDF2)
+        espera = verificar_limites(request, 'login', request.POST.get('cpf'))
+        if espera:
+            return _tentativas_esgotadas(request, 'interessados/login_interessado.html', form, espera)
+
         if form.is_valid():
             cpf = form.cleaned_data['cpf']
             senha = form.cleaned_data['senha']
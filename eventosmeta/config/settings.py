@@ -147,3 +147,39 @@ LOGIN_REDIRECT_URL = '/staff/dashboard/'  # Redirect após login staff
 LOGOUT_REDIRECT_URL = '/'  # Redirect após logout
 
 
+
+# Classificação
+# Reclassificação incremental: validações de critérios customizados, novas
+# inscrições, desistências e mudanças de peso atualizam a classificação de
+# eventos já classificados sem refazer tudo (ver apps/cursoseoutros/incremental.py).
+# A tabela de scores fica no cache padrão: com vários workers (gunicorn) ele tem
+# de ser compartilhado (Redis/Memcached em CACHES), senão a mudança cai quase
+# sempre na classificação completa enfileirada (verificação cursoseoutros.W001)
+CLASSIFICACAO_INCREMENTAL = True
+
+# Trava por evento (ver apps/cursoseoutros/travas.py): segundos que uma
+# classificação espera outra do mesmo evento terminar, e validade da trava
+# (depois disso uma execução interrompida perde a trava)
+CLASSIFICACAO_ESPERA_TRAVA = 30
+CLASSIFICACAO_DURACAO_TRAVA = 15 * 60
+
+# Vaga liberada (desistência, matrícula cancelada/trancada) vai na hora para
+# o próximo da fila de espera, respeitando as cotas (ver apps/cursoseoutros/fila_espera.py)
+CLASSIFICACAO_PROMOCAO_AUTOMATICA = True
+
+# Limite de tentativas de login e cadastro de interessados, por CPF e por IP
+# (balde de tokens no cache, ver apps/interessados/limites.py). Sem CACHES
+# configurado o cache padrão é LocMemCache, um por processo: cada worker do
+# gunicorn teria a sua própria cota. Em produção, LIMITES_CACHE deve apontar
+# para um cache compartilhado com incr() atômico (Redis/Memcached), senão a
+# verificação interessados.W001 avisa.
+# capacidade = tentativas seguidas; por_minuto = ritmo de reposição
+LIMITES_INTERESSADOS = {
+    'login_cpf': {'capacidade': 5, 'por_minuto': 5},
+    'login_ip': {'capacidade': 20, 'por_minuto': 30},
+    'cadastro_cpf': {'capacidade': 3, 'por_minuto': 3},
+    'cadastro_ip': {'capacidade': 10, 'por_minuto': 10},
+}
+LIMITES_CACHE = 'default'
+# Proxies reversos confiáveis na frente da aplicação (0 = usar REMOTE_ADDR)
+LIMITES_PROXIES = 0